@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+JobBot Daily Stats Backfill
+===========================
+
+Rebuilds the daily_stats rollup from the applications collection. Run once after
+deploying the rollup, or for a single user if their counters drift:
+
+    python backfill_daily_stats.py
+    python backfill_daily_stats.py --user-id <user_id>
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.daily_stats_service import DailyStatsService
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def main():
+    parser = argparse.ArgumentParser(description="Rebuild the daily_stats rollup")
+    parser.add_argument("--user-id", help="Only rebuild this user's rollup")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ.get('DB_NAME', 'jobbot')]
+    try:
+        rebuilt = await DailyStatsService(db).backfill(args.user_id)
+        scope = f"user {args.user_id}" if args.user_id else "all users"
+        print(f"✅ Rebuilt {rebuilt} daily stats documents for {scope}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
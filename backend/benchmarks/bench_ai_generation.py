@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+JobBot AI Generation Benchmark
+==============================
+
+Measures API throughput on /api/users/{id}/ai/generate-* and on a cheap endpoint
+while slow generations are in flight.
+
+A local stand-in for the OpenAI API is started by this script; run the backend
+against it so no real completions are made:
+
+    OPENAI_API_KEY=bench OPENAI_BASE_URL=http://127.0.0.1:8099/v1 \
+        uvicorn server:app --port 8001
+
+    python benchmarks/bench_ai_generation.py --generations 32 --duration 10
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+BASE_URL = "http://localhost:8001/api"
+GENERATE_ENDPOINTS = [
+    "generate-cover-letter",
+    "generate-resume-summary",
+    "generate-linkedin-message"
+]
+
+def make_stub_handler(delay_seconds):
+    """Build an OpenAI-compatible chat completions handler that sleeps before answering"""
+    class StubOpenAIHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            time.sleep(delay_seconds)
+            payload = json.dumps({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "gpt-4o"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "Benchmark completion."},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubOpenAIHandler
+
+def create_fixtures():
+    """Create a user, campaign and job to generate content for"""
+    user = requests.post(f"{BASE_URL}/users", json={
+        "personal_info": {
+            "full_name": "Bench User",
+            "email": "bench.user@example.com",
+            "phone": "+1-555-0100",
+            "location": "San Francisco, CA"
+        },
+        "skills": ["Product Strategy", "Voice AI", "SQL"]
+    }).json()
+    campaign = requests.post(f"{BASE_URL}/campaigns", json={
+        "user_id": user["id"],
+        "name": "Benchmark Campaign",
+        "keywords": ["Product Manager"]
+    }).json()
+    job = requests.post(f"{BASE_URL}/jobs", json={
+        "campaign_id": campaign["id"],
+        "title": "Senior Product Manager",
+        "company": "Bench Corp",
+        "location": "Remote",
+        "posted_at": datetime.now(timezone.utc).isoformat(),
+        "description": "Lead product strategy for a remote-first team.",
+        "requirements": ["5+ years PM experience"]
+    }).json()
+    return user["id"], job["id"]
+
+def measure_probe(duration, stop_event=None):
+    """Hit the root endpoint in a loop and return per-request latencies in ms"""
+    latencies = []
+    session = requests.Session()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline and not (stop_event and stop_event.is_set()):
+        start = time.perf_counter()
+        session.get(f"{BASE_URL}/")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def run_generation(user_id, job_id, index):
+    """Call one of the generate-* endpoints and return its latency in ms"""
+    endpoint = GENERATE_ENDPOINTS[index % len(GENERATE_ENDPOINTS)]
+    start = time.perf_counter()
+    requests.post(f"{BASE_URL}/users/{user_id}/ai/{endpoint}", json={"job_id": job_id})
+    return (time.perf_counter() - start) * 1000
+
+def summarize(label, latencies, duration):
+    """Print throughput and latency percentiles"""
+    if not latencies:
+        print(f"{label:<32} no requests completed")
+        return
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<32} {len(latencies) / duration:8.1f} req/s   "
+          f"p50 {statistics.median(latencies):7.1f} ms   p99 {p99:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AI generation endpoints")
+    parser.add_argument("--generations", type=int, default=32, help="Concurrent generate-* requests")
+    parser.add_argument("--duration", type=float, default=10.0, help="Probe duration in seconds")
+    parser.add_argument("--stub-port", type=int, default=8099, help="Port for the OpenAI stand-in")
+    parser.add_argument("--stub-delay", type=float, default=2.0, help="Seconds per stub completion")
+    args = parser.parse_args()
+
+    stub = ThreadingHTTPServer(("127.0.0.1", args.stub_port), make_stub_handler(args.stub_delay))
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    print(f"OpenAI stand-in listening on http://127.0.0.1:{args.stub_port}/v1")
+
+    user_id, job_id = create_fixtures()
+
+    # Baseline: nothing else in flight
+    summarize("GET /api/ (idle)", measure_probe(args.duration), args.duration)
+
+    # Under load: keep generations in flight for the whole probe window
+    stop_event = threading.Event()
+    generation_latencies = []
+
+    def keep_generating(index):
+        while not stop_event.is_set():
+            generation_latencies.append(run_generation(user_id, job_id, index))
+
+    with ThreadPoolExecutor(max_workers=args.generations) as pool:
+        for i in range(args.generations):
+            pool.submit(keep_generating, i)
+        probe_latencies = measure_probe(args.duration)
+        stop_event.set()
+
+    summarize("GET /api/ (generations busy)", probe_latencies, args.duration)
+    summarize("POST /ai/generate-*", generation_latencies, args.duration)
+    stub.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JobBot Job Dedup Benchmark
+==========================
+
+Builds a synthetic feed in which a share of postings are reposts or cross-listings
+of earlier ones (lightly edited description, abbreviated or suffixed title, legal
+suffix on the company) and runs it through the near-duplicate index. Reports
+fingerprint and lookup times as the index grows, and how many reposts were
+caught and how many distinct postings were wrongly merged:
+
+    python benchmarks/bench_job_dedup.py --postings 100000 --repost-rate 0.3
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.job_dedup import JobDeduplicator, job_fingerprint
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+ROLES = ["Product Manager", "Data Scientist", "Software Engineer", "Designer", "Engineering Manager"]
+SENIORITIES = ["Senior", "Staff", "Principal", "Lead", "Junior"]
+
+def make_posting(rng, campaigns, companies):
+    """A distinct posting: (campaign_id, company, title, description)"""
+    description = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(80, 400)))
+    title = f"{rng.choice(SENIORITIES)} {rng.choice(ROLES)}"
+    return (f"campaign_{rng.randrange(campaigns)}", f"Company {rng.randrange(companies)}", title, description)
+
+def make_repost(rng, posting):
+    """The same posting as it appears when reposted or cross-listed"""
+    campaign_id, company, title, description = posting
+    words = description.split()
+    for _ in range(rng.randint(0, 2)):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    title = rng.choice([title, title.replace("Senior", "Sr."), f"{title} - Remote", f"{title} (Hybrid)"])
+    company = rng.choice([company, f"{company} Inc.", f"{company}, LLC"])
+    return (campaign_id, company, title, " ".join(words))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate job detection")
+    parser.add_argument("--postings", type=int, default=100000, help="Postings in the feed")
+    parser.add_argument("--repost-rate", type=float, default=0.3, help="Share of postings that repeat an earlier one")
+    parser.add_argument("--campaigns", type=int, default=200, help="Campaigns the feed is spread over")
+    parser.add_argument("--companies", type=int, default=50, help="Distinct companies")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    deduplicator = JobDeduplicator()
+    expires_at = datetime.utcnow() + timedelta(hours=3)
+    originals = []
+    fingerprint_times, lookup_times = [], []
+    caught = missed = false_merges = 0
+    checkpoints = {int(args.postings * share) for share in (0.01, 0.1, 0.5, 1.0)}
+
+    print(f"{'indexed':>10} {'fingerprint (us)':>17} {'lookup p50 (us)':>16} {'lookup p99 (us)':>16}")
+    for number in range(1, args.postings + 1):
+        is_repost = bool(originals) and rng.random() < args.repost_rate
+        source = rng.randrange(len(originals)) if is_repost else len(originals)
+        posting = make_repost(rng, originals[source][1]) if is_repost else make_posting(rng, args.campaigns, args.companies)
+        campaign_id, company, title, description = posting
+
+        started = time.perf_counter()
+        fingerprint = job_fingerprint(title, description)
+        fingerprint_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        canonical_id = deduplicator.find(campaign_id, company, title, fingerprint)
+        lookup_times.append(time.perf_counter() - started)
+
+        if is_repost:
+            if canonical_id == originals[source][0]:
+                caught += 1
+            else:
+                missed += 1
+        if not is_repost and canonical_id is not None:
+            false_merges += 1
+        if canonical_id is None:
+            job_id = f"job_{number}"
+            deduplicator.add(job_id, campaign_id, company, title, fingerprint, expires_at)
+            if not is_repost:
+                originals.append((job_id, posting))
+
+        if number in checkpoints:
+            lookups = sorted(lookup_times)
+            print(f"{len(deduplicator):>10} {statistics.mean(fingerprint_times) * 1e6:>17.1f} "
+                  f"{lookups[len(lookups) // 2] * 1e6:>16.1f} {lookups[int(len(lookups) * 0.99)] * 1e6:>16.1f}")
+            fingerprint_times, lookup_times = [], []
+
+    reposts = caught + missed
+    distinct = args.postings - reposts
+    print(f"\nReposts caught: {caught}/{reposts} ({caught / max(reposts, 1) * 100:.1f}%)")
+    print(f"Distinct postings wrongly merged: {false_merges}/{distinct} ({false_merges / max(distinct, 1) * 100:.2f}%)")
+    print(f"Dedup ratio: {caught / args.postings * 100:.1f}% of postings collapsed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JobBot Job Vector Index Benchmark
+=================================
+
+Encodes synthetic postings drawn from a few hundred topics, indexes them in the
+IVF vector index used for recommendations and reports encode time, training
+time, query latency and recall@k against an exact scan at several nprobe values,
+plus how long the index takes to save and load:
+
+    python benchmarks/bench_job_vectors.py --jobs 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.job_vectors import QUANTIZATION_SCALE, JobVectorIndex, JobVectorizer, job_fields
+
+GENERAL = [f"common{i}" for i in range(2000)]
+
+def make_topics(rng, count):
+    return [[f"t{topic}w{i}" for i in range(80)] for topic in range(count)]
+
+def make_job(rng, topics):
+    """A posting mostly about one topic, partly about a second, padded with common words"""
+    topic, secondary = rng.sample(topics, 2)
+    length = rng.randint(60, 200)
+    words = (rng.choices(topic, k=length * 2 // 5) + rng.choices(secondary, k=length // 5)
+             + rng.choices(GENERAL, k=length * 2 // 5))
+    rng.shuffle(words)
+    return {
+        "title": " ".join(rng.sample(topic[:10], 2)),
+        "company": f"Company {rng.randrange(500)}",
+        "description": " ".join(words),
+        "requirements": [" ".join(rng.sample(topic, 3))]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job vector index")
+    parser.add_argument("--jobs", type=int, default=200000, help="Postings indexed")
+    parser.add_argument("--topics", type=int, default=300, help="Topics postings are drawn from")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed per nprobe")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    topics = make_topics(rng, args.topics)
+    vectorizer = JobVectorizer()
+    index = JobVectorIndex()
+
+    started = time.perf_counter()
+    for number in range(args.jobs):
+        index.add(f"job_{number}", vectorizer.encode(job_fields(make_job(rng, topics)), learn=True))
+    encode_seconds = time.perf_counter() - started
+    print(f"Jobs:                {args.jobs}")
+    print(f"Encode + add:        {encode_seconds / args.jobs * 1e6:.1f} us/job (incl. synthetic text)")
+
+    started = time.perf_counter()
+    ids, vectors, _ = index.snapshot()
+    index = JobVectorIndex.build_trained(ids, vectors)
+    print(f"Train + assign:      {time.perf_counter() - started:.2f} s ({len(index.centroids)} lists)")
+
+    ids, vectors, _ = index.snapshot()
+    position = {job_id: row for row, job_id in enumerate(ids)}
+    matrix = vectors.astype(np.float32) / QUANTIZATION_SCALE
+    print(f"Vector memory:       {vectors.nbytes / 2**20:.0f} MiB int8")
+
+    queries = [vectorizer.encode(job_fields(make_job(rng, topics))) for _ in range(args.queries)]
+    exact = [set(np.argpartition(-(matrix @ query), args.k)[:args.k]) for query in queries]
+
+    print(f"\n{'nprobe':>7} {'p50 (ms)':>9} {'p99 (ms)':>9} {'recall@' + str(args.k):>10}")
+    for nprobe in (1, 4, 8, 16, 32):
+        times, recalls = [], []
+        for query, truth in zip(queries, exact):
+            started = time.perf_counter()
+            results = index.search(query, args.k, nprobe=nprobe)
+            times.append(time.perf_counter() - started)
+            recalls.append(len({position[job_id] for job_id, _ in results} & truth) / args.k)
+        times.sort()
+        print(f"{nprobe:>7} {times[len(times) // 2] * 1000:>9.2f} {times[int(len(times) * 0.99)] * 1000:>9.2f} "
+              f"{statistics.mean(recalls):>10.3f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "job_vectors.npz")
+        started = time.perf_counter()
+        np.savez(path, **index.state(), **vectorizer.state())
+        save_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        with np.load(path) as state:
+            JobVectorIndex.from_state(dict(state))
+        load_seconds = time.perf_counter() - started
+        print(f"\nSave: {save_seconds:.2f} s, load: {load_seconds:.2f} s ({os.path.getsize(path) / 2**20:.0f} MiB)")
+
+if __name__ == "__main__":
+    main()
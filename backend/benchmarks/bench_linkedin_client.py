@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+JobBot LinkedIn Client Benchmark
+================================
+
+Drives LinkedInClient against a local stand-in for the LinkedIn API that answers
+slowly and throttles or fails a share of calls. Reports throughput, latency,
+retries and how many TCP connections the pool actually opened:
+
+    python benchmarks/bench_linkedin_client.py --requests 500 --concurrency 50 --error-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_stub_handler(delay_seconds, error_rate, connections):
+    """Build a LinkedIn-like handler that is slow and sometimes answers 429/503"""
+    class StubLinkedInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.add(self.client_address)
+
+        def do_GET(self):
+            time.sleep(delay_seconds)
+            roll = random.random()
+            if roll < error_rate / 2:
+                self.respond(429, {"message": "Throttled"}, {"Retry-After": "0"})
+            elif roll < error_rate:
+                self.respond(503, {"message": "Unavailable"})
+            else:
+                self.respond(200, {"elements": [{"id": "1", "title": "Product Manager"}]})
+
+        def respond(self, status, body, headers=None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubLinkedInHandler
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LinkedIn HTTP client")
+    parser.add_argument("--requests", type=int, default=500, help="Total API calls")
+    parser.add_argument("--concurrency", type=int, default=50, help="Calls in flight at once")
+    parser.add_argument("--delay", type=float, default=0.02, help="Seconds per stand-in response")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Share of 429/503 responses")
+    parser.add_argument("--port", type=int, default=8098, help="Port for the LinkedIn stand-in")
+    args = parser.parse_args()
+
+    connections = set()
+    stub = ThreadingHTTPServer(("127.0.0.1", args.port), make_stub_handler(args.delay, args.error_rate, connections))
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    os.environ.setdefault("LINKEDIN_API_BASE_URL", f"http://127.0.0.1:{args.port}/v2")
+    os.environ.setdefault("LINKEDIN_BACKOFF_SECONDS", "0.05")
+    from services.linkedin_client import LinkedInClient
+
+    client = LinkedInClient()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = {}
+
+    async def call():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(f"{client.api_base_url}/jobSearch", params={"keywords": "product"})
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[call() for _ in range(args.requests)])
+    elapsed = time.perf_counter() - start
+    await client.close()
+    stub.shutdown()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{args.requests} calls in {elapsed:.2f}s ({args.requests / elapsed:.1f} calls/s)")
+    print(f"latency p50 {statistics.median(latencies):.1f} ms   p99 {p99:.1f} ms")
+    print(f"final statuses {statuses}")
+    print(f"client {client.get_stats()}")
+    print(f"TCP connections opened: {len(connections)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
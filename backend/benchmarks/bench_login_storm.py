@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+JobBot Login Storm Benchmark
+============================
+
+Measures login throughput on the demo server and the latency of a cheap
+endpoint (GET /api/) while a storm of logins is in flight. With bcrypt running
+in the password pool, the probe latency should stay close to its idle value.
+
+Start the demo server first; BCRYPT_ROUNDS and PASSWORD_HASH_CONCURRENCY tune
+the cost factor and the pool size:
+
+    BCRYPT_ROUNDS=12 python demo_server.py
+    python benchmarks/bench_login_storm.py --logins 32 --duration 10
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:8001/api"
+PASSWORD = "bench-password"
+
+def create_account():
+    """Register a throwaway account and return its email"""
+    email = f"bench.{uuid.uuid4().hex[:8]}@example.com"
+    response = requests.post(f"{BASE_URL}/auth/register", json={
+        "email": email,
+        "password": PASSWORD,
+        "full_name": "Bench User"
+    })
+    response.raise_for_status()
+    return email
+
+def measure_probe(duration):
+    """Hit the root endpoint in a loop and return per-request latencies in ms"""
+    latencies = []
+    session = requests.Session()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        session.get(f"{BASE_URL}/")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def summarize(label, latencies, duration):
+    """Print throughput and latency percentiles"""
+    if not latencies:
+        print(f"{label:<28} no requests completed")
+        return
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<28} {len(latencies) / duration:8.1f} req/s   "
+          f"p50 {statistics.median(latencies):7.1f} ms   p99 {p99:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logins against other endpoints")
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Probe duration in seconds")
+    args = parser.parse_args()
+
+    email = create_account()
+
+    # Baseline: nothing else in flight
+    summarize("GET /api/ (idle)", measure_probe(args.duration), args.duration)
+
+    # Under load: keep logins in flight for the whole probe window
+    stop_event = threading.Event()
+    login_latencies = []
+
+    def keep_logging_in():
+        session = requests.Session()
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            response = session.post(f"{BASE_URL}/auth/login", json={"email": email, "password": PASSWORD})
+            if response.status_code == 200:
+                login_latencies.append((time.perf_counter() - start) * 1000)
+
+    with ThreadPoolExecutor(max_workers=args.logins) as pool:
+        for _ in range(args.logins):
+            pool.submit(keep_logging_in)
+        probe_latencies = measure_probe(args.duration)
+        stop_event.set()
+
+    summarize("GET /api/ (login storm)", probe_latencies, args.duration)
+    summarize("POST /api/auth/login", login_latencies, args.duration)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+JobBot Match Scoring Benchmark
+==============================
+
+Scores a batch of synthetic jobs against one profile with MatchScorer and reports
+how long encoding (one text pass per job) and the vectorized scoring pass take,
+against scoring the same jobs one at a time, which is what per-job scoring at
+ingest used to cost:
+
+    python benchmarks/bench_match_scoring.py --jobs 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.match_scoring import JobFeatures, MatchScorer, ProfileFeatures
+
+SKILLS = ["Python", "SQL", "Product Strategy", "A/B Testing", "Roadmapping", "Tableau", "Go", "Kubernetes",
+          "Machine Learning", "Stakeholder Management", "Figma", "React", "Node.js", "C++", "Excel"]
+TITLES = ["Product Manager", "Senior Product Manager", "Staff Engineer", "Junior Analyst", "Head of Product",
+          "Data Scientist", "Lead Designer", "Software Engineer"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Remote", "Austin, TX", "Seattle, WA (Hybrid)", ""]
+FILLER = ("we are a fast growing team building tools that customers love and you will work across the "
+          "company with engineering design and data partners to ship meaningful improvements").split()
+
+PROFILE = {
+    "skills": ["Python", "SQL", "Product Strategy", "A/B Testing", "Roadmapping", "Stakeholder Management"],
+    "experience": [{"title": "Senior Product Manager", "company": "Acme", "start_date": "2017-03",
+                    "end_date": "present", "description": ""}],
+    "preferences": {"min_salary": 160000, "work_arrangement": "hybrid", "willingness_to_relocate": False},
+    "personal_info": {"location": "San Francisco, CA"}
+}
+
+def make_job(rng):
+    low = rng.randrange(80, 220)
+    words = [rng.choice(FILLER) for _ in range(rng.randint(60, 200))]
+    for skill in rng.sample(SKILLS, rng.randint(0, 5)):
+        words.insert(rng.randrange(len(words)), skill)
+    return {
+        "title": rng.choice(TITLES),
+        "location": rng.choice(LOCATIONS),
+        "salary": rng.choice([f"${low}k - ${low + 30}k", None, f"${low},000-${low + 40},000"]),
+        "description": " ".join(words),
+        "requirements": [f"{rng.randint(1, 10)}+ years experience"]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch job match scoring")
+    parser.add_argument("--jobs", type=int, default=100000, help="Jobs scored against the profile")
+    parser.add_argument("--single", type=int, default=2000, help="Jobs scored one at a time for comparison")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [make_job(rng) for _ in range(args.jobs)]
+    scorer = MatchScorer()
+
+    started = time.perf_counter()
+    profile = ProfileFeatures(PROFILE)
+    features = JobFeatures(jobs, profile)
+    encode_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = scorer.score(profile, features)
+    score_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for job in jobs[:args.single]:
+        scorer.score_jobs(PROFILE, [job])
+    single_seconds = (time.perf_counter() - started) / args.single * args.jobs
+
+    batch_seconds = encode_seconds + score_seconds
+    print(f"Jobs:                 {args.jobs}")
+    print(f"Encode (text pass):   {encode_seconds * 1000:9.1f} ms  ({encode_seconds / args.jobs * 1e6:.2f} us/job)")
+    print(f"Score (NumPy pass):   {score_seconds * 1000:9.1f} ms  ({score_seconds / args.jobs * 1e9:.0f} ns/job)")
+    print(f"Batch total:          {batch_seconds * 1000:9.1f} ms  ({args.jobs / batch_seconds:,.0f} jobs/s)")
+    print(f"One at a time (est.): {single_seconds * 1000:9.1f} ms  ({batch_seconds and single_seconds / batch_seconds:.1f}x slower)")
+    print(f"Scores: mean {scores.mean():.1f}, p10 {float(sorted(scores)[len(scores) // 10]):.1f}, "
+          f"p90 {float(sorted(scores)[len(scores) * 9 // 10]):.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+JobBot Resume Parsing Benchmark
+===============================
+
+Measures resume parsing throughput three ways: inline on one core, through the
+ResumeParser process pool (with no cache hits), and again through the pool once
+the parse cache is warm. While the pool runs, a ticker task records the worst
+event-loop stall, which should stay near zero.
+
+Uses a directory of real resumes when given, otherwise a synthetic corpus of
+PDF and DOCX files (PDF parsing needs pypdf):
+
+    python benchmarks/bench_resume_parsing.py --count 200 --workers 4
+    python benchmarks/bench_resume_parsing.py --corpus ~/resumes
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import random
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.resume_parser import ResumeParser, parse_resume
+
+TITLES = ["Senior Product Manager", "Software Engineer", "Data Scientist", "Engineering Manager", "Designer"]
+COMPANIES = ["Google", "Amazon", "Tesla", "Stripe", "Netflix", "Airbnb", "OpenAI", "Startup Inc"]
+SKILLS = ["Python", "SQL", "Product Strategy", "A/B Testing", "Machine Learning", "React", "AWS", "Go",
+          "Kubernetes", "Roadmapping", "User Research", "Data Analytics", "Leadership"]
+SCHOOLS = ["Stanford University", "UC Berkeley", "University of Washington", "MIT", "Georgia Institute of Technology"]
+DEGREES = ["BS Computer Science", "MS Computer Science", "MBA", "BA Economics"]
+
+def make_resume_lines(index):
+    """Build the text lines of a synthetic resume"""
+    rng = random.Random(index)
+    lines = [f"Candidate {chr(65 + index % 26)} Number",
+             f"candidate{index}@example.com | +1 408 555 {index % 10000:04d} | San Jose, CA",
+             "", "EXPERIENCE"]
+    year = 2024
+    for _ in range(rng.randint(2, 5)):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 else f"Dec {year}"
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}    Jan {start} - {end}")
+        lines.extend(f"- Delivered project {rng.randint(1, 999)} improving metric by {rng.randint(5, 80)}%"
+                     for _ in range(rng.randint(2, 6)))
+        year = start
+    lines += ["", "EDUCATION", f"{rng.choice(SCHOOLS)} - {rng.choice(DEGREES)}, {year - 1}",
+              "", "SKILLS", ", ".join(rng.sample(SKILLS, 6))]
+    return lines
+
+def make_docx(lines):
+    """Build a minimal DOCX file containing one paragraph per line"""
+    namespace = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    body = "".join(f"<w:p><w:r><w:t xml:space=\"preserve\">{line}</w:t></w:r></w:p>" for line in lines)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml",
+                         f"<w:document xmlns:w=\"{namespace}\"><w:body>{body}</w:body></w:document>")
+    return buffer.getvalue()
+
+def make_pdf(lines):
+    """Build a minimal single-page PDF with one text line per line"""
+    escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines]
+    content = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    output = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return output.encode("latin-1")
+
+def load_corpus(args):
+    """Return a list of (filename, bytes) resumes"""
+    if args.corpus:
+        return [(path.name, path.read_bytes()) for path in sorted(Path(args.corpus).expanduser().iterdir())
+                if path.suffix.lower() in (".pdf", ".docx", ".doc")]
+    corpus = []
+    for index in range(args.count):
+        lines = make_resume_lines(index)
+        if args.pdf and index % 2:
+            corpus.append((f"resume_{index}.pdf", make_pdf(lines)))
+        else:
+            corpus.append((f"resume_{index}.docx", make_docx(lines)))
+    return corpus
+
+async def measure_loop_lag(stop, interval=0.005):
+    """Track the longest delay between ticks that should fire every interval"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+async def run_pool(parser, corpus):
+    """Parse the whole corpus concurrently through the pool; returns (seconds, worst loop lag)"""
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        parser.parse(io.BytesIO(data), filename, hashlib.sha256(data).hexdigest())
+        for filename, data in corpus
+    ])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await lag_task
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume parsing")
+    parser.add_argument("--corpus", help="Directory of .pdf/.docx/.doc resumes")
+    parser.add_argument("--count", type=int, default=200, help="Synthetic resumes to generate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser processes")
+    parser.add_argument("--no-pdf", dest="pdf", action="store_false", help="Generate DOCX only")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    total_mb = sum(len(data) for _, data in corpus) / (1024 * 1024)
+    print(f"Corpus: {len(corpus)} resumes, {total_mb:.1f} MB")
+
+    start = time.perf_counter()
+    for filename, data in corpus:
+        parse_resume(data, filename)
+    inline_seconds = time.perf_counter() - start
+    print(f"{'inline (1 core)':>24}: {len(corpus) / inline_seconds:8.1f} resumes/s  "
+          f"(blocks the event loop for {inline_seconds * 1000:.0f} ms)")
+
+    resume_parser = ResumeParser(max_workers=args.workers)
+    try:
+        # Start the worker processes without touching the parse cache
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[
+            loop.run_in_executor(resume_parser._get_pool(), parse_resume, data, filename)
+            for filename, data in corpus[:args.workers]
+        ])
+
+        cold_seconds, cold_lag = await run_pool(resume_parser, corpus)
+        print(f"{f'pool ({args.workers} workers)':>24}: {len(corpus) / cold_seconds:8.1f} resumes/s  "
+              f"(worst loop stall {cold_lag * 1000:.1f} ms)")
+
+        warm_seconds, warm_lag = await run_pool(resume_parser, corpus)
+        print(f"{'pool, cache warm':>24}: {len(corpus) / warm_seconds:8.1f} resumes/s  "
+              f"(worst loop stall {warm_lag * 1000:.1f} ms)")
+        print(f"Cache: {resume_parser.get_stats()['cache']}")
+    finally:
+        resume_parser.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
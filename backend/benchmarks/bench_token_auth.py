@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+JobBot Token Auth Benchmark
+===========================
+
+Reports the per-request cost of authenticating a bearer token in the demo
+server: the previous path (jwt.decode on every request, then a user lookup)
+against TokenVerifier (claims cached until exp, denylist check, then the same
+lookup). Runs in-process against the in-memory and SQLite user stores:
+
+    python benchmarks/bench_token_auth.py --tokens 1000 --requests 200000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jwt
+
+from services.token_verifier import TokenVerifier
+from services.user_store import InMemoryUserStore, SQLiteUserStore
+
+SECRET_KEY = "bench-secret-key-long-enough-for-hs256-signing"
+ALGORITHM = "HS256"
+
+def make_token(user_id):
+    """Issue a token the way demo_server.create_access_token does"""
+    claims = {"sub": user_id, "exp": datetime.utcnow() + timedelta(hours=1), "jti": uuid.uuid4().hex}
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+def per_request_us(authenticate, tokens, requests):
+    """Return mean microseconds per authenticated request"""
+    sample = [random.choice(tokens) for _ in range(requests)]
+    start = time.perf_counter()
+    for token in sample:
+        authenticate(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-request token authentication")
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct users/tokens in rotation")
+    parser.add_argument("--requests", type=int, default=200000, help="Authenticated requests to time")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    stores = {
+        "memory": InMemoryUserStore(),
+        "sqlite": SQLiteUserStore(os.path.join(directory, "users.db"))
+    }
+    users = [{"id": f"user_{i}", "personal_info": {"email": f"user{i}@example.com"}} for i in range(args.tokens)]
+    tokens = [make_token(user["id"]) for user in users]
+
+    print(f"{'store':>8} {'decode (us)':>12} {'cached (us)':>12} {'saved':>7}")
+    try:
+        for name, store in stores.items():
+            store.create_many(users)
+
+            def authenticate_decode(token):
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+                return store.get(payload["sub"])
+
+            verifier = TokenVerifier(SECRET_KEY, [ALGORITHM], store=store, max_entries=args.tokens)
+
+            def authenticate_cached(token):
+                return store.get(verifier.verify(token)["sub"])
+
+            before = per_request_us(authenticate_decode, tokens, args.requests)
+            after = per_request_us(authenticate_cached, tokens, args.requests)
+            print(f"{name:>8} {before:>12.1f} {after:>12.1f} {(1 - after / before) * 100:>6.0f}%")
+            print(f"{'':>8} verifier: {verifier.get_stats()}")
+    finally:
+        stores["sqlite"].close()
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+JobBot User Analytics Benchmark
+===============================
+
+Compares the previous in-Python get_user_analytics computation (load every
+Application, then count and bucket in Python) with the $facet aggregation now
+used by AnalyticsService, at 1k, 10k and 100k applications. The $facet timing
+covers the full get_user_analytics call (campaigns and keywords included), so
+the comparison favours the legacy path.
+
+Seeds a throwaway database, so point it at a scratch MongoDB:
+
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/bench_user_analytics.py
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from services.analytics_service import AnalyticsService
+
+STATUSES = ["submitted", "response_received", "interview_scheduled", "rejected"]
+
+def make_application(user_id, campaign_ids, now):
+    """Build a synthetic application document"""
+    submitted_at = now - timedelta(days=random.uniform(0, 90))
+    status = random.choice(STATUSES)
+    response = None
+    if status != "submitted":
+        response = {
+            "type": "interview_request" if status == "interview_scheduled" else "follow_up",
+            "received_at": submitted_at + timedelta(days=random.uniform(0.5, 10)),
+            "message": "Thanks for applying"
+        }
+    return {
+        "id": str(uuid.uuid4()),
+        "job_id": str(uuid.uuid4()),
+        "campaign_id": random.choice(campaign_ids),
+        "user_id": user_id,
+        "submitted_at": submitted_at,
+        "status": status,
+        "custom_resume_base64": None,
+        "cover_letter": "Dear Hiring Manager, " + "x" * 1500,
+        "ai_confidence": random.random(),
+        "response": response,
+        "created_at": submitted_at,
+        "updated_at": submitted_at
+    }
+
+async def seed(db, user_id, count):
+    """Insert campaigns and applications for one user"""
+    campaign_ids = [str(uuid.uuid4()) for _ in range(5)]
+    await db.job_search_campaigns.insert_many([
+        {"id": campaign_id, "user_id": user_id, "name": f"Campaign {i}", "status": "active",
+         "keywords": ["Product", "AI"], "applications_submitted": 0, "responses": 0, "interviews": 0}
+        for i, campaign_id in enumerate(campaign_ids)
+    ])
+    now = datetime.utcnow()
+    for start in range(0, count, 5000):
+        batch = [make_application(user_id, campaign_ids, now) for _ in range(min(5000, count - start))]
+        await db.applications.insert_many(batch, ordered=False)
+
+async def legacy_user_stats(service, user_id):
+    """The previous implementation: fetch every application and compute in Python"""
+    applications = await service.application_service.get_applications_by_user(user_id)
+    total_applications = len(applications)
+    total_responses = len([app for app in applications if app.response])
+    total_interviews = len([app for app in applications if app.status == "interview_scheduled"])
+
+    response_times = [
+        (app.response.received_at - app.submitted_at).total_seconds() / 86400
+        for app in applications if app.response and app.response.received_at
+    ]
+    avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+
+    apps_by_date = {}
+    for app in applications:
+        app_date = app.submitted_at.date()
+        apps_by_date[app_date] = apps_by_date.get(app_date, 0) + 1
+    applications_by_day = [
+        {"date": (datetime.utcnow() - timedelta(days=i)).date().strftime("%Y-%m-%d"),
+         "count": apps_by_date.get((datetime.utcnow() - timedelta(days=i)).date(), 0)}
+        for i in range(29, -1, -1)
+    ]
+    return total_applications, total_responses, total_interviews, avg_response_time, applications_by_day
+
+async def timed(coro_factory, repeat):
+    """Return the best wall time in ms over several runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark user analytics")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated application counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db_name = f"jobbot_bench_{uuid.uuid4().hex[:8]}"
+    db = client[db_name]
+    service = AnalyticsService(db)
+    await db.applications.create_index([("user_id", 1), ("submitted_at", -1)])
+
+    print(f"{'applications':>12} {'legacy (ms)':>12} {'$facet (ms)':>12} {'speedup':>8}")
+    try:
+        for size in [int(value) for value in args.sizes.split(",")]:
+            user_id = f"bench_user_{size}"
+            await seed(db, user_id, size)
+
+            legacy_ms = await timed(lambda: legacy_user_stats(service, user_id), args.repeat)
+            facet_ms = await timed(lambda: service.get_user_analytics(user_id), args.repeat)
+            print(f"{size:>12} {legacy_ms:>12.1f} {facet_ms:>12.1f} {legacy_ms / facet_ms:>7.1f}x")
+    finally:
+        await client.drop_database(db_name)
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+JobBot User Store Benchmark
+===========================
+
+Times get_by_email lookups against the demo server's SQLite user store (and
+the in-memory store for reference) as the number of users grows, plus the time
+to open an existing store, which is what a restarting worker pays:
+
+    python benchmarks/bench_user_store.py --sizes 10,1000,100000,1000000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.user_store import InMemoryUserStore, SQLiteUserStore
+
+def make_user(index):
+    """Build a demo-server user dict"""
+    return {
+        "id": f"user_{index}",
+        "personal_info": {"full_name": f"User {index}", "email": f"user{index}@example.com"},
+        "skills": ["Python", "SQL", "Product Strategy"],
+        "resumes": [],
+        "password_hash": "$2b$12$" + "x" * 53
+    }
+
+def fill(store, start, stop, batch_size=10000):
+    """Insert users [start, stop) in batches"""
+    for batch_start in range(start, stop, batch_size):
+        store.create_many(make_user(i) for i in range(batch_start, min(stop, batch_start + batch_size)))
+
+def time_lookups(store, size, lookups):
+    """Return mean microseconds per random get_by_email"""
+    emails = [f"user{random.randrange(size)}@example.com" for _ in range(lookups)]
+    start = time.perf_counter()
+    for email in emails:
+        assert store.get_by_email(email) is not None
+    return (time.perf_counter() - start) / lookups * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark user store lookups")
+    parser.add_argument("--sizes", default="10,1000,100000", help="Comma-separated user counts")
+    parser.add_argument("--lookups", type=int, default=20000, help="Lookups per measurement")
+    args = parser.parse_args()
+
+    sizes = sorted(int(value) for value in args.sizes.split(","))
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "users.db")
+    sqlite_store = SQLiteUserStore(path)
+    memory_store = InMemoryUserStore()
+
+    print(f"{'users':>10} {'sqlite (us)':>12} {'memory (us)':>12} {'open (ms)':>10}")
+    filled = 0
+    try:
+        for size in sizes:
+            fill(sqlite_store, filled, size)
+            fill(memory_store, filled, size)
+            filled = size
+
+            start = time.perf_counter()
+            SQLiteUserStore(path).close()
+            open_ms = (time.perf_counter() - start) * 1000
+
+            print(f"{size:>10} {time_lookups(sqlite_store, size, args.lookups):>12.1f} "
+                  f"{time_lookups(memory_store, size, args.lookups):>12.1f} {open_ms:>10.2f}")
+    finally:
+        sqlite_store.close()
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
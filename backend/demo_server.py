@@ -7,10 +7,12 @@ This is a simplified version of the JobBot server for local demo purposes.
 It uses mock data instead of requiring MongoDB setup.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, status, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import json
 from datetime import datetime, timedelta
 import uuid
@@ -18,6 +20,10 @@ import jwt
 from passlib.context import CryptContext
 import os
 from pydantic import BaseModel
+from services.upload_stream import receive_upload, InvalidUpload, UploadTooLarge
+from services.resume_parser import ResumeParser
+from services.user_store import create_user_store, UserExists
+from services.token_verifier import TokenVerifier
 
 app = FastAPI(title="JobBot Demo API", version="1.0.0-demo")
 
@@ -26,7 +32,18 @@ SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours for easier testing
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Resume uploads
+RESUME_MAX_BYTES = 5 * 1024 * 1024
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx')
+resume_parser = ResumeParser()
+
+# bcrypt cost factor and how many hashes may run at once. bcrypt releases the GIL,
+# so the dedicated pool uses spare cores while the event loop keeps serving requests.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get('PASSWORD_HASH_CONCURRENCY', str(os.cpu_count() or 1)))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_CONCURRENCY, thread_name_prefix="password-hash")
 security = HTTPBearer()
 
 # Pydantic models
@@ -53,16 +70,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory user storage for demo
-USERS_DB = {}
-USER_COUNTER = 1
+# User storage for demo: an SQLite file next to this script, shared by all workers
+# (USER_STORE_URL=memory:// keeps users in-process and forgets them on restart)
+USER_STORE_URL = os.environ.get(
+    'USER_STORE_URL', f"sqlite:///{os.path.join(os.path.dirname(os.path.abspath(__file__)), 'demo_users.db')}"
+)
+user_store = create_user_store(USER_STORE_URL)
+# Store calls (and token checks, which may sync revocations from it) run on one thread off the
+# event loop: SQLite waits up to busy_timeout on a contended write, and the store serializes
+# on a single connection anyway, which also keeps the in-memory store's checks atomic.
+user_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="user-store")
+
+# Verified token claims are cached until exp; logout adds the token to the store's denylist
+token_verifier = TokenVerifier(SECRET_KEY, [ALGORITHM], store=user_store)
 
 # Pre-seed Aniket's account
 def seed_default_user():
-    global USER_COUNTER
-    
     # Create Aniket's user account
     user_id = "aniket_user_1"
+    if user_store.get(user_id):
+        return
     aniket_user = {
         "id": user_id,
         "personal_info": {
@@ -114,8 +141,10 @@ def seed_default_user():
         "updated_at": datetime.utcnow().isoformat()
     }
     
-    USERS_DB[user_id] = aniket_user
-    USER_COUNTER = 2
+    try:
+        user_store.create(aniket_user)
+    except UserExists:
+        return  # Another worker seeded it first
     print(f"✅ Pre-seeded user: {aniket_user['personal_info']['email']}")
 
 # Authentication functions
@@ -125,6 +154,25 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the password pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, get_password_hash, password)
+
+async def user_store_call(function, *args):
+    """Run a user store or token verifier call in the user store thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(user_store_executor, function, *args)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str):
+    """Verify a password in the password pool.
+
+    Returns (valid, new_hash); new_hash is set when the stored hash used an older
+    cost factor and should be replaced.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, pwd_context.verify_and_update, plain_password, hashed_password)
+
 # Seed the default user on startup
 seed_default_user()
 
@@ -134,17 +182,17 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = await user_store_call(token_verifier.verify, credentials.credentials)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-        user = USERS_DB.get(user_id)
+        user = await user_store_call(user_store.get, user_id)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         return user
@@ -282,12 +330,26 @@ async def update_user_profile(user_id: str, profile_data: dict, current_user: di
     if current_user["id"] != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    # Email is the login key: keep the current one when the update leaves it out
+    if "personal_info" in profile_data:
+        personal_info = profile_data["personal_info"]
+        if not isinstance(personal_info, dict):
+            raise HTTPException(status_code=400, detail="personal_info must be an object")
+        email = personal_info.get("email", current_user["personal_info"]["email"])
+        if not isinstance(email, str) or "@" not in email:
+            raise HTTPException(status_code=400, detail="A valid email is required")
+        profile_data = {**profile_data, "personal_info": {**personal_info, "email": email}}
+    
     # Update user data (excluding password_hash and id)
     for key, value in profile_data.items():
         if key not in ["password_hash", "id"]:
             current_user[key] = value
     
     current_user["updated_at"] = datetime.utcnow().isoformat()
+    try:
+        await user_store_call(user_store.save, current_user)
+    except UserExists as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {k: v for k, v in current_user.items() if k != "password_hash"}
 
@@ -382,16 +444,13 @@ async def get_linkedin_rate_limit():
 # Authentication endpoints
 @app.post("/api/auth/register", response_model=Token)
 async def register(user_data: UserRegister):
-    global USER_COUNTER
-    
     # Check if user already exists
-    for existing_user in USERS_DB.values():
-        if existing_user["personal_info"]["email"] == user_data.email:
-            raise HTTPException(status_code=400, detail="Email already registered")
+    if await user_store_call(user_store.get_by_email, user_data.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new user
-    user_id = f"user_{USER_COUNTER}"
-    USER_COUNTER += 1
+    user_id = f"user_{uuid.uuid4().hex[:12]}"
+    password_hash = await hash_password_async(user_data.password)
     
     new_user = {
         "id": user_id,
@@ -414,12 +473,16 @@ async def register(user_data: UserRegister):
             "willingness_to_relocate": False
         },
         "resume_file": None,
-        "password_hash": get_password_hash(user_data.password),
+        "password_hash": password_hash,
         "created_at": datetime.utcnow().isoformat(),
         "updated_at": datetime.utcnow().isoformat()
     }
     
-    USERS_DB[user_id] = new_user
+    # The store's unique email index catches a concurrent registration of the same email
+    try:
+        await user_store_call(user_store.create, new_user)
+    except UserExists as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -439,14 +502,16 @@ async def register(user_data: UserRegister):
 @app.post("/api/auth/login", response_model=Token)
 async def login(user_data: UserLogin):
     # Find user by email
-    user = None
-    for u in USERS_DB.values():
-        if u["personal_info"]["email"] == user_data.email:
-            user = u
-            break
+    user = await user_store_call(user_store.get_by_email, user_data.email)
     
-    if not user or not verify_password(user_data.password, user["password_hash"]):
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    valid, new_hash = await verify_and_update_password_async(user_data.password, user["password_hash"])
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        user["password_hash"] = new_hash
+        await user_store_call(user_store.save, user)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -463,6 +528,18 @@ async def login(user_data: UserLogin):
         "user": user_response
     }
 
+@app.post("/api/auth/logout")
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    try:
+        await user_store_call(token_verifier.revoke, credentials.credentials)
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    return {"success": True, "message": "Logged out"}
+
+@app.get("/api/admin/auth-cache")
+async def get_auth_cache_stats():
+    return token_verifier.get_stats()
+
 @app.get("/api/auth/verify")
 async def verify_token(current_user: dict = Depends(get_current_user)):
     return {"valid": True, "user": {k: v for k, v in current_user.items() if k != "password_hash"}}
@@ -471,34 +548,36 @@ async def verify_token(current_user: dict = Depends(get_current_user)):
 @app.post("/api/users/{user_id}/resume")
 async def upload_resume(
     user_id: str, 
-    file: UploadFile = File(...),
+    request: Request,
     current_user: dict = Depends(get_current_user)
 ):
     # Check if user owns this profile
     if current_user["id"] != user_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Validate file type
-    if not file.filename.lower().endswith(('.pdf', '.doc', '.docx')):
-        raise HTTPException(status_code=400, detail="Only PDF, DOC, and DOCX files are allowed")
-    
-    # Read file content to get size
-    content = await file.read()
-    file_size = len(content)
-    
-    # Validate file size (5MB limit)
-    if file_size > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large. Maximum size is 5MB")
+    # Stream the "file" field into a spooled temp file, validating type and size as it arrives
+    try:
+        upload = await receive_upload(request, "file", RESUME_MAX_BYTES, RESUME_EXTENSIONS)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUpload as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Parse resume content
-    parsed_data = await parse_resume_content(content, file.filename)
+    # Parse in the worker pool; re-uploads of the same file come from the parse cache
+    try:
+        parsed_data = await resume_parser.parse(upload.file, upload.filename, upload.sha256)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Could not parse resume: {e}")
+    finally:
+        upload.close()
     
     # Create resume record (single resume per user)
     resume_info = {
         "id": "user_resume",
-        "filename": file.filename,
-        "content_type": file.content_type,
-        "size": file_size,
+        "filename": upload.filename,
+        "content_type": upload.content_type,
+        "size": upload.size,
+        "sha256": upload.sha256,
         "uploaded_at": datetime.utcnow().isoformat(),
         "is_active": True,
         "parsed_data": parsed_data
@@ -511,104 +590,37 @@ async def upload_resume(
     # Update user profile with parsed data
     if parsed_data:
         await update_profile_from_resume(current_user, parsed_data)
+    await user_store_call(user_store.save, current_user)
     
     return {"success": True, "resume": resume_info}
 
-async def parse_resume_content(content: bytes, filename: str):
-    """Mock resume parsing - in production would use AI/ML service"""
-    # Simulate parsing different file types
-    file_ext = filename.lower().split('.')[-1]
-    
-    # Mock extracted data based on filename patterns
-    if "senior" in filename.lower() or "lead" in filename.lower():
-        return {
-            "personal_info": {
-                "full_name": "John Doe",
-                "email": "john.doe@email.com",
-                "phone": "+1-555-0123",
-                "location": "San Francisco, CA"
-            },
-            "experience": [
-                {
-                    "title": "Senior Product Manager",
-                    "company": "Tech Corp",
-                    "start_date": "2020-01",
-                    "end_date": "present",
-                    "description": "Led product strategy and development for AI-powered solutions"
-                }
-            ],
-            "skills": ["Product Management", "AI/ML", "Data Analysis", "Leadership", "Strategy"],
-            "education": [
-                {
-                    "degree": "MBA",
-                    "school": "Stanford University", 
-                    "graduation_year": "2019"
-                }
-            ]
-        }
-    else:
-        return {
-            "personal_info": {
-                "full_name": "Jane Smith",
-                "email": "jane.smith@email.com", 
-                "phone": "+1-555-0456",
-                "location": "New York, NY"
-            },
-            "experience": [
-                {
-                    "title": "Software Engineer",
-                    "company": "Startup Inc",
-                    "start_date": "2021-06", 
-                    "end_date": "present",
-                    "description": "Developed web applications using React and Node.js"
-                }
-            ],
-            "skills": ["JavaScript", "React", "Node.js", "Python", "AWS"],
-            "education": [
-                {
-                    "degree": "BS Computer Science",
-                    "school": "UC Berkeley",
-                    "graduation_year": "2021"  
-                }
-            ]
-        }
+def _merge_unique(existing: list, incoming: list, key):
+    """Append incoming items whose key is not already present"""
+    seen = {key(item) for item in existing}
+    for item in incoming:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            existing.append(item)
+
+def _casefold(value) -> str:
+    return (value or "").strip().casefold()
 
 async def update_profile_from_resume(user: dict, parsed_data: dict):
     """Update user profile with parsed resume data"""
     # Update personal info if not already filled
+    personal_info = user.setdefault("personal_info", {})
     for key, value in parsed_data.get("personal_info", {}).items():
-        if not user.get("personal_info", {}).get(key):
-            if "personal_info" not in user:
-                user["personal_info"] = {}
-            user["personal_info"][key] = value
-    
-    # Merge experience 
-    if parsed_data.get("experience"):
-        if "experience" not in user:
-            user["experience"] = []
-        for exp in parsed_data["experience"]:
-            # Add if not already exists
-            if not any(e.get("title") == exp.get("title") and 
-                      e.get("company") == exp.get("company") for e in user["experience"]):
-                user["experience"].append(exp)
-    
-    # Merge skills
-    if parsed_data.get("skills"):
-        if "skills" not in user:
-            user["skills"] = []
-        for skill in parsed_data["skills"]:
-            if skill not in user["skills"]:
-                user["skills"].append(skill)
+        if not personal_info.get(key):
+            personal_info[key] = value
     
-    # Merge education
-    if parsed_data.get("education"):
-        if "education" not in user:
-            user["education"] = []
-        for edu in parsed_data["education"]:
-            # Add if not already exists
-            if not any(e.get("degree") == edu.get("degree") and 
-                      e.get("school") == edu.get("school") for e in user["education"]):
-                user["education"].append(edu)
+    # Merge experience, education, skills and certifications, skipping entries already on the profile
+    _merge_unique(user.setdefault("experience", []), parsed_data.get("experience", []),
+                  lambda exp: (_casefold(exp.get("title")), _casefold(exp.get("company"))))
+    _merge_unique(user.setdefault("education", []), parsed_data.get("education", []),
+                  lambda edu: (_casefold(edu.get("degree")), _casefold(edu.get("school"))))
+    _merge_unique(user.setdefault("skills", []), parsed_data.get("skills", []), _casefold)
+    _merge_unique(user.setdefault("certifications", []), parsed_data.get("certifications", []), _casefold)
 
 @app.get("/api/users/{user_id}/resumes")
 async def get_resumes(
@@ -635,9 +647,16 @@ async def delete_resume(
     # Clear the user's resume
     current_user["resumes"] = []
     current_user["updated_at"] = datetime.utcnow().isoformat()
+    await user_store_call(user_store.save, current_user)
     
     return {"success": True, "message": "Resume deleted"}
 
+@app.on_event("shutdown")
+async def shutdown_workers():
+    resume_parser.close()
+    password_executor.shutdown(wait=False)
+    user_store_executor.shutdown(wait=True)
+    user_store.close()
 
 if __name__ == "__main__":
     import uvicorn
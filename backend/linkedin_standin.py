@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+JobBot LinkedIn Stand-in
+========================
+
+A local imitation of the LinkedIn endpoints JobBot calls, for running campaign
+discovery end to end without API access. Any authorization code is exchanged for
+a token, and job searches return a fresh, deterministic set of postings per
+keywords/location that changes every --rotate-minutes:
+
+    python linkedin_standin.py --port 8099
+
+Then start the API against it:
+
+    LINKEDIN_API_BASE_URL=http://127.0.0.1:8099/v2 \\
+    LINKEDIN_OAUTH_BASE_URL=http://127.0.0.1:8099/oauth/v2 \\
+    DISCOVERY_INTERVAL_SECONDS=60 uvicorn server:app
+
+and link a user with POST /api/linkedin/callback {"code": "any", "user_id": ...}.
+"""
+
+import argparse
+import hashlib
+import json
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COMPANIES = ["Meta", "Google", "Stripe", "Figma", "Airbnb", "Spotify", "Netflix", "Coinbase"]
+SENIORITIES = ["Senior", "Staff", "Lead", "Principal", "Head of"]
+
+def make_postings(keywords, location, count, rotate_minutes):
+    """Postings for a search; the same search gets the same postings until the next rotation"""
+    window = int(time.time() // (rotate_minutes * 60))
+    now_ms = int(time.time() * 1000)
+    postings = []
+    for i in range(count):
+        digest = hashlib.sha256(f"{keywords.lower()}|{location.lower()}|{window}|{i}".encode()).hexdigest()
+        seed = int(digest[:8], 16)
+        postings.append({
+            "id": str(int(digest[:12], 16)),
+            "title": f"{SENIORITIES[seed % len(SENIORITIES)]} {keywords.title()}",
+            "companyName": COMPANIES[(seed // 7) % len(COMPANIES)],
+            "location": location or "Remote",
+            "description": f"Join us as a {keywords} ({'remote' if seed % 3 == 0 else 'on-site'}).",
+            "listedAt": now_ms - (seed % (rotate_minutes * 60)) * 1000
+        })
+    return postings
+
+def make_handler(args):
+    class LinkedInStandinHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                self.respond(401, {"message": "Missing access token"})
+            elif url.path == "/v2/jobSearch":
+                count = min(int(query.get("count", 25)), args.postings)
+                postings = make_postings(query.get("keywords", ""), query.get("location", ""),
+                                         count, args.rotate_minutes)
+                self.respond(200, {"elements": postings})
+            elif url.path == "/v2/people/~":
+                self.respond(200, {"id": "standin", "localizedFirstName": "Stand", "localizedLastName": "In"})
+            elif url.path.startswith("/v2/jobs/"):
+                self.respond(200, {"id": url.path.rsplit("/", 1)[-1], "title": "Stand-in job"})
+            else:
+                self.respond(404, {"message": "Not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            if self.path == "/oauth/v2/accessToken":
+                self.respond(200, {"access_token": uuid.uuid4().hex, "expires_in": 60 * 24 * 3600})
+            elif self.path == "/v2/jobApplications":
+                self.respond(201, {"id": uuid.uuid4().hex})
+            else:
+                self.respond(404, {"message": "Not found"})
+
+        def respond(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    verbose = args.verbose
+    return LinkedInStandinHandler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the LinkedIn API")
+    parser.add_argument("--port", type=int, default=8099, help="Port to listen on")
+    parser.add_argument("--postings", type=int, default=10, help="Postings returned per search")
+    parser.add_argument("--rotate-minutes", type=int, default=30, help="Minutes before a search returns new postings")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args))
+    print(f"🔗 LinkedIn stand-in on http://127.0.0.1:{args.port} (API /v2, OAuth /oauth/v2)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
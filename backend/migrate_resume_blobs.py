@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+JobBot Resume Blob Migration
+============================
+
+Moves base64 resumes embedded in user_profiles.resume_base64 and
+applications.custom_resume_base64 into the resumes GridFS bucket, replacing each
+with a resume_id / custom_resume_id content hash. Safe to re-run:
+
+    python migrate_resume_blobs.py
+    python migrate_resume_blobs.py --prune   # also delete resumes nothing references
+"""
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.resume_store import ResumeStore
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def migrate_collection(store, collection, blob_field, ref_field):
+    """Move one embedded blob field into the store; returns (migrated, failed)"""
+    migrated = failed = 0
+    async for document in collection.find({blob_field: {"$exists": True}}, {"_id": 1, "id": 1, blob_field: 1}):
+        update = {"$unset": {blob_field: ""}}
+        if document.get(blob_field):
+            try:
+                update["$set"] = {ref_field: await store.save_base64(document[blob_field])}
+            except ValueError as e:
+                print(f"⚠️  Skipping {collection.name} {document.get('id')}: {e}")
+                failed += 1
+                continue
+        await collection.update_one({"_id": document["_id"]}, update)
+        migrated += 1
+    return migrated, failed
+
+async def main():
+    parser = argparse.ArgumentParser(description="Move embedded resumes into GridFS")
+    parser.add_argument("--prune", action="store_true", help="Delete stored resumes that nothing references")
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ.get('DB_NAME', 'jobbot')]
+    store = ResumeStore(db)
+    try:
+        await store.files.create_indexes(ResumeStore.INDEXES["resumes.files"])
+        for collection, blob_field, ref_field in [
+            (db.user_profiles, "resume_base64", "resume_id"),
+            (db.applications, "custom_resume_base64", "custom_resume_id")
+        ]:
+            migrated, failed = await migrate_collection(store, collection, blob_field, ref_field)
+            print(f"✅ {collection.name}: migrated {migrated} documents, {failed} failed")
+
+        if args.prune:
+            referenced = set(await db.user_profiles.distinct("resume_id"))
+            referenced.update(await db.applications.distinct("custom_resume_id"))
+            deleted = await store.delete_unreferenced(referenced)
+            print(f"🗑️  Deleted {deleted} unreferenced resumes")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
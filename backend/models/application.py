@@ -17,11 +17,12 @@ class Application(BaseModel):
     user_id: str
     submitted_at: datetime = Field(default_factory=datetime.utcnow)
     status: str = "submitted"  # submitted, response_received, interview_scheduled, rejected, withdrawn
-    custom_resume_base64: Optional[str] = None
+    custom_resume_id: Optional[str] = None  # SHA-256 of the file in the resumes GridFS bucket
     cover_letter: Optional[str] = None
     linkedin_message: Optional[str] = None
     ai_confidence: float = 0.0  # 0-1
     response: Optional[ApplicationResponse] = None
+    interview_scheduled_at: Optional[datetime] = None
     notes: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -38,4 +39,14 @@ class ApplicationCreate(BaseModel):
 class ApplicationUpdate(BaseModel):
     status: Optional[str] = None
     response: Optional[ApplicationResponse] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+class ApplicationSummary(BaseModel):
+    id: str
+    job_id: str
+    campaign_id: str
+    user_id: str
+    submitted_at: datetime
+    status: str = "submitted"
+    ai_confidence: float = 0.0
+    updated_at: Optional[datetime] = None
@@ -36,4 +36,15 @@ class JobSearchCampaignUpdate(BaseModel):
     companies: Optional[List[str]] = None
     locations: Optional[List[str]] = None
     experience_level: Optional[str] = None
-    salary_range: Optional[str] = None
\ No newline at end of file
+    salary_range: Optional[str] = None
+
+class JobSearchCampaignSummary(BaseModel):
+    id: str
+    user_id: str
+    name: str
+    status: str = "active"
+    keywords: List[str] = []
+    applications_submitted: int = 0
+    responses: int = 0
+    interviews: int = 0
+    last_activity: Optional[datetime] = None
@@ -21,6 +21,9 @@ class Job(BaseModel):
     linkedin_url: Optional[str] = None
     company_linkedin_url: Optional[str] = None
     raw_data: Optional[Dict[str, Any]] = {}
+    fingerprint: Optional[str] = None  # SimHash of the description, hex
+    duplicate_count: int = 0
+    duplicates: List[Dict[str, Any]] = []  # Most recent postings collapsed onto this job
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -41,4 +44,36 @@ class JobUpdate(BaseModel):
     match_score: Optional[float] = None
     urgency: Optional[str] = None
     description: Optional[str] = None
-    requirements: Optional[List[str]] = None
\ No newline at end of file
+    requirements: Optional[List[str]] = None
+
+class JobBulkItemResult(BaseModel):
+    index: int
+    status: str  # created, duplicate, invalid, failed
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class JobBulkResult(BaseModel):
+    received: int
+    created: int
+    failed: int
+    duplicates: int = 0
+    results: List[JobBulkItemResult]
+
+class JobSummary(BaseModel):
+    id: str
+    campaign_id: str
+    title: str
+    company: str
+    location: str
+    salary: Optional[str] = None
+    posted_at: datetime
+    application_deadline: datetime
+    status: str = "monitoring"
+    match_score: float = 0.0
+    urgency: str = "medium"
+
+class JobSearchResult(JobSummary):
+    relevance: float = 0.0
+
+class JobRecommendation(JobSummary):
+    similarity: float = 0.0
@@ -38,7 +38,7 @@ class UserProfile(BaseModel):
     certifications: List[str] = []
     preferences: UserPreferences = UserPreferences()
     resume_file_path: Optional[str] = None
-    resume_base64: Optional[str] = None
+    resume_id: Optional[str] = None  # SHA-256 of the file in the resumes GridFS bucket
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -58,4 +58,11 @@ class UserProfileUpdate(BaseModel):
     skills: Optional[List[str]] = None
     certifications: Optional[List[str]] = None
     preferences: Optional[UserPreferences] = None
-    resume_base64: Optional[str] = None
\ No newline at end of file
+    resume_base64: Optional[str] = None
+
+class UserProfileSummary(BaseModel):
+    id: str
+    personal_info: PersonalInfo
+    skills: List[str] = []
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
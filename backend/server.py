@@ -2,18 +2,20 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, Query, UploadFile, File
 from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import logging
+import json
 from pathlib import Path
 from typing import List, Optional
 
 # Import models
 from models.user import UserProfile, UserProfileCreate, UserProfileUpdate
 from models.campaign import JobSearchCampaign, JobSearchCampaignCreate, JobSearchCampaignUpdate
-from models.job import Job, JobCreate, JobUpdate
+from models.job import Job, JobCreate, JobUpdate, JobBulkResult
 from models.application import Application, ApplicationCreate, ApplicationUpdate
 
 # Import services
@@ -24,6 +26,13 @@ from services.application_service import ApplicationService
 from services.analytics_service import AnalyticsService
 from services.ai_service import AIService
 from services.linkedin_service import LinkedInService
+from services.index_registry import IndexRegistry
+from services.expiry_scheduler import JobExpiryScheduler
+from services.discovery_scheduler import CampaignDiscoveryScheduler
+from services.recommendation_service import RecommendationService
+from services.event_bus import EventBus, format_sse
+from services.pagination import InvalidCursor, parse_fields
+from services.resume_store import ResumeTooLarge, CHUNK_SIZE as RESUME_CHUNK_SIZE
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -33,6 +42,12 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ.get('DB_NAME', 'jobbot')]
 
+# Maximum resume upload size
+RESUME_MAX_BYTES = int(os.environ.get('RESUME_MAX_BYTES', str(5 * 1024 * 1024)))
+
+# Maximum number of postings accepted by a single bulk ingestion request
+JOB_BULK_MAX_ITEMS = int(os.environ.get('JOB_BULK_MAX_ITEMS', '10000'))
+
 # Initialize services
 user_service = UserService(db)
 campaign_service = CampaignService(db)
@@ -42,6 +57,33 @@ analytics_service = AnalyticsService(db)
 ai_service = AIService(db)
 linkedin_service = LinkedInService(db)
 
+# Change events for the per-user SSE stream
+event_bus = EventBus(queue_size=int(os.environ.get('EVENT_QUEUE_SIZE', '100')))
+job_service.event_bus = event_bus
+application_service.event_bus = event_bus
+campaign_service.event_bus = event_bus
+event_bus.add_listener(analytics_service.handle_event)
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', '15'))
+
+# Deadline-driven expiry and urgency updates
+expiry_scheduler = JobExpiryScheduler(job_service)
+job_service.expiry_scheduler = expiry_scheduler
+
+# Background LinkedIn searches for active campaigns
+discovery_scheduler = CampaignDiscoveryScheduler(campaign_service, job_service, linkedin_service)
+DISCOVERY_ENABLED = os.environ.get('DISCOVERY_ENABLED', 'true').lower() == 'true'
+
+# Vector index over every job for per-user recommendations
+recommendation_service = RecommendationService(db)
+job_service.recommendations = recommendation_service
+
+# Indexes declared next to each service
+index_registry = IndexRegistry(db)
+for service in [user_service, campaign_service, job_service, application_service,
+                application_service.daily_stats_service, user_service.resume_store,
+                ai_service, linkedin_service, recommendation_service]:
+    index_registry.register(service.INDEXES)
+
 # Create the main app without a prefix
 app = FastAPI(title="JobBot API", version="1.0.0")
 
@@ -59,6 +101,8 @@ async def create_user_profile(profile_data: UserProfileCreate):
     """Create a new user profile"""
     try:
         return await user_service.create_user_profile(profile_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -73,15 +117,109 @@ async def get_user_profile(user_id: str):
 @api_router.put("/users/{user_id}", response_model=UserProfile)
 async def update_user_profile(user_id: str, update_data: UserProfileUpdate):
     """Update user profile"""
-    profile = await user_service.update_user_profile(user_id, update_data)
+    try:
+        profile = await user_service.update_user_profile(user_id, update_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not profile:
         raise HTTPException(status_code=404, detail="User profile not found")
+    await ai_service.invalidate_generated_content(user_id=user_id)
+    try:
+        await job_service.rescore_jobs_for_user(user_id)
+    except Exception as e:
+        logger.error(f"Error re-scoring jobs after profile update for {user_id}: {e}")
     return profile
 
-@api_router.get("/users", response_model=List[UserProfile])
-async def list_user_profiles():
-    """List all user profiles"""
-    return await user_service.list_user_profiles()
+@api_router.get("/users/{user_id}/recommendations")
+async def get_job_recommendations(user_id: str, k: int = Query(20, ge=1, le=100),
+                                  basis: str = Query("auto", pattern="^(auto|profile|interviews)$"),
+                                  active_only: bool = True):
+    """Get the jobs most similar to a user's profile and to the jobs they got interviews for"""
+    try:
+        recommendations = await recommendation_service.recommend(user_id, k, basis, active_only)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if recommendations is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return recommendations
+
+@api_router.post("/users/{user_id}/jobs/rescore")
+async def rescore_user_jobs(user_id: str):
+    """Re-score a user's monitored jobs against their current profile"""
+    try:
+        return {"rescored": await job_service.rescore_jobs_for_user(user_id)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _page_fields(fields: Optional[str], model) -> Optional[List[str]]:
+    """Validate a fields= parameter against a model"""
+    try:
+        return parse_fields(fields, model.model_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _paginate(response: Response, page_coro):
+    """Await a page, exposing the next cursor in the X-Next-Cursor header"""
+    try:
+        items, next_cursor = await page_coro
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+@api_router.get("/users")
+async def list_user_profiles(response: Response, limit: int = Query(50, ge=1, le=500),
+                             cursor: Optional[str] = None, fields: Optional[str] = None):
+    """List user profiles, one page at a time"""
+    selected = _page_fields(fields, UserProfile)
+    return await _paginate(response, user_service.list_user_profiles_page(limit, cursor, selected))
+
+async def _upload_chunks(file: UploadFile):
+    """Read an upload chunk by chunk"""
+    while True:
+        chunk = await file.read(RESUME_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+async def _stream_resume(resume_store, resume_id: Optional[str]):
+    """Stream a stored resume back to the client"""
+    grid_out = await resume_store.open(resume_id) if resume_id else None
+    if not grid_out:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    content_type = (grid_out.metadata or {}).get("content_type") or "application/octet-stream"
+    filename = (grid_out.filename or "resume").replace('"', '')
+    return StreamingResponse(
+        resume_store.iter_chunks(grid_out),
+        media_type=content_type,
+        headers={
+            "Content-Length": str(grid_out.length),
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+@api_router.put("/users/{user_id}/resume")
+async def upload_user_resume(user_id: str, file: UploadFile = File(...)):
+    """Upload a resume file for a user"""
+    if not await user_service.get_user_profile(user_id):
+        raise HTTPException(status_code=404, detail="User profile not found")
+    try:
+        resume_id = await user_service.resume_store.save_stream(
+            _upload_chunks(file), file.filename, file.content_type, max_bytes=RESUME_MAX_BYTES
+        )
+    except ResumeTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    await user_service.set_resume(user_id, resume_id)
+    return {"resume_id": resume_id}
+
+@api_router.get("/users/{user_id}/resume")
+async def download_user_resume(user_id: str):
+    """Download a user's resume"""
+    profile = await user_service.get_user_profile(user_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="User profile not found")
+    return await _stream_resume(user_service.resume_store, profile.resume_id)
 
 # Campaign endpoints
 @api_router.post("/campaigns", response_model=JobSearchCampaign)
@@ -113,10 +251,12 @@ async def update_campaign(campaign_id: str, update_data: JobSearchCampaignUpdate
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
-@api_router.get("/campaigns", response_model=List[JobSearchCampaign])
-async def get_active_campaigns():
-    """Get all active campaigns"""
-    return await campaign_service.get_active_campaigns()
+@api_router.get("/campaigns")
+async def get_active_campaigns(response: Response, limit: int = Query(50, ge=1, le=500),
+                               cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get active campaigns, one page at a time"""
+    selected = _page_fields(fields, JobSearchCampaign)
+    return await _paginate(response, campaign_service.get_active_campaigns_page(limit, cursor, selected))
 
 # Job endpoints
 @api_router.post("/jobs", response_model=Job)
@@ -127,6 +267,44 @@ async def create_job(job_data: JobCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.post("/jobs/bulk", response_model=JobBulkResult)
+async def create_jobs_bulk(request: Request):
+    """Create many jobs from a JSON array or an NDJSON body"""
+    body = await request.body()
+    content_type = request.headers.get('content-type', '')
+    
+    try:
+        if 'ndjson' in content_type or 'jsonlines' in content_type:
+            items = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON body")
+    if len(items) > JOB_BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {JOB_BULK_MAX_ITEMS} jobs per request")
+    
+    try:
+        return await job_service.create_jobs_bulk(items)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/jobs/search")
+async def search_jobs(response: Response, q: str = Query(..., min_length=1, max_length=200),
+                      limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None,
+                      fields: Optional[str] = None, user_id: Optional[str] = None,
+                      campaign_id: Optional[str] = None, status: Optional[str] = None,
+                      urgency: Optional[str] = None):
+    """Search jobs by title, company, description and requirements, most relevant first"""
+    selected = _page_fields(fields, Job)
+    statuses = [value.strip() for value in status.split(',') if value.strip()] if status else None
+    urgencies = [value.strip() for value in urgency.split(',') if value.strip()] if urgency else None
+    return await _paginate(response, job_service.search_jobs(
+        q, limit, cursor, selected, user_id, campaign_id, statuses, urgencies
+    ))
+
 @api_router.get("/jobs/{job_id}", response_model=Job)
 async def get_job(job_id: str):
     """Get job by ID"""
@@ -135,10 +313,12 @@ async def get_job(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
-@api_router.get("/campaigns/{campaign_id}/jobs", response_model=List[Job])
-async def get_campaign_jobs(campaign_id: str):
-    """Get all jobs for a campaign"""
-    return await job_service.get_jobs_by_campaign(campaign_id)
+@api_router.get("/campaigns/{campaign_id}/jobs")
+async def get_campaign_jobs(campaign_id: str, response: Response, limit: int = Query(50, ge=1, le=500),
+                            cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get jobs for a campaign, one page at a time"""
+    selected = _page_fields(fields, Job)
+    return await _paginate(response, job_service.get_jobs_page_by_campaign(campaign_id, limit, cursor, selected))
 
 @api_router.get("/jobs", response_model=List[Job])
 async def get_active_jobs(limit: int = 50):
@@ -151,6 +331,7 @@ async def update_job(job_id: str, update_data: JobUpdate):
     job = await job_service.update_job(job_id, update_data)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    await ai_service.invalidate_generated_content(job_id=job_id)
     return job
 
 @api_router.post("/jobs/{job_id}/apply")
@@ -167,6 +348,8 @@ async def create_application(application_data: ApplicationCreate):
     """Create a new application"""
     try:
         return await application_service.create_application(application_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -178,15 +361,27 @@ async def get_application(application_id: str):
         raise HTTPException(status_code=404, detail="Application not found")
     return application
 
-@api_router.get("/users/{user_id}/applications", response_model=List[Application])
-async def get_user_applications(user_id: str):
-    """Get all applications for a user"""
-    return await application_service.get_applications_by_user(user_id)
-
-@api_router.get("/campaigns/{campaign_id}/applications", response_model=List[Application])
-async def get_campaign_applications(campaign_id: str):
-    """Get all applications for a campaign"""
-    return await application_service.get_applications_by_campaign(campaign_id)
+@api_router.get("/users/{user_id}/applications")
+async def get_user_applications(user_id: str, response: Response, limit: int = Query(50, ge=1, le=500),
+                                cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get applications for a user, newest first, one page at a time"""
+    selected = _page_fields(fields, Application)
+    return await _paginate(response, application_service.get_applications_page_by_user(user_id, limit, cursor, selected))
+
+@api_router.get("/campaigns/{campaign_id}/applications")
+async def get_campaign_applications(campaign_id: str, response: Response, limit: int = Query(50, ge=1, le=500),
+                                    cursor: Optional[str] = None, fields: Optional[str] = None):
+    """Get applications for a campaign, newest first, one page at a time"""
+    selected = _page_fields(fields, Application)
+    return await _paginate(response, application_service.get_applications_page_by_campaign(campaign_id, limit, cursor, selected))
+
+@api_router.get("/applications/{application_id}/resume")
+async def download_application_resume(application_id: str):
+    """Download the custom resume submitted with an application"""
+    application = await application_service.get_application(application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return await _stream_resume(application_service.resume_store, application.custom_resume_id)
 
 @api_router.put("/applications/{application_id}", response_model=Application)
 async def update_application(application_id: str, update_data: ApplicationUpdate):
@@ -218,16 +413,99 @@ async def get_dashboard_stats(user_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Event stream endpoints
+@api_router.get("/users/{user_id}/events")
+async def stream_user_events(user_id: str, request: Request):
+    """Server-sent events for the user's jobs, campaigns and applications"""
+    campaign_ids = await campaign_service.get_campaign_ids_by_user(user_id)
+    subscription = event_bus.subscribe([f"user:{user_id}"] + [f"campaign:{campaign_id}" for campaign_id in campaign_ids])
+    
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=EVENT_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                # Follow jobs for campaigns created after the stream opened
+                if event["type"] == "campaign.created":
+                    subscription.add_topic(f"campaign:{event['data']['id']}")
+                yield format_sse(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/admin/dashboard-cache")
+async def get_dashboard_cache_stats():
+    """Get dashboard cache hit/miss counters"""
+    return analytics_service.get_dashboard_cache_stats()
+
+@api_router.get("/admin/linkedin-search-cache")
+async def get_linkedin_search_cache_stats():
+    """Get LinkedIn search cache counters and the API calls it saved per day"""
+    return linkedin_service.get_search_cache_stats()
+
+@api_router.get("/admin/events")
+async def get_event_stream_stats():
+    """Get event stream connection and delivery counters"""
+    return event_bus.get_stats()
+
 # Utility endpoints
 @api_router.post("/jobs/expire")
 async def expire_old_jobs():
-    """Expire jobs past their 3-hour window"""
+    """Expire jobs past their 3-hour window (manual catch-up; the expiry scheduler does this on time)"""
     try:
         expired_count = await job_service.expire_old_jobs()
         return {"message": f"Expired {expired_count} jobs"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Admin endpoints
+@api_router.get("/admin/expiry-scheduler")
+async def get_expiry_scheduler_stats():
+    """Get job expiry scheduler state"""
+    return expiry_scheduler.get_stats()
+
+@api_router.get("/admin/job-dedup")
+async def get_job_dedup_stats():
+    """Get how many ingested postings were collapsed as near-duplicates"""
+    try:
+        return await job_service.get_dedup_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/admin/job-vectors")
+async def get_job_vector_stats():
+    """Get recommendation vector index size, training state and query latency"""
+    return recommendation_service.get_stats()
+
+@api_router.get("/admin/discovery-scheduler")
+async def get_discovery_scheduler_stats():
+    """Get campaign discovery scheduler state"""
+    return discovery_scheduler.get_stats()
+
+@api_router.post("/admin/discovery-scheduler/run")
+async def run_discovery_cycle():
+    """Run a discovery cycle now instead of waiting for the next one"""
+    try:
+        return await discovery_scheduler.run_cycle()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/admin/indexes")
+async def get_index_report():
+    """Report missing, unused and undeclared indexes"""
+    try:
+        return await index_registry.get_index_report()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # AI Service endpoints
 @api_router.get("/ai/models")
 async def get_available_ai_models():
@@ -238,6 +516,11 @@ async def get_available_ai_models():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/ai/cache-stats")
+async def get_ai_cache_stats():
+    """Get AI generation cache hit rate"""
+    return ai_service.get_cache_stats()
+
 @api_router.get("/users/{user_id}/ai/preferences")
 async def get_user_ai_preferences(user_id: str):
     """Get user's AI provider preferences"""
@@ -471,10 +754,10 @@ async def apply_to_linkedin_job(user_id: str, application_data: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 @api_router.get("/linkedin/rate-limit")
-async def get_linkedin_rate_limit():
-    """Get current LinkedIn API rate limit status"""
+async def get_linkedin_rate_limit(user_id: Optional[str] = None):
+    """Get current LinkedIn API rate limit status, shared across all workers"""
     try:
-        status = await linkedin_service.get_rate_limit_status()
+        status = await linkedin_service.get_rate_limit_status(user_id)
         return status
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -488,6 +771,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Configure logging
@@ -497,6 +781,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_services():
+    await index_registry.ensure_indexes()
+    await job_service.load_dedup_index()
+    await recommendation_service.start()
+    await expiry_scheduler.start()
+    if DISCOVERY_ENABLED:
+        await discovery_scheduler.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await discovery_scheduler.stop()
+    await expiry_scheduler.stop()
+    await recommendation_service.stop()
+    await ai_service.close()
+    await linkedin_service.close()
     client.close()
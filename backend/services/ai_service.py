@@ -3,16 +3,31 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from typing import Dict, Optional, List
 import logging
 import uuid
 from datetime import datetime
-import openai
-import asyncio
+from services.llm_client import LLMClient
+from services.generation_cache import GenerationCache
 
 logger = logging.getLogger(__name__)
 
 class AIService:
+    INDEXES = {
+        "user_ai_preferences": [
+            IndexModel([("user_id", ASCENDING)], name="user_id")
+        ],
+        **{
+            collection_name: [
+                IndexModel([("user_id", ASCENDING), ("generated_at", DESCENDING)], name="user_generated_at"),
+                IndexModel([("cache_key", ASCENDING), ("generated_at", DESCENDING)], name="cache_key_generated_at"),
+                IndexModel([("job_id", ASCENDING)], name="job_id")
+            ]
+            for collection_name in ("generated_cover_letters", "generated_resume_summaries", "generated_linkedin_messages")
+        }
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.chat_sessions_collection = db.ai_chat_sessions
@@ -25,6 +40,12 @@ class AIService:
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
         
+        # Shared async client, reused for every generation on this worker
+        self.llm_client = LLMClient(api_key=self.openai_api_key)
+        
+        # Content-addressed cache over the generated_* collections
+        self.generation_cache = GenerationCache(db)
+        
     async def get_user_ai_preferences(self, user_id: str) -> Dict:
         """Get user's AI provider preferences"""
         try:
@@ -90,19 +111,12 @@ class AIService:
             "purpose": "job_application"
         })
         
-        # Make OpenAI API call
-        client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        
-        return response.choices[0].message.content
+        # Make OpenAI API call without blocking the event loop
+        return await self.llm_client.chat_completion(model, system_message, user_prompt)
+    
+    async def close(self):
+        """Release the shared LLM client"""
+        await self.llm_client.close()
     
     async def generate_cover_letter(self, user_id: str, user_profile: Dict, job_details: Dict, 
                                    provider: str = None, model: str = None) -> Dict:
@@ -158,29 +172,10 @@ class AIService:
                 provider = "openai"
                 model = "gpt-4o"
             
-            response = await self._call_openai_api(user_id, system_message, user_prompt, model)
-            
-            # Store the generated content
-            cover_letter_record = {
-                "user_id": user_id,
-                "job_id": job_details.get('id'),
-                "company": job_details.get('company'),
-                "position": job_details.get('title'),
-                "cover_letter": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow()
-            }
-            
-            await self.db.generated_cover_letters.insert_one(cover_letter_record)
-            
-            return {
-                "success": True,
-                "cover_letter": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow().isoformat()
-            }
+            return await self._generate_with_cache(
+                user_id, "cover_letter", "generated_cover_letters",
+                system_message, user_prompt, job_details, provider, model
+            )
             
         except Exception as e:
             logger.error(f"Error generating cover letter: {e}")
@@ -235,29 +230,10 @@ class AIService:
                 provider = "openai"
                 model = "gpt-4o"
             
-            response = await self._call_openai_api(user_id, system_message, user_prompt, model)
-            
-            # Store the generated content
-            resume_summary_record = {
-                "user_id": user_id,
-                "job_id": job_details.get('id'),
-                "company": job_details.get('company'),
-                "position": job_details.get('title'),
-                "resume_summary": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow()
-            }
-            
-            await self.db.generated_resume_summaries.insert_one(resume_summary_record)
-            
-            return {
-                "success": True,
-                "resume_summary": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow().isoformat()
-            }
+            return await self._generate_with_cache(
+                user_id, "resume_summary", "generated_resume_summaries",
+                system_message, user_prompt, job_details, provider, model
+            )
             
         except Exception as e:
             logger.error(f"Error generating resume summary: {e}")
@@ -308,29 +284,10 @@ class AIService:
                 provider = "openai"
                 model = "gpt-4o"
             
-            response = await self._call_openai_api(user_id, system_message, user_prompt, model)
-            
-            # Store the generated content
-            linkedin_message_record = {
-                "user_id": user_id,
-                "job_id": job_details.get('id'),
-                "company": job_details.get('company'),
-                "position": job_details.get('title'),
-                "linkedin_message": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow()
-            }
-            
-            await self.db.generated_linkedin_messages.insert_one(linkedin_message_record)
-            
-            return {
-                "success": True,
-                "linkedin_message": response,
-                "provider": provider,
-                "model": model,
-                "generated_at": datetime.utcnow().isoformat()
-            }
+            return await self._generate_with_cache(
+                user_id, "linkedin_message", "generated_linkedin_messages",
+                system_message, user_prompt, job_details, provider, model
+            )
             
         except Exception as e:
             logger.error(f"Error generating LinkedIn message: {e}")
@@ -339,6 +296,60 @@ class AIService:
                 "error": str(e)
             }
     
+    async def _generate_with_cache(self, user_id: str, content_field: str, collection_name: str,
+                                   system_message: str, user_prompt: str, job_details: Dict,
+                                   provider: str, model: str) -> Dict:
+        """Return cached content for an identical prompt, or generate and store it"""
+        cache_key = self.generation_cache.make_key(
+            user_id, content_field, system_message, user_prompt, provider, model
+        )
+        
+        cached = await self.generation_cache.get(collection_name, cache_key)
+        if cached:
+            return {
+                "success": True,
+                content_field: cached[content_field],
+                "provider": cached.get("provider", provider),
+                "model": cached.get("model", model),
+                "generated_at": cached["generated_at"].isoformat(),
+                "cached": True
+            }
+        
+        response = await self._call_openai_api(user_id, system_message, user_prompt, model)
+        
+        # Store the generated content
+        record = {
+            "user_id": user_id,
+            "job_id": job_details.get('id'),
+            "company": job_details.get('company'),
+            "position": job_details.get('title'),
+            content_field: response,
+            "provider": provider,
+            "model": model,
+            "cache_key": cache_key,
+            "generated_at": datetime.utcnow()
+        }
+        
+        await self.db[collection_name].insert_one(record)
+        self.generation_cache.put(cache_key, record)
+        
+        return {
+            "success": True,
+            content_field: response,
+            "provider": provider,
+            "model": model,
+            "generated_at": record["generated_at"].isoformat(),
+            "cached": False
+        }
+    
+    async def invalidate_generated_content(self, user_id: str = None, job_id: str = None) -> int:
+        """Invalidate cached generations after a profile or job change"""
+        return await self.generation_cache.invalidate(user_id=user_id, job_id=job_id)
+    
+    def get_cache_stats(self) -> Dict:
+        """Get generation cache hit rate"""
+        return self.generation_cache.get_stats()
+    
     # Helper methods
     def _format_experience(self, experience: List[Dict]) -> str:
         """Format experience for AI prompt"""
@@ -6,8 +6,13 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from models.analytics import UserAnalytics, CampaignAnalytics, DailyStats
 from services.application_service import ApplicationService
 from services.campaign_service import CampaignService
+from services.daily_stats_service import DailyStatsService
+from services.ttl_cache import TTLCache
+from models.campaign import JobSearchCampaign
+from collections import OrderedDict
 from typing import List, Dict, Any
 from datetime import datetime, timedelta, date
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,34 +22,38 @@ class AnalyticsService:
         self.db = db
         self.application_service = ApplicationService(db)
         self.campaign_service = CampaignService(db)
+        self.daily_stats_service = DailyStatsService(db)
+        
+        # Short-lived per-user dashboard cache, invalidated from the write paths
+        self.dashboard_cache = TTLCache(
+            ttl_seconds=float(os.getenv('DASHBOARD_CACHE_TTL_SECONDS', '30')),
+            max_entries=int(os.getenv('DASHBOARD_CACHE_MAX_ENTRIES', '10000'))
+        )
+        # Campaign ownership for cached dashboards, so job writes can invalidate them
+        self._dashboard_campaign_owners: Dict[str, str] = {}
+        self._dashboard_campaigns: "OrderedDict[str, List[str]]" = OrderedDict()
 
     async def get_user_analytics(self, user_id: str) -> UserAnalytics:
         """Get comprehensive analytics for a user"""
         try:
-            # Get all applications for the user
-            applications = await self.application_service.get_applications_by_user(user_id)
+            # Application stats, the campaign list and the daily rollup are independent
+            application_stats, campaigns, applications_by_day = await asyncio.gather(
+                self._get_application_stats(user_id),
+                self.campaign_service.get_campaigns_by_user(user_id),
+                self._get_applications_by_day(user_id)
+            )
+            
+            top_keywords = self._get_top_performing_keywords(campaigns)
+            campaign_analytics = await self._get_campaign_analytics(campaigns, application_stats["by_campaign"])
             
-            # Calculate basic stats
-            total_applications = len(applications)
-            total_responses = len([app for app in applications if app.response])
-            total_interviews = len([app for app in applications if app.status == "interview_scheduled"])
+            total_applications = application_stats["total_applications"]
+            total_responses = application_stats["total_responses"]
+            total_interviews = application_stats["total_interviews"]
             
             # Calculate rates
             overall_response_rate = (total_responses / total_applications * 100) if total_applications > 0 else 0
             overall_interview_rate = (total_interviews / total_applications * 100) if total_applications > 0 else 0
             
-            # Calculate average response time
-            avg_response_time = await self._calculate_avg_response_time(applications)
-            
-            # Get applications by day
-            applications_by_day = await self._get_applications_by_day(applications)
-            
-            # Get top performing keywords
-            top_keywords = await self._get_top_performing_keywords(user_id)
-            
-            # Get campaign analytics
-            campaign_analytics = await self._get_campaign_analytics(user_id)
-            
             return UserAnalytics(
                 user_id=user_id,
                 total_applications=total_applications,
@@ -52,7 +61,7 @@ class AnalyticsService:
                 total_interviews=total_interviews,
                 overall_response_rate=overall_response_rate,
                 overall_interview_rate=overall_interview_rate,
-                avg_response_time=avg_response_time,
+                avg_response_time=application_stats["avg_response_time"],
                 applications_by_day=applications_by_day,
                 top_performing_keywords=top_keywords,
                 campaign_analytics=campaign_analytics
@@ -62,14 +71,20 @@ class AnalyticsService:
             raise
 
     async def get_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
-        """Get dashboard statistics for a user"""
+        """Get dashboard statistics for a user, recomputing at most once per user at a time"""
+        return await self.dashboard_cache.get_or_compute(user_id, lambda: self._compute_dashboard_stats(user_id))
+
+    async def _compute_dashboard_stats(self, user_id: str) -> Dict[str, Any]:
+        """Compute dashboard statistics for a user"""
         try:
             analytics = await self.get_user_analytics(user_id)
             
-            # Calculate week-over-week changes
-            last_week_apps = await self._get_applications_last_week(user_id)
-            week_change = len(last_week_apps) - (analytics.total_applications - len(last_week_apps))
-            week_change_percent = (week_change / len(last_week_apps) * 100) if len(last_week_apps) > 0 else 0
+            self._track_dashboard_campaigns(user_id, [campaign.campaign_id for campaign in analytics.campaign_analytics])
+            
+            # Calculate week-over-week changes from the last 7 days of the histogram
+            last_week_count = sum(day["count"] for day in analytics.applications_by_day[-7:])
+            week_change = last_week_count - (analytics.total_applications - last_week_count)
+            week_change_percent = (week_change / last_week_count * 100) if last_week_count > 0 else 0
             
             return {
                 "total_applications": analytics.total_applications,
@@ -84,50 +99,104 @@ class AnalyticsService:
             logger.error(f"Error getting dashboard stats for {user_id}: {e}")
             raise
 
-    async def _calculate_avg_response_time(self, applications: List) -> float:
-        """Calculate average response time in days"""
-        try:
-            response_times = []
-            for app in applications:
-                if app.response and app.response.received_at:
-                    time_diff = app.response.received_at - app.submitted_at
-                    response_times.append(time_diff.total_seconds() / 86400)  # Convert to days
-            
-            return sum(response_times) / len(response_times) if response_times else 0
-        except Exception as e:
-            logger.error(f"Error calculating average response time: {e}")
-            return 0
+    def invalidate_dashboard(self, user_id: str):
+        """Drop a user's cached dashboard and the campaign ownership recorded for it"""
+        self.dashboard_cache.invalidate(user_id)
+        self._forget_dashboard_campaigns(user_id)
+
+    def _forget_dashboard_campaigns(self, user_id: str):
+        for campaign_id in self._dashboard_campaigns.pop(user_id, []):
+            if self._dashboard_campaign_owners.get(campaign_id) == user_id:
+                del self._dashboard_campaign_owners[campaign_id]
+
+    def _track_dashboard_campaigns(self, user_id: str, campaign_ids: List[str]):
+        """Remember campaign ownership so job writes can invalidate this dashboard.
+
+        Kept to as many users as the dashboard cache holds; the oldest user's
+        dashboard is invalidated along with their entries.
+        """
+        self._forget_dashboard_campaigns(user_id)
+        self._dashboard_campaigns[user_id] = campaign_ids
+        for campaign_id in campaign_ids:
+            self._dashboard_campaign_owners[campaign_id] = user_id
+        while len(self._dashboard_campaigns) > self.dashboard_cache.max_entries:
+            self.invalidate_dashboard(next(iter(self._dashboard_campaigns)))
+
+    def handle_event(self, topic: str, event_type: str, data: Dict[str, Any]):
+        """Invalidate cached dashboards affected by an application, campaign or job write"""
+        scope, _, key = topic.partition(":")
+        if scope == "user":
+            self.invalidate_dashboard(key)
+        elif scope == "campaign" and key in self._dashboard_campaign_owners:
+            self.invalidate_dashboard(self._dashboard_campaign_owners[key])
+
+    def get_dashboard_cache_stats(self) -> Dict[str, Any]:
+        """Get dashboard cache hit/miss counters"""
+        return self.dashboard_cache.get_stats()
 
-    async def _get_applications_by_day(self, applications: List) -> List[Dict[str, Any]]:
-        """Get applications grouped by day"""
+    def _application_stats_group(self, group_id: Any) -> Dict[str, Any]:
+        """$group stage computing application counts and average response time"""
+        return {"$group": {
+            "_id": group_id,
+            "total_applications": {"$sum": 1},
+            "total_responses": {"$sum": {"$cond": [{"$ifNull": ["$response", False]}, 1, 0]}},
+            "total_interviews": {"$sum": {"$cond": [{"$eq": ["$status", "interview_scheduled"]}, 1, 0]}},
+            # $avg skips the nulls left by applications without a response
+            "avg_response_ms": {"$avg": {"$cond": [
+                {"$ifNull": ["$response.received_at", False]},
+                {"$subtract": ["$response.received_at", "$submitted_at"]},
+                None
+            ]}}
+        }}
+
+    async def _get_application_stats(self, user_id: str) -> Dict[str, Any]:
+        """Compute overall and per-campaign application stats in one aggregation"""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$facet": {
+                "totals": [self._application_stats_group(None)],
+                "by_campaign": [self._application_stats_group("$campaign_id")]
+            }}
+        ]
+        
+        result = await self.application_service.collection.aggregate(pipeline).to_list(1)
+        facets = result[0] if result else {"totals": [], "by_campaign": []}
+        totals = facets["totals"][0] if facets["totals"] else {}
+        
+        return {
+            "total_applications": totals.get("total_applications", 0),
+            "total_responses": totals.get("total_responses", 0),
+            "total_interviews": totals.get("total_interviews", 0),
+            "avg_response_time": (totals.get("avg_response_ms") or 0) / 86400000,  # Convert to days
+            "by_campaign": {stats["_id"]: stats for stats in facets["by_campaign"]}
+        }
+
+    def _last_days(self, days: int) -> List[date]:
+        """Get the last N days in ascending order, ending today"""
+        today = datetime.utcnow().date()
+        return [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+    async def _get_applications_by_day(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get applications per day for the last 30 days from the daily rollup"""
         try:
-            # Group applications by date
-            apps_by_date = {}
-            for app in applications:
-                app_date = app.submitted_at.date()
-                apps_by_date[app_date] = apps_by_date.get(app_date, 0) + 1
-            
-            # Convert to list format for the last 30 days
-            result = []
-            for i in range(30):
-                target_date = (datetime.utcnow() - timedelta(days=i)).date()
-                result.append({
-                    "date": target_date.strftime("%Y-%m-%d"),
-                    "count": apps_by_date.get(target_date, 0)
-                })
-            
-            return list(reversed(result))
+            days = self._last_days(30)
+            counts = await self.daily_stats_service.get_user_daily_counts(user_id, days[0])
+            return [
+                {
+                    "date": day.strftime("%Y-%m-%d"),
+                    "count": counts.get(day.strftime("%Y-%m-%d"), {}).get("applications_submitted", 0)
+                }
+                for day in days
+            ]
         except Exception as e:
             logger.error(f"Error getting applications by day: {e}")
             return []
 
-    async def _get_top_performing_keywords(self, user_id: str) -> List[str]:
+    def _get_top_performing_keywords(self, campaigns: List[JobSearchCampaign]) -> List[str]:
         """Get top performing keywords based on response rates"""
         try:
             # This is a simplified version - in production, you'd analyze job descriptions
             # and correlate with response rates
-            campaigns = await self.campaign_service.get_campaigns_by_user(user_id)
-            
             keyword_performance = {}
             for campaign in campaigns:
                 response_rate = (campaign.responses / campaign.applications_submitted) if campaign.applications_submitted > 0 else 0
@@ -148,28 +217,31 @@ class AnalyticsService:
             logger.error(f"Error getting top performing keywords: {e}")
             return []
 
-    async def _get_campaign_analytics(self, user_id: str) -> List[CampaignAnalytics]:
-        """Get analytics for all user campaigns"""
+    async def _get_campaign_analytics(self, campaigns: List[JobSearchCampaign],
+                                      campaign_stats: Dict[str, Dict[str, Any]]) -> List[CampaignAnalytics]:
+        """Get analytics for all user campaigns from the grouped application stats"""
         try:
-            campaigns = await self.campaign_service.get_campaigns_by_user(user_id)
             campaign_analytics = []
+            days = self._last_days(7)
+            daily_counts = await self.daily_stats_service.get_campaign_daily_counts(
+                [campaign.id for campaign in campaigns], days[0]
+            ) if campaigns else {}
             
             for campaign in campaigns:
-                # Calculate rates
-                response_rate = (campaign.responses / campaign.applications_submitted * 100) if campaign.applications_submitted > 0 else 0
-                interview_rate = (campaign.interviews / campaign.applications_submitted * 100) if campaign.applications_submitted > 0 else 0
+                stats = campaign_stats.get(campaign.id, {})
+                applications_submitted = stats.get("total_applications", 0)
                 
-                # Get applications for this campaign to calculate response time
-                campaign_apps = await self.application_service.get_applications_by_campaign(campaign.id)
-                avg_response_time = await self._calculate_avg_response_time(campaign_apps)
+                # Calculate rates
+                response_rate = (stats["total_responses"] / applications_submitted * 100) if applications_submitted > 0 else 0
+                interview_rate = (stats["total_interviews"] / applications_submitted * 100) if applications_submitted > 0 else 0
+                avg_response_time = (stats.get("avg_response_ms") or 0) / 86400000  # Convert to days
                 
-                # Get daily stats (simplified)
-                daily_stats = await self._get_campaign_daily_stats(campaign.id)
+                daily_stats = self._get_campaign_daily_stats(days, daily_counts.get(campaign.id, {}))
                 
                 campaign_analytics.append(CampaignAnalytics(
                     campaign_id=campaign.id,
                     campaign_name=campaign.name,
-                    applications_submitted=campaign.applications_submitted,
+                    applications_submitted=applications_submitted,
                     response_rate=response_rate,
                     interview_rate=interview_rate,
                     avg_response_time=avg_response_time,
@@ -182,30 +254,9 @@ class AnalyticsService:
             logger.error(f"Error getting campaign analytics: {e}")
             return []
 
-    async def _get_campaign_daily_stats(self, campaign_id: str) -> List[DailyStats]:
-        """Get daily stats for a campaign"""
-        try:
-            # This is simplified - in production you'd query actual daily data
-            stats = []
-            for i in range(7):  # Last 7 days
-                target_date = (datetime.utcnow() - timedelta(days=i)).date()
-                stats.append(DailyStats(
-                    date=target_date,
-                    applications_submitted=0,  # Would be calculated from actual data
-                    responses_received=0,
-                    interviews_scheduled=0
-                ))
-            return list(reversed(stats))
-        except Exception as e:
-            logger.error(f"Error getting campaign daily stats: {e}")
-            return []
-
-    async def _get_applications_last_week(self, user_id: str) -> List:
-        """Get applications from last week"""
-        try:
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            applications = await self.application_service.get_applications_by_user(user_id)
-            return [app for app in applications if app.submitted_at >= week_ago]
-        except Exception as e:
-            logger.error(f"Error getting last week applications: {e}")
-            return []
\ No newline at end of file
+    def _get_campaign_daily_stats(self, days: List[date], day_counts: Dict[str, Dict[str, int]]) -> List[DailyStats]:
+        """Build a campaign's daily stats from its rollup counters"""
+        return [
+            DailyStats(date=day, **day_counts.get(day.strftime("%Y-%m-%d"), {}))
+            for day in days
+        ]
\ No newline at end of file
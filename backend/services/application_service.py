@@ -3,24 +3,52 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.application import Application, ApplicationCreate, ApplicationUpdate
-from typing import Optional, List
-from datetime import datetime
+from pymongo import IndexModel, ASCENDING, DESCENDING, ReturnDocument
+from models.application import Application, ApplicationCreate, ApplicationUpdate, ApplicationSummary
+from services.pagination import fetch_page
+from services.daily_stats_service import DailyStatsService
+from services.resume_store import ResumeStore
+from typing import Optional, List, Tuple, Any
+from datetime import date, datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 class ApplicationService:
+    INDEXES = {
+        "applications": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING), ("submitted_at", DESCENDING), ("id", DESCENDING)], name="user_submitted_at_id"),
+            IndexModel([("campaign_id", ASCENDING), ("submitted_at", DESCENDING), ("id", DESCENDING)], name="campaign_submitted_at_id"),
+            IndexModel([("job_id", ASCENDING)], name="job_id"),
+            IndexModel([("submitted_at", DESCENDING)], name="submitted_at")
+        ]
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.applications
+        self.daily_stats_service = DailyStatsService(db)
+        self.resume_store = ResumeStore(db)
+        
+        # Set by the app to publish application change events
+        self.event_bus = None
 
     async def create_application(self, application_data: ApplicationCreate) -> Application:
         """Create a new application"""
         try:
-            application = Application(**application_data.dict())
+            data = application_data.dict()
+            custom_resume_base64 = data.pop('custom_resume_base64', None)
+            application = Application(**data)
+            if custom_resume_base64:
+                application.custom_resume_id = await self.resume_store.save_base64(custom_resume_base64)
             result = await self.collection.insert_one(application.dict())
             application.id = str(result.inserted_id) if result.inserted_id else application.id
+            await self._record_stats(
+                application.user_id, application.campaign_id, application.submitted_at.date(),
+                applications_submitted=1
+            )
+            self._publish("application.created", application)
             logger.info(f"Created application: {application.id}")
             return application
         except Exception as e:
@@ -63,19 +91,50 @@ class ApplicationService:
             logger.error(f"Error getting applications for campaign {campaign_id}: {e}")
             raise
 
+    async def get_applications_page_by_user(self, user_id: str, limit: int, cursor: Optional[str] = None,
+                                            fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one keyset-paginated page of a user's applications, newest first"""
+        try:
+            return await fetch_page(
+                self.collection, {"user_id": user_id}, [("submitted_at", -1), ("id", -1)],
+                limit, cursor, fields, ApplicationSummary
+            )
+        except Exception as e:
+            logger.error(f"Error getting applications page for user {user_id}: {e}")
+            raise
+
+    async def get_applications_page_by_campaign(self, campaign_id: str, limit: int, cursor: Optional[str] = None,
+                                                fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one keyset-paginated page of a campaign's applications, newest first"""
+        try:
+            return await fetch_page(
+                self.collection, {"campaign_id": campaign_id}, [("submitted_at", -1), ("id", -1)],
+                limit, cursor, fields, ApplicationSummary
+            )
+        except Exception as e:
+            logger.error(f"Error getting applications page for campaign {campaign_id}: {e}")
+            raise
+
     async def update_application(self, application_id: str, update_data: ApplicationUpdate) -> Optional[Application]:
         """Update application"""
         try:
             update_dict = {k: v for k, v in update_data.dict(exclude_unset=True).items() if v is not None}
             update_dict['updated_at'] = datetime.utcnow()
             
-            result = await self.collection.update_one(
+            # Read the previous state in the same atomic operation to detect transitions
+            previous = await self.collection.find_one_and_update(
                 {"id": application_id},
-                {"$set": update_dict}
+                {"$set": update_dict},
+                projection={"_id": 0, "user_id": 1, "campaign_id": 1, "status": 1, "response": 1},
+                return_document=ReturnDocument.BEFORE
             )
             
-            if result.modified_count > 0:
-                return await self.get_application(application_id)
+            if previous:
+                await self._record_transitions(application_id, previous, update_dict)
+                application = await self.get_application(application_id)
+                if application:
+                    self._publish("application.updated", application)
+                return application
             return None
         except Exception as e:
             logger.error(f"Error updating application {application_id}: {e}")
@@ -120,4 +179,46 @@ class ApplicationService:
             return result
         except Exception as e:
             logger.error(f"Error counting applications by status for user {user_id}: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def _record_transitions(self, application_id: str, previous: dict, update_dict: dict):
+        """Bump the daily rollup when an application gets its first response or an interview"""
+        if update_dict.get('response') and not previous.get('response'):
+            await self._record_stats(
+                previous['user_id'], previous['campaign_id'], update_dict['response']['received_at'].date(),
+                responses_received=1
+            )
+        if update_dict.get('status') == "interview_scheduled" and previous.get('status') != "interview_scheduled":
+            # Kept from the first transition so the backfill dates the interview the same way
+            scheduled_at = update_dict['updated_at']
+            await self.collection.update_one(
+                {"id": application_id, "interview_scheduled_at": None},
+                {"$set": {"interview_scheduled_at": scheduled_at}}
+            )
+            await self._record_stats(
+                previous['user_id'], previous['campaign_id'], scheduled_at.date(),
+                interviews_scheduled=1
+            )
+
+    async def _record_stats(self, user_id: str, campaign_id: str, day: date, **counters: int):
+        """Bump the daily rollup without failing a write that is already stored.
+
+        A missed increment only skews the histograms until the next backfill
+        (backfill_daily_stats.py) rebuilds them from the applications collection.
+        """
+        try:
+            await self.daily_stats_service.record(user_id, campaign_id, day, **counters)
+        except Exception as e:
+            logger.warning(f"Daily stats for campaign {campaign_id} left to the backfill: {e}")
+
+    def _publish(self, event_type: str, application: Application):
+        """Publish an application change event to the owning user's topic"""
+        if self.event_bus:
+            self.event_bus.publish(f"user:{application.user_id}", event_type, {
+                "id": application.id,
+                "job_id": application.job_id,
+                "campaign_id": application.campaign_id,
+                "status": application.status,
+                "submitted_at": application.submitted_at,
+                "updated_at": application.updated_at
+            })
\ No newline at end of file
@@ -3,17 +3,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.campaign import JobSearchCampaign, JobSearchCampaignCreate, JobSearchCampaignUpdate
-from typing import Optional, List
+from pymongo import IndexModel, ASCENDING
+from models.campaign import JobSearchCampaign, JobSearchCampaignCreate, JobSearchCampaignUpdate, JobSearchCampaignSummary
+from services.pagination import fetch_page
+from typing import Optional, List, Tuple, Any
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CampaignService:
+    INDEXES = {
+        "job_search_campaigns": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("user_id", ASCENDING)], name="user_id"),
+            IndexModel([("status", ASCENDING), ("_id", ASCENDING)], name="status_oid")
+        ]
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.job_search_campaigns
+        
+        # Set by the app to publish campaign change events
+        self.event_bus = None
 
     async def create_campaign(self, campaign_data: JobSearchCampaignCreate) -> JobSearchCampaign:
         """Create a new job search campaign"""
@@ -21,6 +34,12 @@ class CampaignService:
             campaign = JobSearchCampaign(**campaign_data.dict())
             result = await self.collection.insert_one(campaign.dict())
             campaign.id = str(result.inserted_id) if result.inserted_id else campaign.id
+            if self.event_bus:
+                self.event_bus.publish(f"user:{campaign.user_id}", "campaign.created", {
+                    "id": campaign.id,
+                    "name": campaign.name,
+                    "status": campaign.status
+                })
             logger.info(f"Created campaign: {campaign.id}")
             return campaign
         except Exception as e:
@@ -51,6 +70,17 @@ class CampaignService:
             logger.error(f"Error getting campaigns for user {user_id}: {e}")
             raise
 
+    async def get_campaign_ids_by_user(self, user_id: str) -> List[str]:
+        """Get the IDs of all campaigns for a user"""
+        try:
+            return [
+                campaign_data["id"]
+                async for campaign_data in self.collection.find({"user_id": user_id}, {"_id": 0, "id": 1})
+            ]
+        except Exception as e:
+            logger.error(f"Error getting campaign IDs for user {user_id}: {e}")
+            raise
+
     async def update_campaign(self, campaign_id: str, update_data: JobSearchCampaignUpdate) -> Optional[JobSearchCampaign]:
         """Update campaign"""
         try:
@@ -63,7 +93,14 @@ class CampaignService:
             )
             
             if result.modified_count > 0:
-                return await self.get_campaign(campaign_id)
+                campaign = await self.get_campaign(campaign_id)
+                if campaign and self.event_bus:
+                    self.event_bus.publish(f"user:{campaign.user_id}", "campaign.updated", {
+                        "id": campaign.id,
+                        "name": campaign.name,
+                        "status": campaign.status
+                    })
+                return campaign
             return None
         except Exception as e:
             logger.error(f"Error updating campaign {campaign_id}: {e}")
@@ -111,4 +148,16 @@ class CampaignService:
             return campaigns
         except Exception as e:
             logger.error(f"Error getting active campaigns: {e}")
+            raise
+
+    async def get_active_campaigns_page(self, limit: int, cursor: Optional[str] = None,
+                                        fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one keyset-paginated page of active campaigns, in insertion order"""
+        try:
+            return await fetch_page(
+                self.collection, {"status": "active"}, [("_id", 1)],
+                limit, cursor, fields, JobSearchCampaignSummary
+            )
+        except Exception as e:
+            logger.error(f"Error getting active campaigns page: {e}")
             raise
\ No newline at end of file
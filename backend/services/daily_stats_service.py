@@ -0,0 +1,163 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING
+from typing import Dict, List, Optional
+from datetime import date, datetime
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DailyStatsService:
+    """Maintains the daily_stats rollup: one document per (user_id, campaign_id, date).
+
+    Counters are bumped with $inc on the application write paths, so histograms
+    are read in O(days) instead of being rebuilt from every application.
+    """
+
+    INDEXES = {
+        "daily_stats": [
+            IndexModel([("user_id", ASCENDING), ("campaign_id", ASCENDING), ("date", ASCENDING)],
+                       name="user_campaign_date", unique=True),
+            IndexModel([("campaign_id", ASCENDING), ("date", ASCENDING)], name="campaign_date")
+        ]
+    }
+
+    COUNTERS = ["applications_submitted", "responses_received", "interviews_scheduled"]
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.daily_stats
+
+    async def record(self, user_id: str, campaign_id: str, day: date, applications_submitted: int = 0,
+                     responses_received: int = 0, interviews_scheduled: int = 0) -> None:
+        """Atomically increment the counters for a user/campaign/day"""
+        increments = {
+            "applications_submitted": applications_submitted,
+            "responses_received": responses_received,
+            "interviews_scheduled": interviews_scheduled
+        }
+        increments = {field: value for field, value in increments.items() if value}
+        if not increments:
+            return
+        try:
+            await self.collection.update_one(
+                {"user_id": user_id, "campaign_id": campaign_id, "date": day.strftime("%Y-%m-%d")},
+                {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Error recording daily stats for campaign {campaign_id}: {e}")
+            raise
+
+    async def get_user_daily_counts(self, user_id: str, since: date) -> Dict[str, Dict[str, int]]:
+        """Get counters per day for a user, summed across campaigns"""
+        try:
+            pipeline = [
+                {"$match": {"user_id": user_id, "date": {"$gte": since.strftime("%Y-%m-%d")}}},
+                {"$group": {"_id": "$date", **{field: {"$sum": f"${field}"} for field in self.COUNTERS}}}
+            ]
+            return {
+                row["_id"]: {field: row.get(field, 0) for field in self.COUNTERS}
+                async for row in self.collection.aggregate(pipeline)
+            }
+        except Exception as e:
+            logger.error(f"Error getting daily stats for user {user_id}: {e}")
+            raise
+
+    async def get_campaign_daily_counts(self, campaign_ids: List[str], since: date) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """Get counters per campaign per day for several campaigns in one query"""
+        try:
+            counts: Dict[str, Dict[str, Dict[str, int]]] = {}
+            async for row in self.collection.find(
+                {"campaign_id": {"$in": campaign_ids}, "date": {"$gte": since.strftime("%Y-%m-%d")}},
+                {"_id": 0, "campaign_id": 1, "date": 1, **{field: 1 for field in self.COUNTERS}}
+            ):
+                day_counts = counts.setdefault(row["campaign_id"], {}).setdefault(row["date"], dict.fromkeys(self.COUNTERS, 0))
+                for field in self.COUNTERS:
+                    day_counts[field] += row.get(field, 0)
+            return counts
+        except Exception as e:
+            logger.error(f"Error getting campaign daily stats: {e}")
+            raise
+
+    async def backfill(self, user_id: Optional[str] = None) -> int:
+        """Rebuild the rollup from the applications collection, for one user or everyone.
+
+        The rollup is built in a scratch collection and merged in with replace, and
+        only then are keys the rebuild did not produce removed, so record() calls
+        made while the backfill runs are kept rather than wiped and recounted.
+        """
+        scope = {"user_id": user_id} if user_id else {}
+        # Rebuilt documents carry this updated_at; Mongo stores datetimes to the millisecond
+        started = datetime.utcnow()
+        started = started.replace(microsecond=started.microsecond // 1000 * 1000)
+        scratch = self.db[f"daily_stats_backfill_{uuid.uuid4().hex}"]
+        key = ["user_id", "campaign_id", "date"]
+        try:
+            await self.collection.create_indexes(self.INDEXES["daily_stats"])
+            await scratch.create_index([(field, ASCENDING) for field in key], unique=True)
+
+            # (counter, date the event happened on, filter selecting applications that count)
+            sources = [
+                ("applications_submitted", "$submitted_at", {}),
+                ("responses_received", "$response.received_at", {"response.received_at": {"$ne": None}}),
+                # Applications from before interview_scheduled_at was stored fall back to the response
+                ("interviews_scheduled", {"$ifNull": ["$interview_scheduled_at", "$response.received_at"]},
+                 {"status": "interview_scheduled",
+                  "$or": [{"interview_scheduled_at": {"$ne": None}}, {"response.received_at": {"$ne": None}}]})
+            ]
+            for counter, date_field, condition in sources:
+                await self.db.applications.aggregate([
+                    {"$match": {**scope, **condition}},
+                    {"$group": {
+                        "_id": {
+                            "user_id": "$user_id",
+                            "campaign_id": "$campaign_id",
+                            "date": {"$dateToString": {"format": "%Y-%m-%d", "date": date_field}}
+                        },
+                        counter: {"$sum": 1}
+                    }},
+                    {"$project": {
+                        "_id": 0,
+                        "user_id": "$_id.user_id",
+                        "campaign_id": "$_id.campaign_id",
+                        "date": "$_id.date",
+                        counter: 1
+                    }},
+                    {"$merge": {
+                        "into": scratch.name,
+                        "on": key,
+                        "whenMatched": "merge",
+                        "whenNotMatched": "insert"
+                    }}
+                ]).to_list(None)
+
+            await scratch.aggregate([
+                {"$project": {"_id": 0}},
+                {"$set": {"updated_at": started}},
+                {"$merge": {
+                    "into": self.collection.name,
+                    "on": key,
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }}
+            ]).to_list(None)
+
+            # Keys the rebuild did not produce, unless record() has touched them since it started
+            stale = await self.collection.delete_many({
+                **scope,
+                "$or": [{"updated_at": {"$lt": started}}, {"updated_at": {"$exists": False}}]
+            })
+
+            rebuilt = await self.collection.count_documents(scope)
+            logger.info(f"Backfilled {rebuilt} daily stats documents, removed {stale.deleted_count} stale ones")
+            return rebuilt
+        except Exception as e:
+            logger.error(f"Error backfilling daily stats: {e}")
+            raise
+        finally:
+            await scratch.drop()
@@ -0,0 +1,243 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import deque
+from itertools import chain, zip_longest
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (user_id, campaign_id, keywords, location)
+Search = Tuple[str, str, str, str]
+
+class CampaignDiscoveryScheduler:
+    """Runs LinkedIn searches for every active campaign and ingests what they find.
+
+    Each cycle turns active campaigns into (keyword, location) searches and orders
+    them with smooth weighted round-robin across users, so one user with many
+    campaigns cannot take the whole LinkedIn budget. A user's weight is their
+    number of active campaigns, capped at max_user_weight, and round-robin credit
+    carries over between cycles, so users cut off by max_searches_per_cycle go
+    first next time. Searches run concurrently up to a limit, each after a random
+    delay, and new postings go straight into JobService.create_jobs_bulk. Every
+    worker runs its own cycles; the unique (campaign_id, linkedin_job_id) index
+    makes a posting that two workers find at once get stored only once.
+    """
+
+    def __init__(self, campaign_service, job_service, linkedin_service):
+        self.campaign_service = campaign_service
+        self.job_service = job_service
+        self.linkedin_service = linkedin_service
+
+        self.interval_seconds = float(os.getenv('DISCOVERY_INTERVAL_SECONDS', '600'))
+        self.concurrency = int(os.getenv('DISCOVERY_CONCURRENCY', '4'))
+        self.jitter_seconds = float(os.getenv('DISCOVERY_JITTER_SECONDS', '30'))
+        self.max_searches_per_cycle = int(os.getenv('DISCOVERY_MAX_SEARCHES_PER_CYCLE', '50'))
+        self.max_searches_per_campaign = int(os.getenv('DISCOVERY_MAX_SEARCHES_PER_CAMPAIGN', '6'))
+        self.max_user_weight = int(os.getenv('DISCOVERY_MAX_USER_WEIGHT', '3'))
+
+        self._credit: Dict[str, int] = {}
+        self._cycle_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+        self.next_cycle_at: Optional[datetime] = None
+
+        # Counters for observability
+        self.cycles = 0
+        self.searches = 0
+        self.jobs_found = 0
+        self.jobs_created = 0
+        self.duplicates_skipped = 0
+        self.searches_by_user: Dict[str, int] = {}
+        self.last_cycle: Optional[Dict[str, Any]] = None
+
+    async def start(self):
+        """Start the discovery loop"""
+        if self._task is not None:
+            return
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Campaign discovery scheduler started, every {self.interval_seconds:.0f}s")
+
+    async def stop(self):
+        """Stop the discovery loop, cancelling any cycle in progress"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        # Workers started together should not all search at the same moment
+        delay = random.uniform(0, self.jitter_seconds)
+        while True:
+            self.next_cycle_at = datetime.utcnow() + timedelta(seconds=delay)
+            await asyncio.sleep(delay)
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Error running discovery cycle: {e}")
+            delay = self.interval_seconds * random.uniform(0.9, 1.1)
+
+    async def run_cycle(self) -> Dict[str, Any]:
+        """Search for every active campaign once and ingest new postings"""
+        async with self._cycle_lock:
+            started = time.monotonic()
+            campaigns = await self.campaign_service.get_active_campaigns()
+            searches = self._order_searches(campaigns)
+
+            seen: Set[Tuple[str, str]] = set()
+            semaphore = asyncio.Semaphore(self.concurrency)
+            results = await asyncio.gather(
+                *(self._run_search(search, semaphore, seen) for search in searches),
+                return_exceptions=True
+            )
+
+            created = 0
+            for search, result in zip(searches, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Discovery search {search[2]!r} for campaign {search[1]} failed: {result}")
+                else:
+                    created += result
+
+            self.cycles += 1
+            self.last_cycle = {
+                "finished_at": datetime.utcnow().isoformat(),
+                "duration_seconds": round(time.monotonic() - started, 2),
+                "campaigns": len(campaigns),
+                "searches": len(searches),
+                "jobs_created": created
+            }
+            logger.info(f"Discovery cycle ran {len(searches)} searches for {len(campaigns)} campaigns, "
+                        f"created {created} jobs")
+            return self.last_cycle
+
+    def _campaign_searches(self, campaign) -> List[Search]:
+        """Every keyword in every location of a campaign, up to max_searches_per_campaign"""
+        keywords = [keyword.strip() for keyword in campaign.keywords if keyword.strip()]
+        locations = [location.strip() for location in campaign.locations if location.strip()] or [""]
+        return [
+            (campaign.user_id, campaign.id, keyword, location)
+            for keyword in keywords for location in locations
+        ][:self.max_searches_per_campaign]
+
+    def _order_searches(self, campaigns) -> List[Search]:
+        """Interleave searches across users by smooth weighted round-robin"""
+        campaigns_by_user: Dict[str, List] = {}
+        for campaign in campaigns:
+            campaigns_by_user.setdefault(campaign.user_id, []).append(campaign)
+
+        queues: Dict[str, deque] = {}
+        weights: Dict[str, int] = {}
+        for user_id, user_campaigns in campaigns_by_user.items():
+            # Alternate between a user's campaigns rather than exhausting one first
+            per_campaign = [self._campaign_searches(campaign) for campaign in user_campaigns]
+            searches = [search for search in chain.from_iterable(zip_longest(*per_campaign)) if search]
+            if searches:
+                queues[user_id] = deque(searches)
+                weights[user_id] = min(len(user_campaigns), self.max_user_weight)
+
+        # Users without active campaigns no longer carry credit
+        self._credit = {user_id: credit for user_id, credit in self._credit.items() if user_id in queues}
+
+        ordered = []
+        total_weight = sum(weights.values())
+        while queues and len(ordered) < self.max_searches_per_cycle:
+            for user_id in queues:
+                self._credit[user_id] = self._credit.get(user_id, 0) + weights[user_id]
+            chosen = max(queues, key=lambda user_id: self._credit[user_id])
+            self._credit[chosen] -= total_weight
+            ordered.append(queues[chosen].popleft())
+            if not queues[chosen]:
+                del queues[chosen]
+                total_weight -= weights[chosen]
+        return ordered
+
+    async def _run_search(self, search: Search, semaphore: asyncio.Semaphore, seen: Set[Tuple[str, str]]) -> int:
+        """Run one search after a random delay and ingest its new postings; returns jobs created"""
+        user_id, campaign_id, keywords, location = search
+        await asyncio.sleep(random.uniform(0, self.jitter_seconds))
+        async with semaphore:
+            found = await self.linkedin_service.search_jobs_basic(user_id, keywords, location)
+        self.searches += 1
+        self.searches_by_user[user_id] = self.searches_by_user.get(user_id, 0) + 1
+        self.jobs_found += len(found)
+
+        now = datetime.utcnow()
+        items = []
+        for posting in found:
+            item = self._to_job_create(campaign_id, posting, now)
+            if item is None:
+                continue
+            key = (campaign_id, item["linkedin_job_id"])
+            if key in seen:
+                self.duplicates_skipped += 1
+                continue
+            seen.add(key)
+            items.append(item)
+        if not items:
+            return 0
+
+        known = await self.job_service.get_known_linkedin_job_ids(
+            campaign_id, [item["linkedin_job_id"] for item in items]
+        )
+        new_items = [item for item in items if item["linkedin_job_id"] not in known]
+        self.duplicates_skipped += len(items) - len(new_items)
+        if not new_items:
+            return 0
+
+        result = await self.job_service.create_jobs_bulk(new_items)
+        self.jobs_created += result.created
+        return result.created
+
+    @staticmethod
+    def _to_job_create(campaign_id: str, posting: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+        """Map a search result to JobCreate fields; None for incomplete or already expired postings"""
+        if not posting.get('id') or not posting.get('title'):
+            return None
+
+        listed_at = posting.get('posted_at')
+        if isinstance(listed_at, (int, float)):
+            posted_at = datetime.utcfromtimestamp(listed_at / 1000)  # LinkedIn timestamps are epoch ms
+        elif isinstance(listed_at, datetime):
+            posted_at = listed_at
+        else:
+            posted_at = now
+        if posted_at + timedelta(hours=3) <= now:
+            return None
+
+        return {
+            "campaign_id": campaign_id,
+            "title": posting['title'],
+            "company": posting.get('company') or "",
+            "location": posting.get('location') or "",
+            "posted_at": posted_at,
+            "description": posting.get('description') or "",
+            "linkedin_job_id": str(posting['id']),
+            "linkedin_url": posting.get('url')
+        }
+
+    def get_stats(self) -> dict:
+        """Get scheduler state"""
+        return {
+            "running": self.running,
+            "next_cycle_at": self.next_cycle_at.isoformat() if self.next_cycle_at else None,
+            "interval_seconds": self.interval_seconds,
+            "concurrency": self.concurrency,
+            "cycles": self.cycles,
+            "searches": self.searches,
+            "searches_by_user": dict(self.searches_by_user),
+            "jobs_found": self.jobs_found,
+            "jobs_created": self.jobs_created,
+            "duplicates_skipped": self.duplicates_skipped,
+            "last_cycle": self.last_cycle
+        }
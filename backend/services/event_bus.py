@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Callable, Dict, Iterable, List, Optional, Set, Any
+from datetime import datetime
+import asyncio
+import itertools
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """A single listener (one SSE connection) with its own bounded queue"""
+
+    def __init__(self, bus: "EventBus", queue_size: int):
+        self.bus = bus
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.topics: Set[str] = set()
+
+    def add_topic(self, topic: str):
+        """Start receiving events published to a topic"""
+        self.topics.add(topic)
+        self.bus._subscriptions.setdefault(topic, set()).add(self)
+
+    def deliver(self, event: Dict[str, Any]) -> bool:
+        """Queue an event, dropping the oldest one if the listener is falling behind"""
+        dropped = False
+        if self.queue.full():
+            self.queue.get_nowait()
+            dropped = True
+        self.queue.put_nowait(event)
+        return dropped
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait for the next event; returns None when the timeout elapses"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class EventBus:
+    """In-process topic fan-out for job, campaign and application change events.
+
+    Services publish from their write paths; each subscriber is just a small queue,
+    so idle connections cost a parked coroutine and nothing else.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._listeners: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        self._event_ids = itertools.count(1)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        """Create a subscription for the given topics"""
+        subscription = Subscription(self, self.queue_size)
+        for topic in topics:
+            subscription.add_topic(topic)
+        return subscription
+
+    def add_listener(self, listener: Callable[[str, str, Dict[str, Any]], None]):
+        """Register a callback invoked synchronously with (topic, event_type, data) for every event"""
+        self._listeners.append(listener)
+
+    def has_subscribers(self) -> bool:
+        """Whether any subscription or listener would receive a published event"""
+        return bool(self._subscriptions or self._listeners)
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription from all of its topics"""
+        for topic in subscription.topics:
+            subscribers = self._subscriptions.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[topic]
+        subscription.topics.clear()
+
+    def publish(self, topic: str, event_type: str, data: Dict[str, Any]):
+        """Fan an event out to every subscriber of a topic"""
+        self.published += 1
+        for listener in self._listeners:
+            try:
+                listener(topic, event_type, data)
+            except Exception as e:
+                logger.error(f"Error in event listener for {event_type}: {e}")
+
+        subscribers = self._subscriptions.get(topic)
+        if not subscribers:
+            return
+
+        event = {
+            "id": next(self._event_ids),
+            "type": event_type,
+            "data": data,
+            "published_at": datetime.utcnow()
+        }
+        for subscription in list(subscribers):
+            if subscription.deliver(event):
+                self.dropped += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get subscriber and delivery counters"""
+        connections = set()
+        for subscribers in self._subscriptions.values():
+            connections.update(subscribers)
+        return {
+            "connections": len(connections),
+            "topics": len(self._subscriptions),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event in text/event-stream format"""
+    payload = json.dumps({"data": event["data"], "published_at": event["published_at"]}, default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
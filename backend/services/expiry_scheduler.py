@@ -0,0 +1,148 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import heapq
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+class JobExpiryScheduler:
+    """Moves jobs through their 3-hour window at the exact moment each mark is reached.
+
+    Every monitored job contributes up to three timers to a min-heap keyed by fire
+    time: urgency "high" at 2h before the deadline, "critical" at 1h before, and
+    expiry at the deadline. The loop sleeps until the earliest timer and issues a
+    single targeted update for it. Timers only cover jobs this worker created or
+    found at startup, so a slower sweep also expires overdue jobs created by other
+    workers (or by one that has since died).
+    """
+
+    # (time before deadline, urgency to set)
+    URGENCY_MARKS = [
+        (timedelta(hours=2), "high"),
+        (timedelta(hours=1), "critical")
+    ]
+
+    def __init__(self, job_service):
+        self.job_service = job_service
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.sweep_interval_seconds = float(os.getenv('JOB_EXPIRY_SWEEP_SECONDS', '60'))
+        self.running = False
+
+        # Counters for observability
+        self.urgency_updates = 0
+        self.expirations = 0
+        self.swept_expirations = 0
+
+    def schedule(self, job_id: str, deadline: datetime, current_urgency: Optional[str] = None,
+                 now: Optional[datetime] = None):
+        """Register the remaining urgency and expiry timers for a job"""
+        now = now or datetime.utcnow()
+        if deadline.tzinfo is not None:
+            deadline = deadline.replace(tzinfo=None)
+
+        # Bring urgency up to date right away if a mark has already passed
+        expected_urgency = self.job_service._calculate_urgency(deadline, now)
+        if current_urgency is not None and expected_urgency not in (current_urgency, "expired"):
+            self._push(now, job_id, expected_urgency)
+
+        for offset, urgency in self.URGENCY_MARKS:
+            fire_at = deadline - offset
+            if fire_at > now:
+                self._push(fire_at, job_id, urgency)
+
+        self._push(deadline, job_id, "expired")
+
+    def _push(self, fire_at: datetime, job_id: str, action: str):
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), job_id, action))
+        self._wakeup.set()
+
+    async def start(self):
+        """Catch up on overdue jobs, load pending timers and start the loop"""
+        if self._task is not None:
+            return
+        await self._load_pending()
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+        self._sweep_task = asyncio.create_task(self._sweep())
+        logger.info(f"Job expiry scheduler started with {len(self._heap)} pending timers")
+
+    async def stop(self):
+        """Stop the scheduler loop"""
+        self.running = False
+        for task in (self._task, self._sweep_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._sweep_task = None
+
+    async def _load_pending(self):
+        """One-off startup pass: expire overdue jobs, then schedule the monitored ones"""
+        await self.job_service.expire_old_jobs()
+
+        now = datetime.utcnow()
+        async for job_data in self.job_service.collection.find(
+            {"status": "monitoring", "application_deadline": {"$gte": now}},
+            {"_id": 0, "id": 1, "application_deadline": 1, "urgency": 1}
+        ):
+            self.schedule(job_data["id"], job_data["application_deadline"], job_data.get("urgency"), now)
+
+    async def _sweep(self):
+        """Periodically expire overdue jobs that have no timer on this worker"""
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            try:
+                self.swept_expirations += await self.job_service.expire_old_jobs()
+            except Exception as e:
+                logger.error(f"Error sweeping expired jobs: {e}")
+
+    async def _run(self):
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                # Sleep until the next timer, or until an earlier one is scheduled
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, job_id, action = heapq.heappop(self._heap)
+            try:
+                if action == "expired":
+                    if await self.job_service.expire_job(job_id):
+                        self.expirations += 1
+                elif await self.job_service.set_job_urgency(job_id, action):
+                    self.urgency_updates += 1
+            except Exception as e:
+                logger.error(f"Error applying {action} to job {job_id}: {e}")
+
+    def get_stats(self) -> dict:
+        """Get scheduler state"""
+        return {
+            "running": self.running,
+            "pending_timers": len(self._heap),
+            "next_fire_at": self._heap[0][0].isoformat() if self._heap else None,
+            "urgency_updates": self.urgency_updates,
+            "expirations": self.expirations,
+            "swept_expirations": self.swept_expirations,
+            "sweep_interval_seconds": self.sweep_interval_seconds
+        }
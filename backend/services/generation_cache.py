@@ -0,0 +1,138 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from collections import OrderedDict
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+class GenerationCache:
+    """Two-tier cache for AI-generated content.
+
+    Entries are content-addressed: the key is a hash of everything that shapes the
+    completion (template, normalized prompt built from profile and job fields,
+    provider and model). The first tier is an in-process LRU; the second tier is the
+    existing generated_* collections, where each record carries its cache_key.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.max_entries = int(os.getenv('AI_CACHE_MAX_ENTRIES', '1024'))
+        self.ttl_seconds = int(os.getenv('AI_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(user_id: str, template: str, system_message: str, user_prompt: str,
+                 provider: str, model: str) -> str:
+        """Build a content hash for a generation request"""
+        normalized = {
+            "user_id": user_id,
+            "template": template,
+            "system": " ".join(system_message.split()),
+            "prompt": " ".join(user_prompt.split()),
+            "provider": provider,
+            "model": model
+        }
+        payload = json.dumps(normalized, sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _is_fresh(self, generated_at: datetime) -> bool:
+        """Check whether an entry is still within its TTL"""
+        return generated_at >= datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    async def get(self, collection_name: str, cache_key: str) -> Optional[Dict]:
+        """Look up a cached record, first in memory then in the generated_* collection"""
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            if self._is_fresh(entry["generated_at"]):
+                self._entries.move_to_end(cache_key)
+                self.memory_hits += 1
+                return entry
+            del self._entries[cache_key]
+
+        try:
+            record = await self.db[collection_name].find_one(
+                {
+                    "cache_key": cache_key,
+                    "generated_at": {"$gte": datetime.utcnow() - timedelta(seconds=self.ttl_seconds)}
+                },
+                sort=[("generated_at", -1)]
+            )
+        except Exception as e:
+            logger.error(f"Error reading generation cache: {e}")
+            record = None
+
+        if record:
+            record.pop('_id', None)
+            self._remember(cache_key, record)
+            self.persistent_hits += 1
+            return record
+
+        self.misses += 1
+        return None
+
+    def put(self, cache_key: str, record: Dict):
+        """Store a freshly generated record in the in-process tier"""
+        record = {k: v for k, v in record.items() if k != '_id'}
+        self._remember(cache_key, record)
+
+    def _remember(self, cache_key: str, record: Dict):
+        self._entries[cache_key] = record
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_id: str = None, job_id: str = None) -> int:
+        """Drop cached content for a user and/or job; the history records are kept"""
+        if not user_id and not job_id:
+            return 0
+
+        query = {}
+        if user_id:
+            query["user_id"] = user_id
+        if job_id:
+            query["job_id"] = job_id
+
+        stale_keys = [
+            key for key, record in self._entries.items()
+            if all(record.get(field) == value for field, value in query.items())
+        ]
+        for key in stale_keys:
+            del self._entries[key]
+
+        invalidated = 0
+        try:
+            for collection_name in ("generated_cover_letters", "generated_resume_summaries", "generated_linkedin_messages"):
+                result = await self.db[collection_name].update_many(
+                    {**query, "cache_key": {"$exists": True}},
+                    {"$unset": {"cache_key": ""}}
+                )
+                invalidated += result.modified_count
+        except Exception as e:
+            logger.error(f"Error invalidating generation cache: {e}")
+
+        return len(stale_keys) + invalidated
+
+    def get_stats(self) -> Dict:
+        """Get cache hit/miss counters"""
+        hits = self.memory_hits + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups * 100, 1) if lookups > 0 else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+from typing import Dict, List, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IndexRegistry:
+    """Collects the indexes each service declares in its INDEXES attribute and keeps them in place"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.declared: Dict[str, List[IndexModel]] = {}
+
+    def register(self, indexes: Dict[str, List[IndexModel]]):
+        """Register a service's {collection: [IndexModel, ...]} declarations"""
+        for collection_name, models in indexes.items():
+            registered = self.declared.setdefault(collection_name, [])
+            known = {model.document['name'] for model in registered}
+            registered.extend(model for model in models if model.document['name'] not in known)
+
+    async def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create every declared index; existing identical indexes are left untouched"""
+        ensured = {}
+        for collection_name, models in self.declared.items():
+            try:
+                ensured[collection_name] = await self.db[collection_name].create_indexes(models)
+            except Exception as e:
+                logger.error(f"Error ensuring indexes on {collection_name}: {e}")
+        logger.info(f"Ensured indexes on {len(ensured)} collections")
+        return ensured
+
+    async def get_index_report(self) -> Dict[str, Any]:
+        """Report missing, unused and undeclared indexes per collection"""
+        report = {}
+        for collection_name, models in self.declared.items():
+            try:
+                collection = self.db[collection_name]
+                existing = await collection.index_information()
+
+                usage = {}
+                async for stats in collection.aggregate([{"$indexStats": {}}]):
+                    usage[stats['name']] = stats.get('accesses', {}).get('ops', 0)
+
+                declared_names = [model.document['name'] for model in models]
+                report[collection_name] = {
+                    "declared": declared_names,
+                    "missing": [name for name in declared_names if name not in existing],
+                    "unused": [name for name, ops in usage.items() if ops == 0 and name != '_id_'],
+                    "undeclared": [name for name in existing if name not in declared_names and name != '_id_'],
+                    "usage": usage
+                }
+            except Exception as e:
+                logger.error(f"Error building index report for {collection_name}: {e}")
+                report[collection_name] = {"error": str(e)}
+        return report
@@ -0,0 +1,163 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+import hashlib
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+LANE_BITS = 32  # Per-bit feature counts are packed into one integer, LANE_BITS each
+
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc"}
+TITLE_ABBREVIATIONS = {"sr": "senior", "jr": "junior", "mgr": "manager", "eng": "engineer", "dev": "developer"}
+TITLE_NOISE_WORDS = {"remote", "hybrid", "onsite", "contract", "fulltime", "us", "usa"}
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+def normalize_company(company: str) -> str:
+    """Company name without case, punctuation or legal suffixes"""
+    words = _words(company)
+    while words and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+def title_terms(title: str) -> FrozenSet[str]:
+    """Title words with abbreviations expanded and work-arrangement words dropped"""
+    return frozenset(
+        TITLE_ABBREVIATIONS.get(word, word) for word in _words(title) if word not in TITLE_NOISE_WORDS
+    )
+
+def titles_match(a: FrozenSet[str], b: FrozenSet[str]) -> bool:
+    """Same role: one title's terms contain the other's ("PM" vs "PM - Remote", not "Senior PM" vs "Staff PM")"""
+    return bool(a) and bool(b) and (a <= b or b <= a)
+
+@lru_cache(maxsize=65536)
+def _spread(word: str) -> int:
+    """The word's 64-bit hash with bit i moved to the bottom of lane i"""
+    value = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "big")
+    spread = 0
+    for bit in range(FINGERPRINT_BITS):
+        if value >> bit & 1:
+            spread |= 1 << (bit * LANE_BITS)
+    return spread
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of a text's normalized words.
+
+    Bit i is set when more than half of the words hash with bit i set. Adding
+    a word's pre-spread hash updates all 64 counters at once.
+    """
+    words = _words(text)
+    lanes = 0
+    for word in words:
+        lanes += _spread(word)
+
+    mask = (1 << LANE_BITS) - 1
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if (lanes >> (bit * LANE_BITS) & mask) * 2 > len(words):
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def job_fingerprint(title: str, description: str) -> int:
+    """SimHash of the description, or of the title for postings without one"""
+    return simhash(description if _words(description) else title)
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class JobDeduplicator:
+    """LSH index over job fingerprints, scoped to a campaign and normalized company.
+
+    The fingerprint is split into max_distance + 1 bands. Two fingerprints at most
+    max_distance bits apart must agree on at least one whole band, so looking up
+    each band finds every candidate, and only those are compared bit by bit and
+    by title. Entries are dropped once their job's application deadline passes.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        self.band_count = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.band_count
+        self._band_mask = (1 << self.band_bits) - 1
+
+        self._buckets: Dict[Tuple[str, str, int, int], Set[str]] = {}
+        self._entries: Dict[str, Tuple[str, str, int, FrozenSet[str], datetime]] = {}
+        self._adds_since_prune = 0
+
+        self.checked = 0
+        self.duplicates = 0
+
+    def _band_keys(self, campaign_id: str, company_key: str, fingerprint: int) -> Iterable[Tuple[str, str, int, int]]:
+        for band in range(self.band_count):
+            yield (campaign_id, company_key, band, fingerprint >> (band * self.band_bits) & self._band_mask)
+
+    def find(self, campaign_id: str, company: str, title: str, fingerprint: int,
+             now: Optional[datetime] = None) -> Optional[str]:
+        """Get the id of a live job in the campaign that this posting duplicates"""
+        now = now or datetime.utcnow()
+        company_key = normalize_company(company)
+        terms = title_terms(title)
+        self.checked += 1
+
+        best_id, best_distance = None, self.max_distance + 1
+        for key in self._band_keys(campaign_id, company_key, fingerprint):
+            for job_id in self._buckets.get(key, ()):
+                _, _, candidate, candidate_terms, expires_at = self._entries[job_id]
+                if expires_at <= now or not titles_match(terms, candidate_terms):
+                    continue
+                distance = hamming_distance(fingerprint, candidate)
+                if distance < best_distance:
+                    best_id, best_distance = job_id, distance
+
+        if best_id is not None:
+            self.duplicates += 1
+        return best_id
+
+    def add(self, job_id: str, campaign_id: str, company: str, title: str, fingerprint: int, expires_at: datetime):
+        """Index a job until expires_at"""
+        if expires_at.tzinfo is not None:
+            expires_at = expires_at.replace(tzinfo=None)
+        company_key = normalize_company(company)
+        self.remove(job_id)
+        self._entries[job_id] = (campaign_id, company_key, fingerprint, title_terms(title), expires_at)
+        for key in self._band_keys(campaign_id, company_key, fingerprint):
+            self._buckets.setdefault(key, set()).add(job_id)
+
+        self._adds_since_prune += 1
+        if self._adds_since_prune >= 1000:
+            self.prune()
+
+    def remove(self, job_id: str):
+        """Drop a job from the index"""
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return
+        campaign_id, company_key, fingerprint, _, _ = entry
+        for key in self._band_keys(campaign_id, company_key, fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """Drop every job whose deadline has passed"""
+        now = now or datetime.utcnow()
+        expired = [job_id for job_id, entry in self._entries.items() if entry[4] <= now]
+        for job_id in expired:
+            self.remove(job_id)
+        self._adds_since_prune = 0
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
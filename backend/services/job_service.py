@@ -3,46 +3,420 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.job import Job, JobCreate, JobUpdate
-from typing import Optional, List
+from pymongo import IndexModel, ASCENDING, TEXT, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from models.job import Job, JobCreate, JobUpdate, JobBulkItemResult, JobBulkResult, JobSummary, JobSearchResult
+from services.pagination import fetch_page, fetch_text_page
+from services.job_dedup import JobDeduplicator, job_fingerprint
+from services.match_scoring import MatchScorer
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+DUPLICATE_KEY_ERROR = 11000
+
 class JobService:
+    INDEXES = {
+        "jobs": [
+            IndexModel([("id", ASCENDING)], name="id"),
+            IndexModel([("status", ASCENDING), ("application_deadline", ASCENDING)], name="status_deadline"),
+            IndexModel([("campaign_id", ASCENDING), ("_id", ASCENDING)], name="campaign_id_oid"),
+            # Unique, so workers discovering the same posting at once cannot both store it
+            IndexModel([("campaign_id", ASCENDING), ("linkedin_job_id", ASCENDING)], name="campaign_linkedin_job_id_unique",
+                       unique=True, partialFilterExpression={"linkedin_job_id": {"$type": "string"}}),
+            IndexModel([("campaign_id", ASCENDING), ("duplicates.linkedin_job_id", ASCENDING)],
+                       name="campaign_duplicate_linkedin_job_id"),
+            IndexModel(
+                [("title", TEXT), ("company", TEXT), ("requirements", TEXT), ("description", TEXT)],
+                name="text_search",
+                weights={"title": 10, "company": 5, "requirements": 2, "description": 1}
+            )
+        ]
+    }
+
+    # Fields sent with job change events
+    EVENT_FIELDS = ["id", "campaign_id", "title", "company", "status", "urgency", "match_score", "application_deadline"]
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.jobs
+        
+        # Set by the app when a JobExpiryScheduler is running
+        self.expiry_scheduler = None
+        
+        # Set by the app to publish job change events
+        self.event_bus = None
+
+        # Set by the app to index new jobs for recommendations
+        self.recommendations = None
+
+        # Near-duplicate postings in a campaign are collapsed onto the first one
+        self.deduplicator = JobDeduplicator(max_distance=int(os.getenv('JOB_DEDUP_MAX_DISTANCE', '6')))
+        self.ai_calls_per_job = int(os.getenv('JOB_DEDUP_AI_CALLS_PER_JOB', '3'))
+        self.max_duplicate_refs = int(os.getenv('JOB_DEDUP_MAX_REFS', '50'))
+        # Most jobs an expiry sweep publishes individual job.expired events for
+        self.expiry_event_limit = int(os.getenv('JOB_EXPIRY_EVENT_LIMIT', '1000'))
+        self._pending_writes: Dict[str, asyncio.Event] = {}
+
+        self.match_scorer = MatchScorer()
 
     async def create_job(self, job_data: JobCreate) -> Job:
-        """Create a new job"""
+        """Create a new job, or return the existing job it near-duplicates"""
         try:
-            # Ensure posted_at is timezone-naive
-            posted_at = job_data.posted_at
-            if posted_at.tzinfo is not None:
-                posted_at = posted_at.replace(tzinfo=None)
-            
-            # Calculate application deadline (3 hours from posted time)
-            deadline = posted_at + timedelta(hours=3)
-            
-            job_dict = job_data.dict()
-            job_dict['posted_at'] = posted_at
-            job_dict['application_deadline'] = deadline
-            
-            # Calculate match score and urgency
-            job_dict['match_score'] = await self._calculate_match_score(job_data)
-            job_dict['urgency'] = await self._calculate_urgency(deadline)
-            
-            job = Job(**job_dict)
-            result = await self.collection.insert_one(job.dict())
+            job = self._build_job(job_data, datetime.utcnow())
+            canonical_id = self._find_duplicate(job)
+            if canonical_id:
+                await self._wait_for_write(canonical_id)
+                result = await self.collection.update_one(
+                    self._duplicate_filter(canonical_id, job), self._duplicate_update(job)
+                )
+                if result.matched_count:
+                    logger.info(f"Collapsed duplicate posting onto job {canonical_id}")
+                    return await self.get_job(canonical_id)
+                # Not matched: either this posting was already recorded, or the canonical job is gone
+                canonical = await self.get_job(canonical_id)
+                if canonical:
+                    return canonical
+
+            # Indexed before the write so a concurrent copy collapses onto this job
+            job_dict = job.dict()
+            self._index_job(job_dict)
+            written = self._pending_writes[job_dict['id']] = asyncio.Event()
+            stored = None
+            try:
+                await self._score_documents([job_dict])
+                result = await self.collection.insert_one(job_dict)
+            except DuplicateKeyError:
+                # Another worker stored this LinkedIn posting first
+                self.deduplicator.remove(job_dict['id'])
+                stored = await self.collection.find_one(
+                    {"campaign_id": job.campaign_id, "linkedin_job_id": job.linkedin_job_id}, {"_id": 0}
+                )
+                if stored is None:
+                    raise
+            except Exception:
+                self.deduplicator.remove(job_dict['id'])
+                raise
+            finally:
+                del self._pending_writes[job_dict['id']]
+                written.set()
+            if stored is not None:
+                logger.info(f"LinkedIn job {job.linkedin_job_id} already stored as job {stored['id']}")
+                return Job(**stored)
+            job.match_score = job_dict['match_score']
             job.id = str(result.inserted_id) if result.inserted_id else job.id
+            if self.expiry_scheduler:
+                self.expiry_scheduler.schedule(job_dict['id'], job.application_deadline)
+            if self.recommendations:
+                self.recommendations.add_job(job_dict)
+            self._publish("job.created", job_dict)
             logger.info(f"Created job: {job.id}")
             return job
         except Exception as e:
             logger.error(f"Error creating job: {e}")
             raise
 
+    async def create_jobs_bulk(self, items: List[Dict[str, Any]], batch_size: int = 1000) -> JobBulkResult:
+        """Create many jobs at once, scoring each campaign's jobs in one pass and writing with unordered insert_many"""
+        try:
+            now = datetime.utcnow()
+            results: List[Optional[JobBulkItemResult]] = [None] * len(items)
+            documents = []
+            positions = []
+            batch_events: List[asyncio.Event] = []
+            duplicates: Dict[str, List[Tuple[int, Job]]] = {}
+            
+            # Validate and deduplicate the whole batch before touching the database.
+            # New jobs are indexed right away so copies within the batch collapse too.
+            for index, item in enumerate(items):
+                try:
+                    job = self._build_job(JobCreate(**item), now)
+                except Exception as e:
+                    results[index] = JobBulkItemResult(index=index, status="invalid", error=str(e))
+                    continue
+                canonical_id = self._find_duplicate(job, now)
+                if canonical_id:
+                    duplicates.setdefault(canonical_id, []).append((index, job))
+                    continue
+                document = job.dict()
+                self._index_job(document)
+                # Pending from the moment it is findable, so copies wait for its batch's write
+                if len(documents) % batch_size == 0:
+                    batch_events.append(asyncio.Event())
+                self._pending_writes[document['id']] = batch_events[-1]
+                documents.append(document)
+                positions.append(index)
+            
+            failed_ids = set()
+            stored_ids: Dict[str, str] = {}  # Documents another worker already stored -> the stored job's id
+            try:
+                try:
+                    await self._score_documents(documents)
+                except Exception:
+                    for document in documents:
+                        self.deduplicator.remove(document['id'])
+                    raise
+                for batch_number, start in enumerate(range(0, len(documents), batch_size)):
+                    batch = documents[start:start + batch_size]
+                    write_errors = {}
+                    already_stored = {}
+                    try:
+                        await self.collection.insert_many(batch, ordered=False)
+                    except BulkWriteError as e:
+                        for error in e.details.get('writeErrors', []):
+                            if error.get('code') == DUPLICATE_KEY_ERROR and batch[error['index']].get('linkedin_job_id'):
+                                already_stored[error['index']] = error.get('errmsg', 'Duplicate LinkedIn job')
+                            else:
+                                write_errors[error['index']] = error.get('errmsg', 'Write failed')
+                    finally:
+                        for document in batch:
+                            del self._pending_writes[document['id']]
+                        batch_events[batch_number].set()
+                    if already_stored:
+                        stored_ids.update(await self._stored_linkedin_jobs([batch[offset] for offset in already_stored]))
+                        for offset, error in already_stored.items():
+                            if batch[offset]['id'] not in stored_ids:
+                                write_errors[offset] = error
+                    
+                    for offset, document in enumerate(batch):
+                        index = positions[start + offset]
+                        if document['id'] in stored_ids:
+                            # Another worker stored this LinkedIn posting first
+                            results[index] = JobBulkItemResult(index=index, status="duplicate", id=stored_ids[document['id']])
+                            self.deduplicator.remove(document['id'])
+                        elif offset in write_errors:
+                            results[index] = JobBulkItemResult(index=index, status="failed", error=write_errors[offset])
+                            self.deduplicator.remove(document['id'])
+                            failed_ids.add(document['id'])
+                        else:
+                            results[index] = JobBulkItemResult(index=index, status="created", id=document['id'])
+                            if self.expiry_scheduler:
+                                self.expiry_scheduler.schedule(document['id'], document['application_deadline'], now=now)
+                            if self.recommendations:
+                                self.recommendations.add_job(document)
+                            self._publish("job.created", document)
+            finally:
+                # Release copies waiting on batches that were never written
+                for document in documents:
+                    self._pending_writes.pop(document['id'], None)
+                for written in batch_events:
+                    written.set()
+            
+            updates = []
+            for canonical_id, copies in duplicates.items():
+                await self._wait_for_write(canonical_id)
+                canonical_id = stored_ids.get(canonical_id, canonical_id)
+                for index, job in copies:
+                    if canonical_id in failed_ids:
+                        results[index] = JobBulkItemResult(index=index, status="failed", error="Duplicate of a job that failed to write")
+                    else:
+                        results[index] = JobBulkItemResult(index=index, status="duplicate", id=canonical_id)
+                        updates.append(UpdateOne(self._duplicate_filter(canonical_id, job), self._duplicate_update(job)))
+            if updates:
+                await self.collection.bulk_write(updates, ordered=False)
+            
+            created = sum(1 for result in results if result.status == "created")
+            collapsed = sum(1 for result in results if result.status == "duplicate")
+            logger.info(f"Bulk created {created}/{len(items)} jobs, collapsed {collapsed} duplicates")
+            return JobBulkResult(
+                received=len(items),
+                created=created,
+                failed=len(items) - created - collapsed,
+                duplicates=collapsed,
+                results=results
+            )
+        except Exception as e:
+            logger.error(f"Error bulk creating jobs: {e}")
+            raise
+
+    async def _stored_linkedin_jobs(self, documents: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Map documents rejected by the unique LinkedIn index to the id of the job already stored"""
+        stored = {}
+        async for job_data in self.collection.find(
+            {"$or": [{"campaign_id": document['campaign_id'], "linkedin_job_id": document['linkedin_job_id']}
+                     for document in documents]},
+            {"_id": 0, "id": 1, "campaign_id": 1, "linkedin_job_id": 1}
+        ):
+            stored[(job_data['campaign_id'], job_data['linkedin_job_id'])] = job_data['id']
+        return {
+            document['id']: stored[(document['campaign_id'], document['linkedin_job_id'])]
+            for document in documents if (document['campaign_id'], document['linkedin_job_id']) in stored
+        }
+
+    def _find_duplicate(self, job: Job, now: Optional[datetime] = None) -> Optional[str]:
+        """Get the id of the live job in the same campaign that this one near-duplicates"""
+        return self.deduplicator.find(job.campaign_id, job.company, job.title, int(job.fingerprint, 16), now)
+
+    async def _wait_for_write(self, job_id: str):
+        """Wait until a job indexed by a concurrent create has been written"""
+        written = self._pending_writes.get(job_id)
+        if written is not None:
+            await written.wait()
+
+    def _index_job(self, job_data: Dict[str, Any]):
+        """Make a job findable as the canonical copy of later duplicates"""
+        fingerprint = job_data.get('fingerprint') or format(
+            job_fingerprint(job_data['title'], job_data.get('description', '')), '016x'
+        )
+        self.deduplicator.add(job_data['id'], job_data['campaign_id'], job_data['company'], job_data['title'],
+                              int(fingerprint, 16), job_data['application_deadline'])
+
+    def _duplicate_filter(self, canonical_id: str, job: Job) -> Dict[str, Any]:
+        """Match the canonical job unless it already records this LinkedIn posting, so reposts count once"""
+        query: Dict[str, Any] = {"id": canonical_id}
+        if job.linkedin_job_id:
+            query["linkedin_job_id"] = {"$ne": job.linkedin_job_id}
+            query["duplicates.linkedin_job_id"] = {"$ne": job.linkedin_job_id}
+        return query
+
+    def _duplicate_update(self, job: Job) -> Dict[str, Any]:
+        """Record a collapsed posting on its canonical job, keeping the most recent references"""
+        reference = {
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "posted_at": job.posted_at,
+            "linkedin_job_id": job.linkedin_job_id,
+            "linkedin_url": job.linkedin_url,
+            "seen_at": datetime.utcnow()
+        }
+        return {
+            "$push": {"duplicates": {"$each": [reference], "$slice": -self.max_duplicate_refs}},
+            "$inc": {"duplicate_count": 1},
+            "$set": {"updated_at": datetime.utcnow()}
+        }
+
+    async def _get_campaign_profiles(self, campaign_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Map each campaign to its owner's profile (None when either is missing)"""
+        owners = {}
+        async for campaign in self.db.job_search_campaigns.find(
+            {"id": {"$in": campaign_ids}}, {"_id": 0, "id": 1, "user_id": 1}
+        ):
+            owners[campaign["id"]] = campaign["user_id"]
+
+        profiles = {}
+        async for profile in self.db.user_profiles.find(
+            {"id": {"$in": list(set(owners.values()))}},
+            {"_id": 0, "id": 1, "skills": 1, "experience": 1, "preferences": 1, "personal_info.location": 1}
+        ):
+            profiles[profile["id"]] = profile
+        return {campaign_id: profiles.get(owners.get(campaign_id)) for campaign_id in campaign_ids}
+
+    async def _score_documents(self, documents: List[Dict[str, Any]]):
+        """Set match_score on job documents, scoring each campaign's jobs against its owner in one pass"""
+        by_campaign: Dict[str, List[Dict[str, Any]]] = {}
+        for document in documents:
+            by_campaign.setdefault(document['campaign_id'], []).append(document)
+        if not by_campaign:
+            return
+
+        profiles = await self._get_campaign_profiles(list(by_campaign))
+        for campaign_id, campaign_documents in by_campaign.items():
+            scores = self.match_scorer.score_jobs(profiles[campaign_id], campaign_documents)
+            for document, score in zip(campaign_documents, scores):
+                document['match_score'] = score
+
+    async def rescore_jobs_for_user(self, user_id: str) -> int:
+        """Re-score a user's monitored jobs against their current profile; returns jobs whose score changed"""
+        try:
+            profile = await self.db.user_profiles.find_one(
+                {"id": user_id},
+                {"_id": 0, "skills": 1, "experience": 1, "preferences": 1, "personal_info.location": 1}
+            )
+            campaign_ids = [
+                campaign["id"] async for campaign in
+                self.db.job_search_campaigns.find({"user_id": user_id}, {"_id": 0, "id": 1})
+            ]
+            if not campaign_ids:
+                return 0
+
+            jobs = await self.collection.find(
+                {"campaign_id": {"$in": campaign_ids}, "status": "monitoring"},
+                {"_id": 0, "id": 1, "title": 1, "location": 1, "salary": 1, "description": 1,
+                 "requirements": 1, "match_score": 1}
+            ).to_list(None)
+
+            scores = self.match_scorer.score_jobs(profile, jobs)
+            updates = [
+                UpdateOne({"id": job["id"]}, {"$set": {"match_score": score}})
+                for job, score in zip(jobs, scores) if score != job.get("match_score")
+            ]
+            if updates:
+                await self.collection.bulk_write(updates, ordered=False)
+            logger.info(f"Re-scored {len(jobs)} jobs for user {user_id}, {len(updates)} changed")
+            return len(updates)
+        except Exception as e:
+            logger.error(f"Error re-scoring jobs for user {user_id}: {e}")
+            raise
+
+    async def load_dedup_index(self) -> int:
+        """Index every job still inside its application window; run once at startup"""
+        try:
+            now = datetime.utcnow()
+            loaded = 0
+            async for job_data in self.collection.find(
+                {"status": {"$in": ["monitoring", "customizing", "applied"]}, "application_deadline": {"$gt": now}},
+                {"_id": 0, "id": 1, "campaign_id": 1, "title": 1, "company": 1, "description": 1,
+                 "fingerprint": 1, "application_deadline": 1}
+            ):
+                self._index_job(job_data)
+                loaded += 1
+            logger.info(f"Loaded {loaded} jobs into the dedup index")
+            return loaded
+        except Exception as e:
+            logger.error(f"Error loading dedup index: {e}")
+            raise
+
+    async def get_dedup_stats(self) -> Dict[str, Any]:
+        """Get the share of ingested postings collapsed as duplicates and the AI calls that saved"""
+        try:
+            totals = {"jobs": 0, "duplicates": 0}
+            async for row in self.collection.aggregate([
+                {"$group": {"_id": None, "jobs": {"$sum": 1}, "duplicates": {"$sum": "$duplicate_count"}}}
+            ]):
+                totals = {"jobs": row["jobs"], "duplicates": row["duplicates"]}
+            postings = totals["jobs"] + totals["duplicates"]
+            checked = self.deduplicator.checked
+            return {
+                "postings_ingested": postings,
+                "jobs": totals["jobs"],
+                "duplicates_collapsed": totals["duplicates"],
+                "dedup_ratio": round(totals["duplicates"] / postings * 100, 1) if postings > 0 else 0.0,
+                "ai_calls_saved": totals["duplicates"] * self.ai_calls_per_job,
+                "worker": {
+                    "checked": checked,
+                    "duplicates": self.deduplicator.duplicates,
+                    "dedup_ratio": round(self.deduplicator.duplicates / checked * 100, 1) if checked > 0 else 0.0,
+                    "indexed_jobs": len(self.deduplicator),
+                    "max_distance": self.deduplicator.max_distance
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error getting dedup stats: {e}")
+            raise
+
+    def _build_job(self, job_data: JobCreate, now: datetime) -> Job:
+        """Build a job document from creation data; match_score is set by _score_documents"""
+        # Ensure posted_at is timezone-naive
+        posted_at = job_data.posted_at
+        if posted_at.tzinfo is not None:
+            posted_at = posted_at.replace(tzinfo=None)
+        
+        # Calculate application deadline (3 hours from posted time)
+        deadline = posted_at + timedelta(hours=3)
+        
+        job_dict = job_data.dict()
+        job_dict['posted_at'] = posted_at
+        job_dict['application_deadline'] = deadline
+        
+        job_dict['urgency'] = self._calculate_urgency(deadline, now)
+        job_dict['fingerprint'] = format(job_fingerprint(job_data.title, job_data.description), '016x')
+        
+        return Job(**job_dict)
+
     async def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID"""
         try:
@@ -67,15 +441,68 @@ class JobService:
             logger.error(f"Error getting jobs for campaign {campaign_id}: {e}")
             raise
 
+    async def get_jobs_page_by_campaign(self, campaign_id: str, limit: int, cursor: Optional[str] = None,
+                                        fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one keyset-paginated page of a campaign's jobs, in insertion order"""
+        try:
+            return await fetch_page(
+                self.collection, {"campaign_id": campaign_id}, [("_id", 1)],
+                limit, cursor, fields, JobSummary
+            )
+        except Exception as e:
+            logger.error(f"Error getting jobs page for campaign {campaign_id}: {e}")
+            raise
+
+    async def search_jobs(self, search: str, limit: int, cursor: Optional[str] = None,
+                          fields: Optional[List[str]] = None, user_id: Optional[str] = None,
+                          campaign_id: Optional[str] = None, statuses: Optional[List[str]] = None,
+                          urgencies: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one page of jobs matching a text search, most relevant first"""
+        try:
+            query: Dict[str, Any] = {}
+            if campaign_id:
+                query["campaign_id"] = campaign_id
+            elif user_id:
+                campaign_ids = await self.db.job_search_campaigns.distinct("id", {"user_id": user_id})
+                query["campaign_id"] = {"$in": campaign_ids}
+            if statuses:
+                query["status"] = {"$in": statuses}
+            if urgencies:
+                query["urgency"] = {"$in": urgencies}
+
+            return await fetch_text_page(self.collection, search, query, limit, cursor, fields, JobSearchResult)
+        except Exception as e:
+            logger.error(f"Error searching jobs for {search!r}: {e}")
+            raise
+
+    async def get_known_linkedin_job_ids(self, campaign_id: str, linkedin_job_ids: List[str]) -> set:
+        """Get which of the given LinkedIn postings a campaign already has"""
+        try:
+            # Postings collapsed onto another job are only recorded in its duplicates
+            wanted = set(linkedin_job_ids)
+            known = set()
+            async for job_data in self.collection.find(
+                {"campaign_id": campaign_id, "$or": [
+                    {"linkedin_job_id": {"$in": linkedin_job_ids}},
+                    {"duplicates.linkedin_job_id": {"$in": linkedin_job_ids}}
+                ]},
+                {"_id": 0, "linkedin_job_id": 1, "duplicates.linkedin_job_id": 1}
+            ):
+                known.add(job_data.get("linkedin_job_id"))
+                known.update(duplicate.get("linkedin_job_id") for duplicate in job_data.get("duplicates", []))
+            return known & wanted
+        except Exception as e:
+            logger.error(f"Error getting known LinkedIn jobs for campaign {campaign_id}: {e}")
+            raise
+
     async def get_active_jobs(self, limit: int = 50) -> List[Job]:
         """Get active jobs (within 3-hour window)"""
         try:
-            now = datetime.utcnow()
+            # Jobs another worker's timers own may still be "monitoring" past their deadline
+            query = {"status": "monitoring", "application_deadline": {"$gte": datetime.utcnow()}}
+            
             jobs = []
-            async for job_data in self.collection.find({
-                "status": "monitoring",
-                "application_deadline": {"$gte": now}
-            }).sort("application_deadline", 1).limit(limit):
+            async for job_data in self.collection.find(query).sort("application_deadline", 1).limit(limit):
                 job_data.pop('_id', None)
                 jobs.append(Job(**job_data))
             return jobs
@@ -95,7 +522,10 @@ class JobService:
             )
             
             if result.modified_count > 0:
-                return await self.get_job(job_id)
+                job = await self.get_job(job_id)
+                if job:
+                    self._publish("job.updated", job.dict())
+                return job
             return None
         except Exception as e:
             logger.error(f"Error updating job {job_id}: {e}")
@@ -104,11 +534,17 @@ class JobService:
     async def mark_job_as_applied(self, job_id: str) -> bool:
         """Mark job as applied"""
         try:
-            result = await self.collection.update_one(
-                {"id": job_id},
-                {"$set": {"status": "applied", "updated_at": datetime.utcnow()}}
+            job_data = await self.collection.find_one_and_update(
+                {"id": job_id, "status": {"$ne": "applied"}},
+                {"$set": {"status": "applied", "updated_at": datetime.utcnow()}},
+                projection=self._event_projection(),
+                return_document=ReturnDocument.AFTER
             )
-            return result.modified_count > 0
+            if job_data:
+                self._publish("job.updated", job_data)
+                return True
+            # Already applied is still a success, only a missing job is not
+            return await self.collection.find_one({"id": job_id}, {"_id": 1}) is not None
         except Exception as e:
             logger.error(f"Error marking job as applied {job_id}: {e}")
             raise
@@ -117,13 +553,25 @@ class JobService:
         """Mark expired jobs (past 3-hour window)"""
         try:
             now = datetime.utcnow()
+            query = {
+                "status": "monitoring",
+                "application_deadline": {"$lt": now}
+            }
+            
+            # Only look up what is about to expire when someone is listening for it, and at most
+            # expiry_event_limit jobs: a backlog after downtime expires without individual events
+            expiring_jobs = []
+            if self.event_bus and self.event_bus.has_subscribers():
+                expiring_jobs = await self.collection.find(query, self._event_projection()).limit(
+                    self.expiry_event_limit
+                ).to_list(None)
+            
             result = await self.collection.update_many(
-                {
-                    "status": "monitoring",
-                    "application_deadline": {"$lt": now}
-                },
+                query,
                 {"$set": {"status": "expired", "updated_at": now}}
             )
+            for job_data in expiring_jobs:
+                self._publish("job.expired", {**job_data, "status": "expired"})
             if result.modified_count > 0:
                 logger.info(f"Expired {result.modified_count} jobs")
             return result.modified_count
@@ -131,28 +579,54 @@ class JobService:
             logger.error(f"Error expiring old jobs: {e}")
             raise
 
-    async def _calculate_match_score(self, job_data: JobCreate) -> float:
-        """Calculate job match score based on various factors"""
-        # Simplified scoring logic - in production, this would be more sophisticated
-        score = 75.0  # Base score
-        
-        # Add points for salary mention
-        if job_data.salary:
-            score += 5.0
-            
-        # Add points for remote/hybrid flexibility
-        if any(keyword in job_data.description.lower() for keyword in ['remote', 'hybrid', 'flexible']):
-            score += 10.0
-            
-        # Add points based on requirements match (simplified)
-        if job_data.requirements:
-            score += min(len(job_data.requirements) * 2, 10)
-            
-        return min(score, 100.0)
+    async def expire_job(self, job_id: str) -> bool:
+        """Expire a single job if it is still being monitored"""
+        try:
+            job_data = await self.collection.find_one_and_update(
+                {"id": job_id, "status": "monitoring"},
+                {"$set": {"status": "expired", "updated_at": datetime.utcnow()}},
+                projection=self._event_projection(),
+                return_document=ReturnDocument.AFTER
+            )
+            if job_data:
+                self._publish("job.expired", job_data)
+            return job_data is not None
+        except Exception as e:
+            logger.error(f"Error expiring job {job_id}: {e}")
+            raise
+
+    async def set_job_urgency(self, job_id: str, urgency: str) -> bool:
+        """Set urgency on a monitored job if it changed"""
+        try:
+            job_data = await self.collection.find_one_and_update(
+                {"id": job_id, "status": "monitoring", "urgency": {"$ne": urgency}},
+                {"$set": {"urgency": urgency, "updated_at": datetime.utcnow()}},
+                projection=self._event_projection(),
+                return_document=ReturnDocument.AFTER
+            )
+            if job_data:
+                self._publish("job.updated", job_data)
+            return job_data is not None
+        except Exception as e:
+            logger.error(f"Error setting urgency for job {job_id}: {e}")
+            raise
+
+    def _event_projection(self) -> Dict[str, int]:
+        """Projection for the fields carried by job change events"""
+        return {"_id": 0, **{field: 1 for field in self.EVENT_FIELDS}}
+
+    def _publish(self, event_type: str, job_data: Dict[str, Any]):
+        """Publish a job change event to the job's campaign topic"""
+        if self.event_bus:
+            self.event_bus.publish(
+                f"campaign:{job_data['campaign_id']}",
+                event_type,
+                {field: job_data.get(field) for field in self.EVENT_FIELDS}
+            )
 
-    async def _calculate_urgency(self, deadline: datetime) -> str:
+    def _calculate_urgency(self, deadline: datetime, now: Optional[datetime] = None) -> str:
         """Calculate urgency based on time until deadline"""
-        now = datetime.utcnow()
+        now = now or datetime.utcnow()
         # Ensure both datetimes are timezone-naive for comparison
         if deadline.tzinfo is not None:
             deadline = deadline.replace(tzinfo=None)
@@ -0,0 +1,316 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import math
+import re
+import zlib
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 256  # One projection index per top byte of a term hash
+PROJECTION_NONZEROS = 8  # Dimensions each term is projected onto
+DF_BUCKET_BITS = 20  # Document-frequency table of 2**20 counters; terms are hashed into it
+QUANTIZATION_SCALE = 127
+
+STOPWORDS = frozenset(
+    "a about all also an and any are as at be been by can do for from has have how if in into is it its "
+    "more most not of on or our out over so than that the their them then there these they this to up us "
+    "was we were what when which who will with would you your".split()
+)
+
+# Words of two or more characters, plus the one-letter languages
+_WORD_RE = re.compile(r"[a-z0-9+#]{2,}|\b[cr]\b")
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+def _word_hashes(words: List[str]) -> np.ndarray:
+    return np.fromiter(map(zlib.crc32, map(str.encode, words)), dtype=np.uint64, count=len(words))
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, elementwise"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+_STOPWORD_HASHES = np.sort(_word_hashes(sorted(STOPWORDS)))
+# Per-term hash streams: PROJECTION_NONZEROS for the projection, one for the document-frequency bucket
+_STREAMS = np.arange(1, PROJECTION_NONZEROS + 2, dtype=np.uint64) * _GOLDEN
+
+# (text, weight) fields a job or profile is built from; titles and skills count most
+JOB_FIELD_WEIGHTS = {"title": 3.0, "company": 1.0, "requirements": 2.0, "description": 1.0}
+
+def job_fields(job: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Weighted text fields of a job document"""
+    requirements = " ".join(job.get("requirements") or [])
+    return [
+        (job.get("title") or "", JOB_FIELD_WEIGHTS["title"]),
+        (job.get("company") or "", JOB_FIELD_WEIGHTS["company"]),
+        (requirements, JOB_FIELD_WEIGHTS["requirements"]),
+        (job.get("description") or "", JOB_FIELD_WEIGHTS["description"])
+    ]
+
+def profile_fields(profile: Dict[str, Any]) -> List[Tuple[str, float]]:
+    """Weighted text fields of a user profile, on the same scale as job_fields"""
+    experience = profile.get("experience") or []
+    return [
+        (" ".join(profile.get("skills") or []), 3.0),
+        (" ".join(entry.get("title", "") for entry in experience), 3.0),
+        (" ".join(profile.get("certifications") or []), 1.0),
+        (" ".join(entry.get("description", "") for entry in experience), 1.0)
+    ]
+
+class JobVectorizer:
+    """TF-IDF text vectors, sparse-randomly projected down to VECTOR_DIM dimensions.
+
+    Each term is projected onto PROJECTION_NONZEROS dimensions with random signs
+    derived from its hash, so no vocabulary is stored and cosine similarity between
+    projected vectors tracks cosine similarity between the TF-IDF vectors. IDF
+    comes from document-frequency counts kept in hashed buckets and learned as
+    jobs are added; a vector uses the IDF as it was when it was encoded.
+    """
+
+    def __init__(self):
+        self.doc_freq = np.zeros(1 << DF_BUCKET_BITS, dtype=np.int32)
+        self.documents = 0
+
+    def encode(self, fields: Iterable[Tuple[str, float]], learn: bool = False) -> np.ndarray:
+        """Unit-length float32 vector for weighted text fields (all zeros when there are no terms)"""
+        hashes, weights = [], []
+        for text, weight in fields:
+            field_hashes = _word_hashes(_WORD_RE.findall((text or "").lower()))
+            hashes.append(field_hashes)
+            weights.append(np.full(len(field_hashes), weight))
+        hashes, weights = np.concatenate(hashes), np.concatenate(weights)
+        positions = np.minimum(np.searchsorted(_STOPWORD_HASHES, hashes), len(_STOPWORD_HASHES) - 1)
+        kept = _STOPWORD_HASHES[positions] != hashes
+
+        vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+        if not kept.any():
+            return vector
+
+        terms, occurrences = np.unique(hashes[kept], return_inverse=True)
+        term_frequency = np.bincount(occurrences, weights=weights[kept])
+        streams = _mix(terms[:, None] + _STREAMS[None, :])
+        buckets = (streams[:, -1] >> np.uint64(64 - DF_BUCKET_BITS)).astype(np.intp)
+        if learn:
+            self.doc_freq[buckets] += 1
+            self.documents += 1
+
+        idf = np.log((1 + self.documents) / (1 + self.doc_freq[buckets])) + 1
+        term_weights = np.log1p(term_frequency) * idf
+        projection = streams[:, :PROJECTION_NONZEROS]
+        indices = (projection >> np.uint64(56)).astype(np.intp)
+        signs = (projection & np.uint64(1)).astype(np.float64) * 2 - 1
+        vector[:] = np.bincount(indices.ravel(), weights=(signs * term_weights[:, None]).ravel(), minlength=VECTOR_DIM)
+
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def state(self) -> Dict[str, np.ndarray]:
+        return {"doc_freq": self.doc_freq.copy(), "documents": np.array(self.documents)}
+
+    def load_state(self, state: Dict[str, np.ndarray]):
+        self.doc_freq = state["doc_freq"].astype(np.int32)
+        self.documents = int(state["documents"])
+
+class JobVectorIndex:
+    """Inverted-file (IVF) approximate nearest-neighbor index over job vectors.
+
+    Vectors are stored int8-quantized in one block per list, where a list holds
+    the vectors closest to one k-means centroid. A query scores the centroids,
+    then only the vectors in the nprobe closest lists, so with about sqrt(N)
+    lists it reads roughly nprobe * sqrt(N) vectors instead of N. Until the index
+    is trained everything is in a single list and queries are exact.
+
+    frozen() hands out a read-only copy that shares the vector blocks, so a
+    snapshot can be taken off the event loop; a shared block is copied the next
+    time this index writes to it.
+    """
+
+    def __init__(self, nprobe: int = 8, centroids: Optional[np.ndarray] = None):
+        self.nprobe = nprobe
+        self.centroids = centroids
+        list_count = 1 if centroids is None else len(centroids)
+        self._blocks: List[np.ndarray] = [np.zeros((0, VECTOR_DIM), dtype=np.int8) for _ in range(list_count)]
+        self._block_ids: List[List[str]] = [[] for _ in range(list_count)]
+        self._where: Dict[str, Tuple[int, int]] = {}
+        self._shared: Set[int] = set()  # Lists whose block a frozen copy still reads
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._where
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.zeros(len(vectors), dtype=np.intp)
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def _writable(self, list_number: int) -> np.ndarray:
+        """A list's block, copied first if a frozen copy shares it"""
+        if list_number in self._shared:
+            self._shared.discard(list_number)
+            self._blocks[list_number] = self._blocks[list_number].copy()
+        return self._blocks[list_number]
+
+    def add(self, job_id: str, vector: np.ndarray):
+        """Index (or re-index) a job's unit vector"""
+        self.remove(job_id)
+        list_number = int(self._assign(vector[None, :])[0])
+        block = self._blocks[list_number]
+        size = len(self._block_ids[list_number])
+        if size == len(block):
+            grown = np.zeros((max(16, size * 2), VECTOR_DIM), dtype=np.int8)
+            grown[:size] = block[:size]
+            block = self._blocks[list_number] = grown
+            self._shared.discard(list_number)
+        else:
+            block = self._writable(list_number)
+        block[size] = np.round(vector * QUANTIZATION_SCALE)
+        self._block_ids[list_number].append(job_id)
+        self._where[job_id] = (list_number, size)
+
+    def remove(self, job_id: str):
+        """Drop a job from the index"""
+        location = self._where.pop(job_id, None)
+        if location is None:
+            return
+        list_number, slot = location
+        ids = self._block_ids[list_number]
+        last = len(ids) - 1
+        if slot != last:
+            block = self._writable(list_number)
+            block[slot] = block[last]
+            ids[slot] = ids[last]
+            self._where[ids[slot]] = (list_number, slot)
+        ids.pop()
+
+    def get(self, job_id: str) -> Optional[np.ndarray]:
+        """A job's stored vector, dequantized"""
+        location = self._where.get(job_id)
+        if location is None:
+            return None
+        list_number, slot = location
+        return self._blocks[list_number][slot].astype(np.float32) / QUANTIZATION_SCALE
+
+    def search(self, query: np.ndarray, k: int, exclude: Optional[Set[str]] = None,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top-k (job_id, cosine similarity) for a unit query vector, skipping excluded ids"""
+        exclude = exclude or set()
+        query = query.astype(np.float32)
+        if self.centroids is None:
+            lists = [0]
+        else:
+            probe = min(nprobe or self.nprobe, len(self.centroids))
+            closeness = self.centroids @ query
+            lists = np.argpartition(-closeness, probe - 1)[:probe]
+
+        ids: List[str] = []
+        scores = []
+        for list_number in lists:
+            list_ids = self._block_ids[list_number]
+            if list_ids:
+                scores.append(self._blocks[list_number][:len(list_ids)] @ query)
+                ids.extend(list_ids)
+        if not ids:
+            return []
+
+        scores = np.concatenate(scores) / QUANTIZATION_SCALE
+        wanted = min(k + len(exclude), len(ids))
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        top = top[np.argsort(-scores[top])]
+        results = [(ids[row], float(scores[row])) for row in top if ids[row] not in exclude]
+        return results[:k]
+
+    def frozen(self) -> "JobVectorIndex":
+        """A copy for snapshot() and state() off the event loop; costs a copy of the id lists only"""
+        copy = JobVectorIndex(nprobe=self.nprobe, centroids=self.centroids)
+        copy._blocks = list(self._blocks)
+        copy._block_ids = [list(list_ids) for list_ids in self._block_ids]
+        copy.trained_size = self.trained_size
+        self._shared = set(range(len(self._blocks)))
+        return copy
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Copies of every job id and int8 vector, list by list, and each list's size"""
+        ids = [job_id for list_ids in self._block_ids for job_id in list_ids]
+        vectors = np.concatenate([block[:len(list_ids)] for block, list_ids in zip(self._blocks, self._block_ids)])
+        sizes = np.array([len(list_ids) for list_ids in self._block_ids], dtype=np.int64)
+        return ids, vectors, sizes
+
+    @staticmethod
+    def train(vectors: np.ndarray, list_count: int, iterations: int = 8, seed: int = 0) -> np.ndarray:
+        """Spherical k-means centroids for int8 vectors, fit on a sample of at most 64 per list"""
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), list_count * 64)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)].astype(np.float32)
+        centroids = sample[rng.choice(sample_size, list_count, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty lists keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids).astype(np.float32)
+        return centroids
+
+    @classmethod
+    def build(cls, ids: List[str], vectors: np.ndarray, nprobe: int = 8, centroids: Optional[np.ndarray] = None,
+              assignment: Optional[np.ndarray] = None) -> "JobVectorIndex":
+        """Index int8 vectors in bulk, assigning each to its closest centroid unless assignment is given"""
+        index = cls(nprobe=nprobe, centroids=centroids)
+        if assignment is None:
+            assignment = np.zeros(len(ids), dtype=np.intp)
+            for start in range(0, len(ids), 65536):
+                assignment[start:start + 65536] = index._assign(vectors[start:start + 65536].astype(np.float32))
+
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(len(index._blocks) + 1))
+        for list_number in range(len(index._blocks)):
+            rows = order[bounds[list_number]:bounds[list_number + 1]]
+            index._blocks[list_number] = vectors[rows]
+            index._block_ids[list_number] = [ids[row] for row in rows]
+            for slot, job_id in enumerate(index._block_ids[list_number]):
+                index._where[job_id] = (list_number, slot)
+        return index
+
+    @classmethod
+    def build_trained(cls, ids: List[str], vectors: np.ndarray, nprobe: int = 8) -> "JobVectorIndex":
+        """Index a snapshot's vectors in about sqrt(N) freshly trained lists"""
+        list_count = int(math.sqrt(len(ids)))
+        centroids = cls.train(vectors, list_count) if list_count > 1 else None
+        index = cls.build(ids, vectors, nprobe, centroids)
+        index.trained_size = len(ids)
+        return index
+
+    def state(self) -> Dict[str, np.ndarray]:
+        ids, vectors, sizes = self.snapshot()
+        return {
+            "ids": np.array(ids, dtype="S"),
+            "vectors": vectors,
+            "list_sizes": sizes,
+            "centroids": self.centroids if self.centroids is not None else np.zeros((0, VECTOR_DIM), np.float32),
+            "trained_size": np.array(self.trained_size)
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, np.ndarray], nprobe: int = 8) -> "JobVectorIndex":
+        ids = [job_id.decode() for job_id in state["ids"]]
+        centroids = state["centroids"] if len(state["centroids"]) else None
+        assignment = np.repeat(np.arange(len(state["list_sizes"])), state["list_sizes"])
+        index = cls.build(ids, state["vectors"], nprobe, centroids, assignment)
+        index.trained_size = int(state["trained_size"])
+        return index
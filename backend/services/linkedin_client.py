@@ -0,0 +1,133 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Awaitable, Callable, Optional
+import asyncio
+import random
+import logging
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class LinkedInClient:
+    """Process-wide async HTTP client for the LinkedIn API.
+
+    Connections are pooled and kept alive across calls, every call has a timeout,
+    and throttled (429) or failed (5xx) calls are retried with exponential backoff
+    and jitter, honouring Retry-After. Every retry is a real call, so callers
+    pass before_retry to charge it to their rate limit. Base URLs come from the environment so the
+    service can be pointed at a local stand-in.
+    """
+
+    def __init__(self):
+        self.api_base_url = os.getenv('LINKEDIN_API_BASE_URL', 'https://api.linkedin.com/v2')
+        self.oauth_base_url = os.getenv('LINKEDIN_OAUTH_BASE_URL', 'https://www.linkedin.com/oauth/v2')
+
+        # Pool / timeout / retry settings
+        self.timeout_seconds = float(os.getenv('LINKEDIN_TIMEOUT_SECONDS', '10'))
+        self.connect_timeout_seconds = float(os.getenv('LINKEDIN_CONNECT_TIMEOUT_SECONDS', '5'))
+        self.max_connections = int(os.getenv('LINKEDIN_MAX_CONNECTIONS', '20'))
+        self.max_keepalive_connections = int(os.getenv('LINKEDIN_MAX_KEEPALIVE_CONNECTIONS', str(self.max_connections)))
+        self.max_retries = int(os.getenv('LINKEDIN_MAX_RETRIES', '3'))
+        self.backoff_seconds = float(os.getenv('LINKEDIN_BACKOFF_SECONDS', '0.5'))
+        self.max_backoff_seconds = float(os.getenv('LINKEDIN_MAX_BACKOFF_SECONDS', '8'))
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the shared client on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds)
+            )
+        return self._client
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Seconds to wait before the next attempt"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff_seconds)
+        return random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+
+    async def request(self, method: str, url: str, idempotent: bool = True,
+                      before_retry: Optional[Callable[[], Awaitable[bool]]] = None, **kwargs) -> httpx.Response:
+        """Send a request, retrying throttled and failed attempts.
+
+        Non-idempotent requests are only retried when LinkedIn cannot have acted
+        on them: a 429, or a connection that was never established. before_retry
+        is awaited ahead of each retry; when it returns False the last response
+        is returned (or the last error raised) instead of retrying.
+        """
+        client = self._get_client()
+        attempt = 0
+        while True:
+            self.requests += 1
+            response = None
+            error = None
+            try:
+                response = await client.request(method, url, **kwargs)
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt >= self.max_retries:
+                    return response
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                logger.warning(f"LinkedIn {method} {url} failed to connect: {e}")
+                error = e
+            except httpx.TransportError as e:
+                if not idempotent or attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                error = e
+
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            status = response.status_code if response is not None else "error"
+            logger.warning(f"Retrying LinkedIn {method} {url} after {status} in {delay:.2f}s "
+                           f"(attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+            if before_retry is not None and not await before_retry():
+                logger.warning(f"Not retrying LinkedIn {method} {url}: rate limit reached")
+                if response is not None:
+                    return response
+                self.failures += 1
+                raise error
+            self.retries += 1
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, idempotent: bool = False, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, idempotent=idempotent, **kwargs)
+
+    def get_stats(self) -> dict:
+        """Get request counters and pool settings"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "max_connections": self.max_connections,
+            "timeout_seconds": self.timeout_seconds
+        }
+
+    async def close(self):
+        """Close the underlying HTTP connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("Closed LinkedIn client")
@@ -2,27 +2,53 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import requests
-import time
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING
+from services.linkedin_client import LinkedInClient
+from services.rate_limiter import RateLimiter, MongoRateLimitBackend, InMemoryRateLimitBackend
+from services.ttl_cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
 class LinkedInService:
+    INDEXES = {
+        "linkedin_tokens": [
+            IndexModel([("user_id", ASCENDING)], name="user_id")
+        ],
+        **MongoRateLimitBackend.INDEXES
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.client_id = os.getenv('LINKEDIN_CLIENT_ID')
         self.client_secret = os.getenv('LINKEDIN_CLIENT_SECRET')
         self.redirect_uri = os.getenv('LINKEDIN_REDIRECT_URI', 'http://localhost:8001/api/linkedin/callback')
-        self.base_url = "https://api.linkedin.com/v2"
+        self.http = LinkedInClient()
+        self.base_url = self.http.api_base_url
         
-        # Rate limiting
-        self.api_calls_today = 0
-        self.last_reset = datetime.utcnow().date()
-        self.daily_limit = 100  # LinkedIn's typical daily limit for job searches
+        # Rate limiting, shared by every worker unless LINKEDIN_RATE_LIMIT_BACKEND=memory
+        backend = (InMemoryRateLimitBackend() if os.getenv('LINKEDIN_RATE_LIMIT_BACKEND', 'mongo') == 'memory'
+                   else MongoRateLimitBackend(db))
+        self.rate_limiter = RateLimiter(
+            backend,
+            name="linkedin",
+            daily_limit=int(os.getenv('LINKEDIN_DAILY_LIMIT', '100')),  # LinkedIn's typical daily limit for job searches
+            user_daily_limit=int(os.getenv('LINKEDIN_USER_DAILY_LIMIT', '25')),
+            burst=int(os.getenv('LINKEDIN_BURST_LIMIT', '5')),
+            refill_per_second=float(os.getenv('LINKEDIN_CALLS_PER_MINUTE', '30')) / 60,
+            max_wait_seconds=float(os.getenv('LINKEDIN_RATE_LIMIT_MAX_WAIT_SECONDS', '5'))
+        )
+
+        # Job search results shared across users; stale entries are served while one refresh runs
+        self.search_cache = TTLCache(
+            ttl_seconds=float(os.getenv('LINKEDIN_SEARCH_CACHE_TTL_SECONDS', '900')),
+            max_entries=int(os.getenv('LINKEDIN_SEARCH_CACHE_MAX_ENTRIES', '1000')),
+            stale_seconds=float(os.getenv('LINKEDIN_SEARCH_CACHE_STALE_SECONDS', '3600'))
+        )
+        self.search_counts: Dict[str, Dict[str, int]] = {}
         
     async def get_user_access_token(self, user_id: str) -> Optional[str]:
         """Get stored access token for user"""
@@ -57,7 +83,7 @@ class LinkedInService:
         """Generate LinkedIn OAuth authorization URL"""
         scope = "r_liteprofile,r_emailaddress"  # Basic permissions
         auth_url = (
-            f"https://www.linkedin.com/oauth/v2/authorization?"
+            f"{self.http.oauth_base_url}/authorization?"
             f"response_type=code&"
             f"client_id={self.client_id}&"
             f"redirect_uri={self.redirect_uri}&"
@@ -70,7 +96,7 @@ class LinkedInService:
     async def exchange_code_for_token(self, code: str) -> Dict:
         """Exchange authorization code for access token"""
         try:
-            token_url = "https://www.linkedin.com/oauth/v2/accessToken"
+            token_url = f"{self.http.oauth_base_url}/accessToken"
             data = {
                 'grant_type': 'authorization_code',
                 'code': code,
@@ -79,7 +105,7 @@ class LinkedInService:
                 'client_secret': self.client_secret
             }
             
-            response = requests.post(token_url, data=data)
+            response = await self.http.post(token_url, data=data)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -89,28 +115,9 @@ class LinkedInService:
             logger.error(f"Error exchanging code for token: {e}")
             raise
     
-    def _check_rate_limit(self) -> bool:
-        """Check if we're within rate limits"""
-        today = datetime.utcnow().date()
-        
-        # Reset counter if new day
-        if today > self.last_reset:
-            self.api_calls_today = 0
-            self.last_reset = today
-        
-        return self.api_calls_today < self.daily_limit
-    
-    def _record_api_call(self):
-        """Record an API call for rate limiting"""
-        self.api_calls_today += 1
-    
     async def get_user_profile(self, user_id: str) -> Optional[Dict]:
         """Get user's LinkedIn profile"""
         try:
-            if not self._check_rate_limit():
-                logger.warning("LinkedIn API rate limit reached")
-                return None
-            
             access_token = await self.get_user_access_token(user_id)
             if not access_token:
                 logger.warning(f"No access token for user {user_id}")
@@ -119,8 +126,10 @@ class LinkedInService:
             headers = {'Authorization': f'Bearer {access_token}'}
             url = f"{self.base_url}/people/~"
             
-            response = requests.get(url, headers=headers)
-            self._record_api_call()
+            if not await self.rate_limiter.acquire(user_id):
+                return None
+            
+            response = await self.http.get(url, headers=headers, before_retry=self._retry_budget(user_id))
             
             if response.status_code == 200:
                 return response.json()
@@ -132,70 +141,107 @@ class LinkedInService:
             logger.error(f"Error getting user profile: {e}")
             return None
     
+    def _retry_budget(self, user_id: str) -> Callable[[], Awaitable[bool]]:
+        """Hook for LinkedInClient.request that charges each retry to the rate limiter like a new call"""
+        return lambda: self.rate_limiter.acquire(user_id)
+
+    @staticmethod
+    def _search_key(keywords: str, location: str) -> tuple:
+        """Cache key for a search: case and whitespace do not change LinkedIn's results"""
+        return (" ".join(keywords.lower().split()), " ".join(location.lower().split()))
+
     async def search_jobs_basic(self, user_id: str, keywords: str, location: str = "") -> List[Dict]:
         """
         Basic job search using LinkedIn API
         Note: LinkedIn's official API has very limited job search capabilities
         This is a simplified implementation that may require special API access
+
+        Results are shared between users through search_cache: repeated and
+        concurrent searches for the same keywords and location cost one API call.
         """
         try:
-            if not self._check_rate_limit():
-                logger.warning("LinkedIn API rate limit reached")
-                return []
-            
             access_token = await self.get_user_access_token(user_id)
             if not access_token:
                 logger.warning(f"No access token for user {user_id}")
                 return []
-            
-            headers = {'Authorization': f'Bearer {access_token}'}
-            
-            # Note: This endpoint may not be available for most applications
-            # LinkedIn restricts job search API access to select partners
-            url = f"{self.base_url}/jobSearch"
-            params = {
-                'keywords': keywords,
-                'location': location,
-                'count': 25
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            self._record_api_call()
-            
-            if response.status_code == 200:
-                data = response.json()
-                jobs = []
-                
-                for job_element in data.get('elements', []):
-                    job = {
-                        'id': job_element.get('id'),
-                        'title': job_element.get('title'),
-                        'company': job_element.get('companyName'),
-                        'location': job_element.get('location'),
-                        'description': job_element.get('description'),
-                        'url': f"https://www.linkedin.com/jobs/view/{job_element.get('id')}",
-                        'posted_at': job_element.get('listedAt'),
-                        'source': 'linkedin_api',
-                        'discovered_at': datetime.utcnow()
-                    }
-                    jobs.append(job)
-                
-                return jobs
-            else:
-                logger.error(f"Job search failed: {response.status_code} - {response.text}")
-                return []
-                
+
+            today = datetime.utcnow().date().isoformat()
+            self._count_search("searches", today)
+
+            async def fetch():
+                self._count_search("api_calls", today)
+                return await self._fetch_jobs(user_id, access_token, keywords, location)
+
+            jobs = await self.search_cache.get_or_compute(self._search_key(keywords, location), fetch)
+
+            # Copies, so callers can annotate their jobs without touching the cache
+            discovered_at = datetime.utcnow()
+            return [dict(job, discovered_at=discovered_at) for job in jobs]
+
         except Exception as e:
             logger.error(f"Error searching jobs: {e}")
             return []
-    
+
+    async def _fetch_jobs(self, user_id: str, access_token: str, keywords: str, location: str) -> List[Dict]:
+        """Call LinkedIn's job search; raises on failure so nothing is cached"""
+        headers = {'Authorization': f'Bearer {access_token}'}
+
+        # Note: This endpoint may not be available for most applications
+        # LinkedIn restricts job search API access to select partners
+        url = f"{self.base_url}/jobSearch"
+        params = {
+            'keywords': keywords,
+            'location': location,
+            'count': 25
+        }
+
+        if not await self.rate_limiter.acquire(user_id):
+            raise Exception("LinkedIn API rate limit reached")
+
+        response = await self.http.get(url, headers=headers, params=params,
+                                       before_retry=self._retry_budget(user_id))
+        if response.status_code != 200:
+            raise Exception(f"Job search failed: {response.status_code} - {response.text}")
+
+        data = response.json()
+        jobs = []
+
+        for job_element in data.get('elements', []):
+            job = {
+                'id': job_element.get('id'),
+                'title': job_element.get('title'),
+                'company': job_element.get('companyName'),
+                'location': job_element.get('location'),
+                'description': job_element.get('description'),
+                'url': f"https://www.linkedin.com/jobs/view/{job_element.get('id')}",
+                'posted_at': job_element.get('listedAt'),
+                'source': 'linkedin_api',
+                'discovered_at': datetime.utcnow()
+            }
+            jobs.append(job)
+
+        return jobs
+
+    def _count_search(self, counter: str, day: str):
+        """Tally searches and the API calls they needed, keeping the last week"""
+        counts = self.search_counts.setdefault(day, {"searches": 0, "api_calls": 0})
+        counts[counter] += 1
+        for stale_day in sorted(self.search_counts)[:-7]:
+            del self.search_counts[stale_day]
+
+    def get_search_cache_stats(self) -> Dict:
+        """Get search cache counters and the API calls it saved per UTC day"""
+        return {
+            **self.search_cache.get_stats(),
+            "quota_saved": {
+                day: {**counts, "calls_saved": counts["searches"] - counts["api_calls"]}
+                for day, counts in sorted(self.search_counts.items())
+            }
+        }
+
     async def get_job_details(self, user_id: str, job_id: str) -> Optional[Dict]:
         """Get detailed information about a specific job"""
         try:
-            if not self._check_rate_limit():
-                logger.warning("LinkedIn API rate limit reached")
-                return None
-            
             access_token = await self.get_user_access_token(user_id)
             if not access_token:
                 return None
@@ -203,8 +249,10 @@ class LinkedInService:
             headers = {'Authorization': f'Bearer {access_token}'}
             url = f"{self.base_url}/jobs/{job_id}"
             
-            response = requests.get(url, headers=headers)
-            self._record_api_call()
+            if not await self.rate_limiter.acquire(user_id):
+                return None
+            
+            response = await self.http.get(url, headers=headers, before_retry=self._retry_budget(user_id))
             
             if response.status_code == 200:
                 return response.json()
@@ -222,10 +270,6 @@ class LinkedInService:
         Note: This requires special API access and may not be available for most applications
         """
         try:
-            if not self._check_rate_limit():
-                logger.warning("LinkedIn API rate limit reached")
-                return False
-            
             access_token = await self.get_user_access_token(user_id)
             if not access_token:
                 return False
@@ -242,8 +286,11 @@ class LinkedInService:
                 'coverLetter': cover_letter
             }
             
-            response = requests.post(url, json=data, headers=headers)
-            self._record_api_call()
+            if not await self.rate_limiter.acquire(user_id):
+                return False
+            
+            response = await self.http.post(url, json=data, headers=headers,
+                                            before_retry=self._retry_budget(user_id))
             
             if response.status_code == 201:
                 logger.info(f"Successfully applied to job {job_id}")
@@ -256,21 +303,16 @@ class LinkedInService:
             logger.error(f"Error submitting job application: {e}")
             return False
     
-    async def get_rate_limit_status(self) -> Dict:
-        """Get current rate limit status"""
-        today = datetime.utcnow().date()
-        
-        # Reset counter if new day
-        if today > self.last_reset:
-            self.api_calls_today = 0
-            self.last_reset = today
-        
-        return {
-            "calls_made_today": self.api_calls_today,
-            "daily_limit": self.daily_limit,
-            "calls_remaining": max(0, self.daily_limit - self.api_calls_today),
-            "resets_at": "00:00 UTC"
-        }
+    async def close(self):
+        """Close the shared HTTP client"""
+        await self.http.close()
+
+    async def get_rate_limit_status(self, user_id: str = None) -> Dict:
+        """Get current rate limit status across all workers"""
+        status = await self.rate_limiter.get_status(user_id)
+        counts = self.search_counts.get(datetime.utcnow().date().isoformat(), {"searches": 0, "api_calls": 0})
+        status["search_calls_saved_today"] = counts["searches"] - counts["api_calls"]
+        return status
     
     async def create_mock_jobs_for_demo(self, campaign_id: str, keywords: List[str]) -> List[Dict]:
         """
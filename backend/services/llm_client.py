@@ -0,0 +1,94 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Optional
+import asyncio
+import logging
+import httpx
+import openai
+
+logger = logging.getLogger(__name__)
+
+class LLMClient:
+    """Process-wide async OpenAI client with connection pooling and bounded concurrency.
+
+    A single instance is shared by every request on the worker, so the underlying
+    HTTP connections are kept alive between completions instead of being rebuilt
+    (and the event loop is never blocked while a completion is in flight).
+    """
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = os.getenv('OPENAI_BASE_URL')
+
+        # Pool / timeout / concurrency settings
+        self.timeout_seconds = float(os.getenv('OPENAI_TIMEOUT_SECONDS', '60'))
+        self.connect_timeout_seconds = float(os.getenv('OPENAI_CONNECT_TIMEOUT_SECONDS', '10'))
+        self.max_connections = int(os.getenv('OPENAI_MAX_CONNECTIONS', '50'))
+        self.max_keepalive_connections = int(os.getenv('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '20'))
+        self.max_concurrency = int(os.getenv('OPENAI_MAX_CONCURRENCY', '16'))
+        self.max_retries = int(os.getenv('OPENAI_MAX_RETRIES', '2'))
+
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+
+    def _get_client(self) -> openai.AsyncOpenAI:
+        """Create the shared client on first use"""
+        if self._client is None:
+            if not self.api_key:
+                raise Exception("No OpenAI API key available")
+
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                timeout=httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds)
+            )
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=self.max_retries,
+                timeout=self.timeout_seconds
+            )
+        return self._client
+
+    async def chat_completion(self, model: str, system_message: str, user_prompt: str,
+                              max_tokens: int = 1000, temperature: float = 0.7) -> str:
+        """Run a chat completion, waiting for a free slot if the concurrency cap is reached"""
+        client = self._get_client()
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_message},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+            finally:
+                self.in_flight -= 1
+
+        return response.choices[0].message.content
+
+    def get_stats(self) -> dict:
+        """Get current pool and concurrency settings"""
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "max_connections": self.max_connections,
+            "timeout_seconds": self.timeout_seconds
+        }
+
+    async def close(self):
+        """Close the underlying HTTP connection pool"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            logger.info("Closed OpenAI client")
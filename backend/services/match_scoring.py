@@ -0,0 +1,262 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime
+import re
+import string
+import zlib
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Share of the final score taken by each component
+WEIGHTS = {"skills": 0.45, "seniority": 0.2, "salary": 0.15, "location": 0.2}
+
+# Matching this many of the profile's skills (or all of them, if fewer) is a full skill score
+SKILL_TARGET = 6
+
+# Neutral component values when one side gives no information
+UNKNOWN_SENIORITY_FIT = 0.75
+UNKNOWN_SALARY_FIT = 0.5
+UNKNOWN_LOCATION_FIT = 0.5
+
+# Work arrangements
+UNKNOWN, REMOTE, HYBRID, ONSITE = 0, 1, 2, 3
+ARRANGEMENTS = {"remote": REMOTE, "hybrid": HYBRID, "onsite": ONSITE}
+
+# Seniority levels: 0 entry, 1 mid, 2 senior, 3 staff/lead, 4 executive
+TITLE_LEVELS = [
+    (re.compile(r"\b(head|director|vp|vice president|chief|cto|cpo|ceo)\b"), 4),
+    (re.compile(r"\b(staff|principal|lead|distinguished)\b"), 3),
+    (re.compile(r"\b(senior|sr)\b"), 2),
+    (re.compile(r"\b(intern|junior|jr|entry|associate|graduate)\b"), 0),
+]
+YEARS_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:years|yrs)")
+SALARY_RE = re.compile(r"(\$)?\s*(\d[\d,]*(?:\.\d+)?)\s*(k\b)?", re.IGNORECASE)
+SALARY_RANGE_RE = re.compile(r"\d\s*k?\s*(?:-|–|to)\s*\$?\s*\d", re.IGNORECASE)
+# Retirement plans ("401k", "403(b)") read like amounts in thousands
+RETIREMENT_PLAN_RE = re.compile(r"\b4(?:01|03|57)\s*\(?\s*[kb]\s*\)?", re.IGNORECASE)
+HOURLY_RE = re.compile(r"/\s*h(?:ou)?r|per hour|hourly", re.IGNORECASE)
+WORD_RE = re.compile(r"[a-z0-9+#.]+")
+
+# Punctuation other than the characters used in skill names ("c++", "c#", "node.js") becomes a space
+_PUNCTUATION = str.maketrans({character: " " for character in string.punctuation if character not in "+#."})
+
+def _normalize(text: str) -> str:
+    words = (word.strip(".") for word in WORD_RE.findall((text or "").lower()))
+    return " ".join(word for word in words if word)
+
+def _level_for_years(years: float) -> int:
+    return int(np.searchsorted([2, 5, 8, 12], years, side="right"))
+
+def title_level(title: str) -> int:
+    """Seniority level named in a title, or -1"""
+    text = (title or "").lower()
+    for pattern, level in TITLE_LEVELS:
+        if pattern.search(text):
+            return level
+    return -1
+
+def parse_salary(salary: Optional[str]) -> tuple:
+    """(min, max) yearly salary from text like "$120k - $150k" or "$60/hr"; NaN when absent.
+
+    A number only counts with a currency sign, a "k", an hourly rate or a range
+    around it, so "Competitive + 401k" or "founded 1998" carry no salary.
+    """
+    if not salary:
+        return float("nan"), float("nan")
+    salary = RETIREMENT_PLAN_RE.sub(" ", salary)
+    hourly = HOURLY_RE.search(salary)
+    in_range = SALARY_RANGE_RE.search(salary)
+    amounts = []
+    for currency, number, thousands in SALARY_RE.findall(salary):
+        if not (currency or thousands or hourly or in_range):
+            continue
+        value = float(number.replace(",", ""))
+        if thousands:
+            value *= 1000
+        amounts.append(value)
+    # "$120-150k": the unit on the upper bound applies to the lower one too
+    if len(amounts) >= 2 and amounts[0] < 1000 <= amounts[-1]:
+        amounts[0] *= 1000
+    if hourly:
+        amounts = [amount * 2080 for amount in amounts]
+    amounts = [amount for amount in amounts if amount >= 1000]
+    if not amounts:
+        return float("nan"), float("nan")
+    return min(amounts), max(amounts)
+
+@lru_cache(maxsize=4096)
+def location_key(location: Optional[str]) -> int:
+    """Hash of the city part of a location; 0 when unknown"""
+    city = _normalize((location or "").split(",")[0])
+    if not city or city in ARRANGEMENTS:
+        return 0
+    return zlib.crc32(city.encode()) or 1
+
+def job_arrangement(location: str, title: str, description: str) -> int:
+    """Work arrangement stated by the location, then the title, then the description"""
+    for text in (location, title, description):
+        text = (text or "").lower()
+        if "remote" in text:
+            return REMOTE
+        if "hybrid" in text:
+            return HYBRID
+    return ONSITE if location_key(location) else UNKNOWN
+
+def experience_years(experience: Sequence[Dict[str, Any]], now: Optional[datetime] = None) -> Optional[float]:
+    """Total years across experience entries (YYYY-MM to YYYY-MM or "present")"""
+    now = now or datetime.utcnow()
+    months = 0
+    counted = False
+    for entry in experience or []:
+        try:
+            start_year, start_month = (int(part) for part in entry["start_date"].split("-")[:2])
+            end = entry.get("end_date") or "present"
+            if end.lower() == "present":
+                end_year, end_month = now.year, now.month
+            else:
+                end_year, end_month = (int(part) for part in end.split("-")[:2])
+        except (KeyError, ValueError, AttributeError):
+            continue
+        months += max((end_year - start_year) * 12 + end_month - start_month, 0)
+        counted = True
+    return months / 12 if counted else None
+
+class ProfileFeatures:
+    """A profile encoded for scoring: its skill vocabulary and scalar preferences"""
+
+    def __init__(self, profile: Optional[Dict[str, Any]]):
+        profile = profile or {}
+        preferences = profile.get("preferences") or {}
+        personal_info = profile.get("personal_info") or {}
+
+        seen = set()
+        self.skills: List[str] = []
+        for skill in profile.get("skills") or []:
+            normalized = _normalize(skill)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                self.skills.append(normalized)
+        # Skills are found as space-padded substrings of the job's normalized text
+        self.skill_needles = [f" {skill} " for skill in self.skills]
+
+        # The level named in the most recent title, else the level implied by total years
+        experience = profile.get("experience") or []
+        self.level = title_level(experience[0].get("title", "")) if experience else -1
+        if self.level < 0:
+            years = experience_years(experience)
+            self.level = _level_for_years(years) if years is not None else -1
+
+        self.min_salary = float(preferences.get("min_salary") or "nan")
+        self.arrangement = ARRANGEMENTS.get((preferences.get("work_arrangement") or "").lower(), UNKNOWN)
+        self.willing_to_relocate = bool(preferences.get("willingness_to_relocate"))
+        self.location_key = location_key(personal_info.get("location"))
+
+class JobFeatures:
+    """Numeric feature arrays for a batch of jobs, encoded against one profile's skills"""
+
+    def __init__(self, jobs: Sequence[Dict[str, Any]], profile: ProfileFeatures):
+        count = len(jobs)
+        self.skill_matches = np.zeros((count, len(profile.skills)), dtype=bool)
+        self.level = np.full(count, -1, dtype=np.int8)
+        self.salary_max = np.full(count, np.nan, dtype=np.float32)
+        self.arrangement = np.zeros(count, dtype=np.int8)
+        self.location_key = np.zeros(count, dtype=np.int64)
+
+        for row, job in enumerate(jobs):
+            requirements = " ".join(job.get("requirements") or [])
+            description = job.get("description") or ""
+            if profile.skill_needles:
+                text = f"{job.get('title', '')} {requirements} {description} ".lower().translate(_PUNCTUATION)
+                text = f" {' '.join(text.replace('. ', ' ').split())} "
+                self.skill_matches[row] = [needle in text for needle in profile.skill_needles]
+
+            level = title_level(job.get("title", ""))
+            if level < 0:
+                years = [int(value) for value in YEARS_RE.findall(f"{requirements} {description}".lower())]
+                level = _level_for_years(min(years)) if years else -1
+            self.level[row] = level
+
+            self.salary_max[row] = parse_salary(job.get("salary"))[1]
+            self.arrangement[row] = job_arrangement(job.get("location", ""), job.get("title", ""), description)
+            self.location_key[row] = location_key(job.get("location"))
+
+class MatchScorer:
+    """Scores jobs against a profile, many jobs per NumPy pass.
+
+    Each job gets four components in [0, 1]: skill overlap, seniority fit, salary
+    fit and location / work-arrangement fit; the score is their weighted sum on a
+    0-100 scale. Encoding a job is one normalization pass over its text; everything
+    after that is array arithmetic over the whole batch.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        self.weights = weights or WEIGHTS
+
+    def components(self, profile: ProfileFeatures, jobs: JobFeatures) -> Dict[str, np.ndarray]:
+        """Per-job component values, each an array in [0, 1]"""
+        count = len(jobs.level)
+
+        if profile.skills:
+            target = min(len(profile.skills), SKILL_TARGET)
+            skills = np.minimum(jobs.skill_matches.sum(axis=1) / target, 1.0)
+        else:
+            skills = np.full(count, 0.5)
+
+        if profile.level >= 0:
+            distance = np.abs(jobs.level.astype(np.float32) - profile.level)
+            seniority = np.where(jobs.level >= 0, np.clip(1 - 0.35 * distance, 0, 1), UNKNOWN_SENIORITY_FIT)
+        else:
+            seniority = np.full(count, UNKNOWN_SENIORITY_FIT)
+
+        salary_known = ~np.isnan(jobs.salary_max)
+        if np.isnan(profile.min_salary):
+            salary = np.where(salary_known, 1.0, UNKNOWN_SALARY_FIT)
+        else:
+            shortfall = (profile.min_salary - np.nan_to_num(jobs.salary_max)) / (0.25 * profile.min_salary)
+            salary = np.where(salary_known, np.clip(1 - shortfall, 0, 1), UNKNOWN_SALARY_FIT)
+
+        location = self._location_fit(profile, jobs)
+
+        return {"skills": skills, "seniority": seniority, "salary": salary, "location": location}
+
+    def _location_fit(self, profile: ProfileFeatures, jobs: JobFeatures) -> np.ndarray:
+        same_city = (jobs.location_key != 0) & (jobs.location_key == profile.location_key)
+        preference = profile.arrangement
+        in_person = {
+            HYBRID: 0.7 if preference == REMOTE else 1.0,
+            ONSITE: {REMOTE: 0.5, HYBRID: 0.85}.get(preference, 1.0),
+            UNKNOWN: 0.9
+        }
+        elsewhere = 0.6 if profile.willing_to_relocate else 0.2
+        return np.select(
+            [
+                jobs.arrangement == REMOTE,
+                same_city & (jobs.arrangement == HYBRID),
+                same_city & (jobs.arrangement == ONSITE),
+                same_city,
+                jobs.location_key == 0
+            ],
+            [0.8 if preference == ONSITE else 1.0, in_person[HYBRID], in_person[ONSITE], in_person[UNKNOWN],
+             UNKNOWN_LOCATION_FIT],
+            default=elsewhere
+        )
+
+    def score(self, profile: ProfileFeatures, jobs: JobFeatures) -> np.ndarray:
+        """Match scores (0-100, one decimal) for every job in the batch"""
+        components = self.components(profile, jobs)
+        total = sum(self.weights[name] * values for name, values in components.items())
+        return np.round(total * 100, 1)
+
+    def score_jobs(self, profile: Optional[Dict[str, Any]], jobs: Sequence[Dict[str, Any]]) -> List[float]:
+        """Encode and score job dicts against a profile dict (None scores neutrally)"""
+        if not jobs:
+            return []
+        profile_features = ProfileFeatures(profile)
+        return self.score(profile_features, JobFeatures(jobs, profile_features)).tolist()
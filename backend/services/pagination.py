@@ -0,0 +1,131 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from bson import ObjectId
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from datetime import datetime
+from pydantic import BaseModel
+import base64
+import json
+
+class InvalidCursor(ValueError):
+    pass
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$date" in value:
+            return datetime.fromisoformat(value["$date"])
+        if "$oid" in value:
+            return ObjectId(value["$oid"])
+    return value
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort-key values of the last returned document as an opaque cursor"""
+    payload = json.dumps([_encode_value(value) for value in values]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return [_decode_value(value) for value in values]
+    except Exception:
+        raise InvalidCursor("Invalid pagination cursor")
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """Parse a comma-separated fields= parameter, rejecting unknown fields"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in set(allowed)]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+def _keyset_filter(sort: List[Tuple[str, int]], values: List[Any]) -> Dict[str, Any]:
+    """Filter for documents strictly after the given sort-key values"""
+    if len(values) != len(sort):
+        raise InvalidCursor("Invalid pagination cursor")
+    clauses = []
+    for position, (key, direction) in enumerate(sort):
+        clause = {prior_key: values[index] for index, (prior_key, _) in enumerate(sort[:position])}
+        clause[key] = {"$lt" if direction < 0 else "$gt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+async def fetch_page(collection: AsyncIOMotorCollection, query: Dict[str, Any], sort: List[Tuple[str, int]],
+                     limit: int, cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                     summary_model: Optional[Type[BaseModel]] = None) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one keyset-paginated page.
+
+    Without fields, documents are projected to summary_model's fields and returned
+    as summary models; with fields, the projected dicts are returned as-is.
+    """
+    if cursor:
+        query = {"$and": [query, _keyset_filter(sort, decode_cursor(cursor))]}
+
+    selected = fields if fields else list(summary_model.model_fields)
+    projection = {field: 1 for field in selected}
+    for key, _ in sort:
+        projection[key] = 1
+
+    documents = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor([documents[-1].get(key) for key, _ in sort])
+
+    items = []
+    for document in documents:
+        item = {field: document[field] for field in selected if field in document}
+        items.append(item if fields else summary_model(**item))
+    return items, next_cursor
+
+async def fetch_text_page(collection: AsyncIOMotorCollection, search: str, query: Dict[str, Any], limit: int,
+                          cursor: Optional[str] = None, fields: Optional[List[str]] = None,
+                          summary_model: Optional[Type[BaseModel]] = None) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of $text search results, most relevant first.
+
+    Pages are keyed on (relevance, _id), so a cursor resumes after the last
+    result instead of skipping over earlier ones. Every item carries its
+    relevance; without fields, items are built with summary_model.
+    """
+    sort = [("relevance", -1), ("_id", 1)]
+    selected = fields if fields else [field for field in summary_model.model_fields if field != "relevance"]
+
+    pipeline = [
+        {"$match": {"$text": {"$search": search}, **query}},
+        {"$addFields": {"relevance": {"$meta": "textScore"}}}
+    ]
+    if cursor:
+        pipeline.append({"$match": _keyset_filter(sort, decode_cursor(cursor))})
+    pipeline += [
+        {"$sort": dict(sort)},
+        {"$limit": limit + 1},
+        {"$project": {**{field: 1 for field in selected}, "relevance": 1}}
+    ]
+
+    documents = await collection.aggregate(pipeline).to_list(limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor([documents[-1].get(key) for key, _ in sort])
+
+    items = []
+    for document in documents:
+        item = {field: document[field] for field in selected if field in document}
+        item["relevance"] = round(document["relevance"], 4)
+        items.append(item if fields else summary_model(**item))
+    return items, next_cursor
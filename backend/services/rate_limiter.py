@@ -0,0 +1,240 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc import ABC, abstractmethod
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RateLimitBackend(ABC):
+    """Storage for rate limit state shared by every worker.
+
+    Counters are keyed by name and expire at a given time; buckets are token
+    buckets refilled continuously up to their capacity.
+    """
+
+    @abstractmethod
+    async def increment_if_below(self, key: str, limit: int, expires_at: datetime) -> bool:
+        """Atomically add one to a counter unless it has reached limit"""
+
+    @abstractmethod
+    async def decrement(self, key: str) -> None:
+        """Give back a unit taken by increment_if_below"""
+
+    @abstractmethod
+    async def get_count(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def take_token(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> bool:
+        """Atomically refill a bucket and take one token from it if one is available"""
+
+    @abstractmethod
+    async def get_tokens(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> float:
+        ...
+
+def _refill(tokens: float, updated_at: datetime, capacity: float, refill_per_second: float, now: datetime) -> float:
+    elapsed = max((now - updated_at).total_seconds(), 0.0)
+    return min(capacity, tokens + elapsed * refill_per_second)
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local backend for single-worker deployments and local runs"""
+
+    def __init__(self):
+        self._counters: Dict[str, Tuple[int, datetime]] = {}
+        self._buckets: Dict[str, Tuple[float, datetime]] = {}
+        self._lock = asyncio.Lock()
+
+    async def increment_if_below(self, key: str, limit: int, expires_at: datetime) -> bool:
+        async with self._lock:
+            count, _ = self._counters.get(key, (0, expires_at))
+            if count >= limit:
+                return False
+            self._counters[key] = (count + 1, expires_at)
+            self._expire(datetime.utcnow())
+            return True
+
+    async def decrement(self, key: str) -> None:
+        async with self._lock:
+            if key in self._counters:
+                count, expires_at = self._counters[key]
+                self._counters[key] = (max(count - 1, 0), expires_at)
+
+    async def get_count(self, key: str) -> int:
+        return self._counters.get(key, (0, None))[0]
+
+    async def take_token(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> bool:
+        async with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, capacity, refill_per_second, now)
+            granted = tokens >= 1
+            self._buckets[key] = (tokens - 1 if granted else tokens, now)
+            return granted
+
+    async def get_tokens(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> float:
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        return _refill(tokens, updated_at, capacity, refill_per_second, now)
+
+    def _expire(self, now: datetime):
+        for key in [key for key, (_, expires_at) in self._counters.items() if expires_at <= now]:
+            del self._counters[key]
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """Backend on a MongoDB collection, shared by every worker and surviving restarts.
+
+    Each counter or bucket is a single document changed with one atomic
+    find_one_and_update, so concurrent workers can never overshoot a limit.
+    Counter documents are removed by a TTL index once their window has passed.
+    """
+
+    COLLECTION = "rate_limits"
+
+    INDEXES = {
+        COLLECTION: [
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0)
+        ]
+    }
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db[self.COLLECTION]
+
+    async def increment_if_below(self, key: str, limit: int, expires_at: datetime) -> bool:
+        try:
+            # When the counter is at its limit the filter does not match, so the
+            # upsert tries to insert a second document with the same _id and fails
+            await self.collection.find_one_and_update(
+                {"_id": key, "count": {"$lt": limit}},
+                {"$inc": {"count": 1}, "$setOnInsert": {"expires_at": expires_at}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def decrement(self, key: str) -> None:
+        await self.collection.update_one({"_id": key, "count": {"$gt": 0}}, {"$inc": {"count": -1}})
+
+    async def get_count(self, key: str) -> int:
+        document = await self.collection.find_one({"_id": key}, {"count": 1})
+        return document["count"] if document else 0
+
+    async def take_token(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> bool:
+        elapsed_seconds = {"$divide": [{"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}, 1000]}
+        document = await self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [capacity, {"$add": [
+                        {"$ifNull": ["$tokens", capacity]},
+                        {"$multiply": [{"$max": [elapsed_seconds, 0]}, refill_per_second]}
+                    ]}]},
+                    "updated_at": now,
+                    "expires_at": now + timedelta(seconds=capacity / refill_per_second)
+                }},
+                {"$set": {"granted": {"$gte": ["$tokens", 1]}}},
+                {"$set": {"tokens": {"$cond": ["$granted", {"$subtract": ["$tokens", 1]}, "$tokens"]}}}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return document["granted"]
+
+    async def get_tokens(self, key: str, capacity: float, refill_per_second: float, now: datetime) -> float:
+        document = await self.collection.find_one({"_id": key})
+        if not document:
+            return capacity
+        return _refill(document["tokens"], document["updated_at"], capacity, refill_per_second, now)
+
+class RateLimiter:
+    """Cluster-wide limiter for calls to an external API.
+
+    A call must fit in the global daily budget, the calling user's daily budget
+    and a short-window token bucket that smooths bursts; callers that find the
+    bucket empty wait up to max_wait_seconds for it to refill. Budgets reset at 00:00
+    UTC. If a later check fails, units already taken from earlier ones are given
+    back, so denied calls never count against a budget.
+    """
+
+    def __init__(self, backend: RateLimitBackend, name: str, daily_limit: int, user_daily_limit: int,
+                 burst: int, refill_per_second: float, max_wait_seconds: float = 0):
+        self.backend = backend
+        self.name = name
+        self.daily_limit = daily_limit
+        self.user_daily_limit = user_daily_limit
+        self.burst = burst
+        self.refill_per_second = refill_per_second
+        self.max_wait_seconds = max_wait_seconds
+
+        self.granted = 0
+        self.denied = {"daily": 0, "user_daily": 0, "burst": 0}
+
+    def _day_keys(self, user_id: Optional[str], now: datetime) -> Tuple[str, Optional[str], datetime]:
+        day = now.date().isoformat()
+        resets_at = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        user_key = f"{self.name}:user:{user_id}:{day}" if user_id else None
+        return f"{self.name}:daily:{day}", user_key, resets_at
+
+    async def acquire(self, user_id: Optional[str] = None) -> bool:
+        """Take one call from every budget; returns False if any of them is exhausted"""
+        now = datetime.utcnow()
+        daily_key, user_key, resets_at = self._day_keys(user_id, now)
+
+        if not await self.backend.increment_if_below(daily_key, self.daily_limit, resets_at):
+            return self._deny("daily", user_id)
+
+        if user_key and not await self.backend.increment_if_below(user_key, self.user_daily_limit, resets_at):
+            await self.backend.decrement(daily_key)
+            return self._deny("user_daily", user_id)
+
+        # A burst only delays the call; wait for the bucket to refill up to max_wait_seconds
+        deadline = time.monotonic() + self.max_wait_seconds
+        while not await self.backend.take_token(f"{self.name}:burst", self.burst, self.refill_per_second,
+                                                datetime.utcnow()):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await self.backend.decrement(daily_key)
+                if user_key:
+                    await self.backend.decrement(user_key)
+                return self._deny("burst", user_id)
+            await asyncio.sleep(min(remaining, random.uniform(0.5, 1.5) / self.refill_per_second))
+
+        self.granted += 1
+        return True
+
+    def _deny(self, scope: str, user_id: Optional[str]) -> bool:
+        self.denied[scope] += 1
+        logger.warning(f"{self.name} rate limit reached ({scope}) for user {user_id}")
+        return False
+
+    async def get_status(self, user_id: Optional[str] = None) -> Dict:
+        """Get the shared usage numbers, plus the user's own when user_id is given"""
+        now = datetime.utcnow()
+        daily_key, user_key, resets_at = self._day_keys(user_id, now)
+
+        calls_made = await self.backend.get_count(daily_key)
+        status = {
+            "calls_made_today": calls_made,
+            "daily_limit": self.daily_limit,
+            "calls_remaining": max(0, self.daily_limit - calls_made),
+            "resets_at": resets_at.isoformat() + "Z",
+            "user_daily_limit": self.user_daily_limit,
+            "burst_limit": self.burst,
+            "burst_tokens_available": round(
+                await self.backend.get_tokens(f"{self.name}:burst", self.burst, self.refill_per_second, now), 2
+            ),
+            "worker": {"granted": self.granted, "denied": dict(self.denied)}
+        }
+        if user_key:
+            user_calls = await self.backend.get_count(user_key)
+            status["user_calls_made_today"] = user_calls
+            status["user_calls_remaining"] = max(0, self.user_daily_limit - user_calls)
+        return status
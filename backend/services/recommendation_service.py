@@ -0,0 +1,362 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel, ASCENDING
+from models.job import JobRecommendation
+from services.job_vectors import JobVectorIndex, JobVectorizer, job_fields, profile_fields
+from typing import Any, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import heapq
+import tempfile
+import time
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'job_vectors.npz')
+
+# Jobs created this long before the newest indexed job are re-checked on startup, for out-of-order inserts
+CATCH_UP_MARGIN = timedelta(minutes=5)
+
+class RecommendationService:
+    """Top-K job recommendations from an in-process vector index over every discovered job.
+
+    New jobs are encoded and indexed as this worker's JobService writes them;
+    jobs written by other workers are picked up by a catch-up scan every save
+    interval. The index is saved to disk periodically and on shutdown; on startup
+    it is loaded and caught up with jobs created since it was saved, so a restart
+    never re-encodes the whole collection. Every worker keeps and saves its own
+    index, so the file holds whichever copy was saved last. Jobs leave the index
+    once their application deadline has passed. The index is retrained in the
+    background once it has grown 4x.
+    """
+
+    INDEXES = {
+        "jobs": [
+            IndexModel([("created_at", ASCENDING)], name="created_at")
+        ]
+    }
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.jobs
+
+        self.index_path = os.getenv('JOB_VECTOR_INDEX_PATH', DEFAULT_INDEX_PATH)
+        self.save_interval_seconds = float(os.getenv('JOB_VECTOR_SAVE_INTERVAL_SECONDS', '300'))
+        self.train_min_jobs = int(os.getenv('JOB_VECTOR_TRAIN_MIN_JOBS', '10000'))
+
+        self.vectorizer = JobVectorizer()
+        self.index = JobVectorIndex(nprobe=int(os.getenv('JOB_VECTOR_NPROBE', '8')))
+        self.synced_until: Optional[datetime] = None  # created_at of the newest job seen by a catch-up scan
+
+        # Application deadline of every indexed job, and a heap to drop them in deadline order
+        self._deadlines: Dict[str, datetime] = {}
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+
+        self._dirty = False
+        # Adds (and removals, with no vector) made while retraining
+        self._journal: Optional[List[Tuple[str, Optional[np.ndarray]]]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.running = False
+
+        # Counters for observability
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.expired_removed = 0
+        self.last_saved_at: Optional[datetime] = None
+
+    def add_job(self, job_data: Dict[str, Any]):
+        """Encode and index a job that has just been written"""
+        try:
+            deadline = job_data['application_deadline']
+            if deadline <= datetime.utcnow():
+                return
+            vector = self.vectorizer.encode(job_fields(job_data), learn=True)
+            self.index.add(job_data['id'], vector)
+            self._deadlines[job_data['id']] = deadline
+            heapq.heappush(self._expiry_heap, (deadline, job_data['id']))
+            if self._journal is not None:
+                self._journal.append((job_data['id'], vector))
+            self._dirty = True
+        except Exception as e:
+            logger.error(f"Error indexing job {job_data.get('id')} for recommendations: {e}")
+
+    def _remove_expired(self):
+        """Drop jobs whose application deadline has passed"""
+        now = datetime.utcnow()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            deadline, job_id = heapq.heappop(self._expiry_heap)
+            if self._deadlines.get(job_id) != deadline:
+                continue  # Re-indexed since with another deadline
+            del self._deadlines[job_id]
+            self.index.remove(job_id)
+            if self._journal is not None:
+                self._journal.append((job_id, None))
+            self.expired_removed += 1
+            self._dirty = True
+
+    async def start(self):
+        """Load the saved index, catch up with newer jobs and start the save/retrain loop"""
+        if self._task is not None:
+            return
+        try:
+            await self._load()
+        except Exception as e:
+            # Rebuild from the jobs collection rather than serve an empty index
+            logger.error(f"Error loading job vector index from {self.index_path}, rebuilding it: {e}")
+            self.vectorizer = JobVectorizer()
+            self.index = JobVectorIndex(nprobe=self.index.nprobe)
+            self._deadlines, self._expiry_heap = {}, []
+            self.synced_until = None
+        try:
+            self._remove_expired()
+            await self._catch_up()
+            if self._needs_training():
+                await self._retrain()
+        except Exception as e:
+            logger.error(f"Error building job vector index: {e}")
+        self.running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Recommendation index ready with {len(self.index)} jobs")
+
+    async def stop(self):
+        """Stop the loop and save the index"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            await self.save()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.save_interval_seconds)
+            try:
+                self._remove_expired()
+                await self._catch_up()
+                if self._needs_training():
+                    await self._retrain()
+                if self._dirty:
+                    await self.save()
+            except Exception as e:
+                logger.error(f"Error maintaining job vector index: {e}")
+
+    def _needs_training(self) -> bool:
+        size = len(self.index)
+        if not self.index.trained:
+            return size >= self.train_min_jobs
+        return size >= 4 * self.index.trained_size
+
+    async def _retrain(self):
+        """Train a new index off the event loop, then replay the jobs added and removed meanwhile"""
+        frozen = self.index.frozen()
+        self._journal = []
+        try:
+            trained = await asyncio.to_thread(_train, frozen)
+            for job_id, vector in self._journal:
+                if vector is None:
+                    trained.remove(job_id)
+                else:
+                    trained.add(job_id, vector)
+            self.index = trained
+            self._dirty = True
+            logger.info(f"Retrained job vector index: {len(trained)} jobs in {len(trained.centroids)} lists")
+        finally:
+            self._journal = None
+
+    async def save(self):
+        """Write the index to disk; only cheap copies are taken here, the snapshot and write run off the event loop"""
+        frozen = self.index.frozen()
+        deadlines = dict(self._deadlines)
+        state = self.vectorizer.state()
+        if self.synced_until is not None:
+            state["synced_until"] = np.datetime64(self.synced_until, "us")
+        self._dirty = False
+        try:
+            await asyncio.to_thread(self._write, frozen, deadlines, state)
+            self.last_saved_at = datetime.utcnow()
+        except Exception as e:
+            self._dirty = True
+            logger.error(f"Error saving job vector index to {self.index_path}: {e}")
+
+    def _write(self, frozen: JobVectorIndex, deadlines: Dict[str, datetime], state: Dict[str, np.ndarray]):
+        state = {
+            **frozen.state(),
+            "deadline_ids": np.array(list(deadlines), dtype="S"),
+            "deadlines": np.array(list(deadlines.values()), dtype="datetime64[us]"),
+            **state
+        }
+        directory = os.path.dirname(self.index_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # A temporary file of its own, so workers saving at the same time never share one
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                np.savez(file, **state)
+            os.replace(temporary_path, self.index_path)
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+    def _read(self) -> Optional[Dict[str, np.ndarray]]:
+        if not os.path.exists(self.index_path):
+            return None
+        with np.load(self.index_path) as saved:
+            return dict(saved)
+
+    async def _load(self):
+        state = await asyncio.to_thread(self._read)
+        if state is None:
+            logger.info(f"No saved job vector index at {self.index_path}, building from the jobs collection")
+            return
+        if "deadlines" not in state:
+            raise ValueError("saved index has no job deadlines")
+        self.index = await asyncio.to_thread(JobVectorIndex.from_state, state, self.index.nprobe)
+        self.vectorizer.load_state(state)
+        self._deadlines = dict(zip(
+            (job_id.decode() for job_id in state["deadline_ids"]),
+            state["deadlines"].astype("datetime64[us]").tolist()
+        ))
+        self._expiry_heap = [(deadline, job_id) for job_id, deadline in self._deadlines.items()]
+        heapq.heapify(self._expiry_heap)
+        if "synced_until" in state:
+            self.synced_until = state["synced_until"].astype("datetime64[us]").item()
+        logger.info(f"Loaded {len(self.index)} job vectors from {self.index_path}")
+
+    async def _catch_up(self):
+        """Index open jobs created since the last scan, by any worker (every open job when there was none)"""
+        query = {"application_deadline": {"$gt": datetime.utcnow()}}
+        if self.synced_until is not None:
+            query["created_at"] = {"$gte": self.synced_until - CATCH_UP_MARGIN}
+
+        added = 0
+        async for job_data in self.collection.find(
+            query, {"_id": 0, "id": 1, "title": 1, "company": 1, "description": 1, "requirements": 1,
+                    "created_at": 1, "application_deadline": 1}
+        ).sort("created_at", ASCENDING):
+            created_at = job_data.get("created_at")
+            if created_at and (self.synced_until is None or created_at > self.synced_until):
+                self.synced_until = created_at
+            if job_data["id"] in self.index:
+                continue
+            self.add_job(job_data)
+            added += 1
+            if added % 1000 == 0:
+                await asyncio.sleep(0)
+        if added:
+            logger.info(f"Indexed {added} jobs written since the last job vector index scan")
+
+    async def _interview_vector(self, job_ids: List[str]) -> Optional[np.ndarray]:
+        """Mean vector of the jobs a user got interviews for"""
+        vectors = [vector for vector in (self.index.get(job_id) for job_id in job_ids) if vector is not None]
+        missing = [job_id for job_id in job_ids if job_id not in self.index]
+        if missing:
+            async for job_data in self.collection.find(
+                {"id": {"$in": missing}},
+                {"_id": 0, "title": 1, "company": 1, "description": 1, "requirements": 1}
+            ):
+                vectors.append(self.vectorizer.encode(job_fields(job_data)))
+        return _unit(np.mean(vectors, axis=0)) if vectors else None
+
+    async def recommend(self, user_id: str, k: int = 20, basis: str = "auto",
+                        active_only: bool = True) -> Optional[Dict[str, Any]]:
+        """Get the k jobs closest to a user's profile and/or the jobs they got interviews for.
+
+        basis is "profile", "interviews" or "auto" (both, when the user has any
+        interviews). Jobs the user already applied to are skipped. Returns None
+        for an unknown user.
+        """
+        try:
+            self._remove_expired()
+            profile = await self.db.user_profiles.find_one(
+                {"id": user_id}, {"_id": 0, "skills": 1, "experience": 1, "certifications": 1}
+            )
+            if profile is None:
+                return None
+
+            applied: Set[str] = set()
+            interviewed: List[str] = []
+            async for application in self.db.applications.find(
+                {"user_id": user_id}, {"_id": 0, "job_id": 1, "status": 1, "response.type": 1}
+            ):
+                applied.add(application["job_id"])
+                response_type = (application.get("response") or {}).get("type")
+                if application.get("status") == "interview_scheduled" or response_type == "interview_request":
+                    interviewed.append(application["job_id"])
+
+            profile_vector = self.vectorizer.encode(profile_fields(profile))
+            interview_vector = await self._interview_vector(interviewed) if basis != "profile" else None
+            if interview_vector is None:
+                # Without interviews every basis falls back to the profile
+                query, used_basis = profile_vector, "profile"
+            elif basis == "interviews":
+                query, used_basis = interview_vector, "interviews"
+            else:
+                query, used_basis = _unit(profile_vector + interview_vector), "profile+interviews"
+
+            started = time.perf_counter()
+            recommendations = await self._top_jobs(query, k, applied, active_only) if query.any() else []
+            self.queries += 1
+            self.query_seconds += time.perf_counter() - started
+
+            return {"user_id": user_id, "basis": used_basis, "recommendations": recommendations}
+        except Exception as e:
+            logger.error(f"Error recommending jobs for user {user_id}: {e}")
+            raise
+
+    async def _top_jobs(self, query: np.ndarray, k: int, exclude: Set[str],
+                        active_only: bool) -> List[JobRecommendation]:
+        """Nearest jobs from the index, widening the candidate pool when inactive jobs crowd out active ones"""
+        pool = k * 4 if active_only else k
+        fields = {field: 1 for field in JobRecommendation.model_fields if field != "similarity"}
+        while True:
+            candidates = self.index.search(query, pool, exclude)
+            documents = {}
+            job_filter = {"id": {"$in": [job_id for job_id, _ in candidates]}}
+            if active_only:
+                job_filter["status"] = "monitoring"
+            async for job_data in self.collection.find(job_filter, {"_id": 0, **fields}):
+                documents[job_data["id"]] = job_data
+
+            recommendations = [
+                JobRecommendation(**documents[job_id], similarity=round(similarity, 4))
+                for job_id, similarity in candidates if job_id in documents
+            ][:k]
+            if len(recommendations) >= k or len(candidates) < pool or pool >= k * 64:
+                return recommendations
+            pool *= 4
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size, training state and query latency"""
+        return {
+            "running": self.running,
+            "indexed_jobs": len(self.index),
+            "lists": len(self.index.centroids) if self.index.trained else 1,
+            "trained_size": self.index.trained_size,
+            "nprobe": self.index.nprobe,
+            "vectorized_documents": self.vectorizer.documents,
+            "synced_until": self.synced_until.isoformat() if self.synced_until else None,
+            "index_path": self.index_path,
+            "last_saved_at": self.last_saved_at.isoformat() if self.last_saved_at else None,
+            "unsaved_changes": self._dirty,
+            "expired_removed": self.expired_removed,
+            "queries": self.queries,
+            "avg_query_ms": round(self.query_seconds / self.queries * 1000, 2) if self.queries else 0.0
+        }
+
+def _train(frozen: JobVectorIndex) -> JobVectorIndex:
+    ids, vectors, _ = frozen.snapshot()
+    return JobVectorIndex.build_trained(ids, vectors, frozen.nprobe)
+
+def _unit(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    return (vector / norm).astype(np.float32) if norm > 0 else vector.astype(np.float32)
@@ -0,0 +1,337 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+from services.ttl_cache import TTLCache
+import asyncio
+import copy
+import io
+import re
+import zipfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+RESUME_PARSER_WORKERS = int(os.environ.get('RESUME_PARSER_WORKERS', str(min(4, os.cpu_count() or 1))))
+RESUME_PARSE_CACHE_TTL_SECONDS = float(os.environ.get('RESUME_PARSE_CACHE_TTL_SECONDS', str(24 * 60 * 60)))
+RESUME_PARSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_PARSE_CACHE_MAX_ENTRIES', '1000'))
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+SECTION_HEADINGS = {
+    "experience": {"experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "relevant experience", "career history"},
+    "education": {"education", "academic background", "education and training", "academics"},
+    "skills": {"skills", "technical skills", "core competencies", "key skills", "competencies",
+               "skills and tools", "skills & tools", "technologies", "areas of expertise"},
+    "certifications": {"certifications", "certificates", "licenses and certifications",
+                       "licenses & certifications", "certifications and training"},
+    "other": {"summary", "professional summary", "profile", "objective", "about", "about me", "projects",
+              "awards", "honors", "publications", "volunteer", "volunteering", "interests", "languages",
+              "references", "achievements"}
+}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+MONTH_PATTERN = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+                 r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+DATE_PATTERN = rf"(?:{MONTH_PATTERN}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|\d{{4}}-\d{{2}}|\d{{4}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{DATE_PATTERN})\s*(?:-|–|—|to)\s*(?P<end>{DATE_PATTERN}|present|current|now)",
+    re.IGNORECASE
+)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?", re.IGNORECASE)
+LOCATION_RE = re.compile(r"\b[A-Z][a-zA-Z .]+,\s*[A-Z]{2}\b(?:\s+\d{5})?")
+DEGREE_RE = re.compile(
+    r"\b(?:ph\.?\s?d|m\.?b\.?a|m\.?s|b\.?s|b\.?a|m\.?a|b\.?tech|m\.?tech|b\.?e|m\.?eng|b\.?sc|m\.?sc"
+    r"|bachelor(?:'s)?|master(?:'s)?|doctor(?:ate)?|associate(?:'s)?)\b",
+    re.IGNORECASE
+)
+SCHOOL_RE = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic)\b", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+BULLET_RE = re.compile(r"^[\s•·▪◦‣\-*–]+")
+FIELD_SEPARATOR_RE = re.compile(r"\s*(?:\||;|,|\s[–—-]\s)\s*")
+TITLE_COMPANY_SEPARATORS = [" at ", " | ", " — ", " – ", " - ", ", "]
+SKILL_SEPARATOR_RE = re.compile(r"\s*[,;|•·▪•]\s*")
+
+# Text extraction
+
+def detect_format(data: bytes, filename: str = "") -> str:
+    """Identify a resume as pdf, docx or doc from its magic bytes, falling back to the extension"""
+    if data.startswith(b"%PDF"):
+        return "pdf"
+    if data.startswith(b"PK\x03\x04"):
+        return "docx"
+    if data.startswith(b"\xd0\xcf\x11\xe0"):
+        return "doc"
+    return filename.lower().rsplit('.', 1)[-1] if '.' in filename else ""
+
+def _extract_pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+def _extract_docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    paragraphs = []
+    for paragraph in root.iter(f"{WORD_NAMESPACE}p"):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f"{WORD_NAMESPACE}t" and node.text:
+                parts.append(node.text)
+            elif node.tag == f"{WORD_NAMESPACE}tab":
+                parts.append("\t")
+            elif node.tag == f"{WORD_NAMESPACE}br":
+                parts.append("\n")
+        paragraphs.append("".join(parts))
+    return "\n".join(paragraphs)
+
+def _extract_doc_text(data: bytes) -> str:
+    # Legacy Word binaries store body text as runs of UTF-16LE or 8-bit characters
+    runs = re.findall(rb"(?:[\x20-\x7e]\x00){4,}", data)
+    if runs:
+        return "\n".join(run.decode("utf-16-le") for run in runs)
+    return "\n".join(run.decode("latin-1") for run in re.findall(rb"[\x20-\x7e\t]{4,}", data))
+
+def extract_text(data: bytes, filename: str = "") -> str:
+    """Extract plain text from a PDF, DOCX or DOC resume"""
+    file_format = detect_format(data, filename)
+    if file_format == "pdf":
+        return _extract_pdf_text(data)
+    if file_format == "docx":
+        return _extract_docx_text(data)
+    if file_format == "doc":
+        return _extract_doc_text(data)
+    raise ValueError(f"Unsupported resume format: {file_format or 'unknown'}")
+
+# Section parsing
+
+def _clean(line: str) -> str:
+    return re.sub(r"\s+", " ", BULLET_RE.sub("", line)).strip()
+
+def _heading(line: str) -> Optional[str]:
+    normalized = re.sub(r"\s+", " ", line.strip().rstrip(':').lower())
+    if not normalized or len(normalized) > 40:
+        return None
+    for section, headings in SECTION_HEADINGS.items():
+        if normalized in headings:
+            return section
+    return None
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Group non-empty lines under the section heading they follow; lines before any heading go to 'header'"""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for raw_line in text.splitlines():
+        if not raw_line.strip():
+            continue
+        section = _heading(raw_line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+        else:
+            sections.setdefault(current, []).append(raw_line)
+    return sections
+
+def _normalize_date(value: str, end: bool = False) -> str:
+    value = value.strip().lower().rstrip('.')
+    if value in ("present", "current", "now"):
+        return "present"
+    match = re.match(r"([a-z]+)\.?\s+(\d{4})", value)
+    if match:
+        return f"{match.group(2)}-{MONTHS.get(match.group(1)[:3], 1):02d}"
+    match = re.match(r"(\d{1,2})/(\d{4})", value)
+    if match:
+        return f"{match.group(2)}-{int(match.group(1)):02d}"
+    if re.fullmatch(r"\d{4}-\d{2}", value):
+        return value
+    return f"{value}-12" if end else f"{value}-01"
+
+def _split_title_company(text: str) -> Tuple[str, str]:
+    for separator in TITLE_COMPANY_SEPARATORS:
+        if separator in text:
+            title, company = text.split(separator, 1)
+            return title.strip(), company.strip()
+    return text.strip(), ""
+
+def _is_bullet(line: str) -> bool:
+    return bool(re.match(r"^\s*[•·▪◦‣\-*–]", line))
+
+def parse_personal_info(lines: List[str]) -> Dict[str, str]:
+    """Pull name and contact details out of the lines above the first section"""
+    text = "\n".join(lines)
+    info: Dict[str, str] = {}
+    for line in lines:
+        candidate = _clean(line)
+        if (candidate and not any(char.isdigit() for char in candidate) and '@' not in candidate
+                and len(candidate.split()) <= 5 and not LINKEDIN_RE.search(candidate)):
+            info["full_name"] = candidate.title() if candidate.isupper() else candidate
+            break
+
+    email = EMAIL_RE.search(text)
+    if email:
+        info["email"] = email.group(0)
+    linkedin = LINKEDIN_RE.search(text)
+    if linkedin:
+        url = linkedin.group(0)
+        info["linkedin_url"] = url if url.lower().startswith("http") else f"https://{url}"
+    phone = PHONE_RE.search(LINKEDIN_RE.sub("", text))
+    if phone and sum(char.isdigit() for char in phone.group(0)) >= 10:
+        info["phone"] = phone.group(0).strip()
+    location = LOCATION_RE.search(EMAIL_RE.sub("", text))
+    if location:
+        info["location"] = location.group(0).strip()
+    return info
+
+def parse_experience(lines: List[str]) -> List[Dict[str, str]]:
+    """Find roles by their date ranges; the title and company come from the same or preceding lines"""
+    date_rows = [(index, DATE_RANGE_RE.search(line)) for index, line in enumerate(lines)]
+    date_rows = [(index, match) for index, match in date_rows if match]
+
+    entries = []
+    starts = []
+    previous_index = -1
+    for index, match in date_rows:
+        line = lines[index]
+        head = _clean((line[:match.start()] + " " + line[match.end():]).strip(" |,()\t-–—"))
+        head = head.strip(" |,-–—")
+        header_start = index
+
+        # Plain (non-bullet) lines directly above the date line belong to this role's header
+        above = []
+        cursor = index - 1
+        while cursor > previous_index and len(above) < 2 and not _is_bullet(lines[cursor]):
+            above.insert(0, _clean(lines[cursor]))
+            cursor -= 1
+
+        title, company = _split_title_company(head) if head else ("", "")
+        if head and not company and above:
+            title, company = above[-1], head
+            header_start = index - 1
+        elif not head and len(above) >= 2:
+            title, company = above[-2], above[-1]
+            header_start = index - 2
+        elif not head and above:
+            title, company = _split_title_company(above[-1])
+            header_start = index - 1
+
+        starts.append(header_start)
+        entries.append({
+            "title": title,
+            "company": company,
+            "start_date": _normalize_date(match.group("start")),
+            "end_date": _normalize_date(match.group("end"), end=True),
+            "description": ""
+        })
+        previous_index = index
+
+    for position, (index, _) in enumerate(date_rows):
+        stop = starts[position + 1] if position + 1 < len(starts) else len(lines)
+        description = [_clean(line) for line in lines[index + 1:stop]]
+        entries[position]["description"] = " ".join(line for line in description if line)
+    return [entry for entry in entries if entry["title"] or entry["company"]]
+
+def parse_education(lines: List[str]) -> List[Dict[str, str]]:
+    """Find degrees and pair them with a school and graduation year from the same or adjacent lines"""
+    entries = []
+    for index, line in enumerate(lines):
+        if not DEGREE_RE.search(line):
+            continue
+        neighbours = [line] + [lines[i] for i in (index + 1, index - 1) if 0 <= i < len(lines)]
+        segments = [_clean(segment) for segment in FIELD_SEPARATOR_RE.split(line) if _clean(segment)]
+
+        degree = next((segment for segment in segments if DEGREE_RE.search(segment)), _clean(line))
+        degree = YEAR_RE.sub("", degree).strip(" ,()-–—")
+        school = next((segment for segment in segments if SCHOOL_RE.search(segment) and segment != degree), "")
+        if not school:
+            for neighbour in neighbours[1:]:
+                if SCHOOL_RE.search(neighbour) and not DEGREE_RE.search(neighbour):
+                    school = YEAR_RE.sub("", _clean(neighbour)).strip(" ,()-–—")
+                    break
+        # Prefer a year on the degree line, then the line below, then the line above
+        years = next((YEAR_RE.findall(text) for text in neighbours if YEAR_RE.search(text)), [])
+        entries.append({
+            "degree": degree,
+            "school": school,
+            "graduation_year": max(years) if years else ""
+        })
+    return entries
+
+def parse_skills(lines: List[str]) -> List[str]:
+    """Split skill lists on commas, bullets and pipes, dropping category labels"""
+    skills = []
+    seen = set()
+    for line in lines:
+        text = _clean(line)
+        label, _, rest = text.partition(':')
+        if rest and len(label.split()) <= 3:
+            text = rest
+        for skill in SKILL_SEPARATOR_RE.split(text):
+            skill = skill.strip(" .")
+            key = skill.casefold()
+            if skill and len(skill) <= 40 and len(skill.split()) <= 5 and key not in seen:
+                seen.add(key)
+                skills.append(skill)
+    return skills
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """Turn extracted resume text into profile fields"""
+    sections = split_sections(text)
+    return {
+        "personal_info": parse_personal_info(sections.get("header", [])),
+        "experience": parse_experience(sections.get("experience", [])),
+        "education": parse_education(sections.get("education", [])),
+        "skills": parse_skills(sections.get("skills", [])),
+        "certifications": [_clean(line) for line in sections.get("certifications", []) if _clean(line)]
+    }
+
+def parse_resume(data: bytes, filename: str = "") -> Dict[str, Any]:
+    """Extract and parse a resume file; runs inside the worker processes"""
+    return parse_resume_text(extract_text(data, filename))
+
+class ResumeParser:
+    """Parses resumes in a process pool, caching results by content hash.
+
+    Parsing is CPU-bound, so it runs in worker processes and never blocks the
+    event loop. A re-upload of the same file is served from the cache, and
+    concurrent uploads of the same file share one parse.
+    """
+
+    def __init__(self, max_workers: int = RESUME_PARSER_WORKERS):
+        self.max_workers = max_workers
+        self.cache = TTLCache(RESUME_PARSE_CACHE_TTL_SECONDS, RESUME_PARSE_CACHE_MAX_ENTRIES)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def parse(self, file: BinaryIO, filename: str, sha256: str) -> Dict[str, Any]:
+        """Parse an uploaded resume, reusing the cached result for identical content"""
+        async def compute():
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(None, file.read)
+            return await loop.run_in_executor(self._get_pool(), parse_resume, data, filename)
+
+        # Callers merge the result into profiles, so never hand out the cached objects
+        return copy.deepcopy(await self.cache.get_or_compute(sha256, compute))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool size and parse cache counters"""
+        return {"workers": self.max_workers, "cache": self.cache.get_stats()}
+
+    def close(self):
+        """Shut the worker processes down"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
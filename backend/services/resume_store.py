@@ -0,0 +1,139 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+from pymongo import IndexModel, ASCENDING
+from pymongo.errors import DuplicateKeyError
+from gridfs.errors import FileExists, NoFile
+from bson import ObjectId
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional, Set, Tuple
+import asyncio
+import base64
+import binascii
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 255 * 1024
+
+class ResumeTooLarge(ValueError):
+    pass
+
+def decode_base64_file(value: str) -> Tuple[bytes, Optional[str]]:
+    """Decode a base64 string or data: URL into (bytes, content type)"""
+    content_type = None
+    if value.startswith("data:") and "," in value:
+        header, value = value.split(",", 1)
+        content_type = header[len("data:"):].split(";")[0] or None
+    try:
+        return base64.b64decode(value, validate=True), content_type
+    except (binascii.Error, ValueError):
+        raise ValueError("Resume is not valid base64")
+
+class ResumeStore:
+    """Content-addressed resume storage in the `resumes` GridFS bucket.
+
+    Files are keyed by the SHA-256 of their bytes, so a resume shared by several
+    profiles or applications is stored once and documents keep only the hash.
+    """
+
+    INDEXES = {
+        "resumes.files": [
+            IndexModel([("sha256", ASCENDING)], name="sha256", unique=True)
+        ]
+    }
+
+    def __init__(self, db: AsyncIOMotorDatabase, bucket_name: str = "resumes"):
+        self.db = db
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name, chunk_size_bytes=CHUNK_SIZE)
+        self.files = db[f"{bucket_name}.files"]
+
+    async def exists(self, sha256: str) -> bool:
+        """Check whether a resume with this content hash is stored"""
+        return await self.files.find_one({"sha256": sha256}, {"_id": 1}) is not None
+
+    async def save_stream(self, chunks: AsyncIterable[bytes], filename: Optional[str] = None,
+                          content_type: Optional[str] = None, max_bytes: Optional[int] = None) -> str:
+        """Stream a resume into GridFS, hashing as it goes; returns its SHA-256.
+
+        Raises ResumeTooLarge as soon as more than max_bytes have been read.
+        """
+        file_id = ObjectId()
+        grid_in = self.bucket.open_upload_stream_with_id(
+            file_id, filename or "resume", metadata={"content_type": content_type}
+        )
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise ResumeTooLarge(f"Resume exceeds the {max_bytes} byte limit")
+                digest.update(chunk)
+                await grid_in.write(chunk)
+        except (Exception, asyncio.CancelledError):
+            await grid_in.abort()
+            raise
+
+        sha256 = digest.hexdigest()
+        if await self.exists(sha256):
+            await grid_in.abort()
+            return sha256
+
+        await grid_in.set("sha256", sha256)
+        try:
+            await grid_in.close()
+        except (FileExists, DuplicateKeyError):
+            # A concurrent upload of the same bytes won; drop our chunks and share its copy
+            try:
+                await self.bucket.delete(file_id)
+            except NoFile:
+                pass
+            return sha256
+
+        logger.info(f"Stored resume {sha256} ({size} bytes)")
+        return sha256
+
+    async def save_bytes(self, data: bytes, filename: Optional[str] = None,
+                         content_type: Optional[str] = None) -> str:
+        """Store an in-memory resume; returns its SHA-256"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        if await self.exists(sha256):
+            return sha256
+        return await self.save_stream(_iter_chunks(data), filename, content_type)
+
+    async def save_base64(self, value: str, filename: Optional[str] = None) -> str:
+        """Store a base64-encoded resume (plain or data: URL); returns its SHA-256"""
+        data, content_type = decode_base64_file(value)
+        return await self.save_bytes(data, filename, content_type)
+
+    async def open(self, sha256: str):
+        """Open a stored resume for reading; returns None if it does not exist"""
+        file_doc = await self.files.find_one({"sha256": sha256}, {"_id": 1})
+        if not file_doc:
+            return None
+        return await self.bucket.open_download_stream(file_doc["_id"])
+
+    async def iter_chunks(self, grid_out) -> AsyncIterator[bytes]:
+        """Yield a resume chunk by chunk"""
+        while True:
+            chunk = await grid_out.readchunk()
+            if not chunk:
+                break
+            yield chunk
+
+    async def delete_unreferenced(self, referenced: Iterable[str]) -> int:
+        """Delete stored resumes whose hash is not in referenced"""
+        keep: Set[str] = set(referenced)
+        deleted = 0
+        async for file_doc in self.files.find({}, {"_id": 1, "sha256": 1}):
+            if file_doc.get("sha256") not in keep:
+                await self.bucket.delete(file_doc["_id"])
+                deleted += 1
+        return deleted
+
+async def _iter_chunks(data: bytes) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), CHUNK_SIZE):
+        yield data[start:start + CHUNK_SIZE]
@@ -0,0 +1,119 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import OrderedDict
+from typing import Any, Dict, List
+import hashlib
+import threading
+import time
+import logging
+
+import jwt
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '10000'))
+REVOCATION_SYNC_SECONDS = float(os.environ.get('REVOCATION_SYNC_SECONDS', '1'))
+
+class TokenRevoked(jwt.InvalidTokenError):
+    pass
+
+class TokenVerifier:
+    """Verifies JWTs, caching the verified claims until the token's exp.
+
+    A cache hit skips the signature check entirely. Revoked tokens are kept in a
+    denylist until they would have expired anyway; when a store is given, the
+    denylist is written to it and other workers pick new entries up within
+    REVOCATION_SYNC_SECONDS.
+    """
+
+    def __init__(self, secret_key: str, algorithms: List[str], store=None,
+                 max_entries: int = TOKEN_CACHE_MAX_ENTRIES, sync_seconds: float = REVOCATION_SYNC_SECONDS):
+        self.secret_key = secret_key
+        self.algorithms = algorithms
+        self.store = store
+        self.max_entries = max_entries
+        self.sync_seconds = sync_seconds
+
+        self._claims: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._revocation_cursor = 0
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    @staticmethod
+    def token_id(token: str, claims: Dict[str, Any]) -> str:
+        """The jti claim, or a hash of the token for tokens issued without one"""
+        return claims.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims; raises jwt.PyJWTError if it is invalid, expired or revoked"""
+        now = time.time()
+        self._sync_revocations(now)
+
+        with self._lock:
+            claims = self._claims.get(token)
+            if claims is not None and claims["exp"] > now:
+                self._claims.move_to_end(token)
+                self.hits += 1
+            elif claims is not None:
+                del self._claims[token]
+                claims = None
+
+        if claims is None:
+            claims = jwt.decode(token, self.secret_key, algorithms=self.algorithms, options={"require": ["exp"]})
+            with self._lock:
+                self.misses += 1
+                self._claims[token] = claims
+                while len(self._claims) > self.max_entries:
+                    self._claims.popitem(last=False)
+
+        if self.token_id(token, claims) in self._revoked:
+            self.rejected += 1
+            raise TokenRevoked("Token has been revoked")
+        return claims
+
+    def revoke(self, token: str):
+        """Deny a token until it expires; raises jwt.PyJWTError if it is not currently valid"""
+        claims = self.verify(token)
+        token_id = self.token_id(token, claims)
+        with self._lock:
+            self._revoked[token_id] = claims["exp"]
+            self._claims.pop(token, None)
+        if self.store is not None:
+            self.store.revoke_token(token_id, claims["exp"])
+            self.store.prune_revoked_tokens(time.time())
+
+    def _sync_revocations(self, now: float):
+        """Pull revocations made by other workers, at most once per sync interval"""
+        if self.store is None or now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_seconds
+        try:
+            entries, cursor = self.store.get_revoked_tokens_since(self._revocation_cursor)
+        except Exception as e:
+            logger.error(f"Error syncing token revocations: {e}")
+            return
+        with self._lock:
+            self._revocation_cursor = cursor
+            for token_id, expires_at in entries:
+                self._revoked[token_id] = expires_at
+            for token_id in [token_id for token_id, expires_at in self._revoked.items() if expires_at <= now]:
+                del self._revoked[token_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and denylist counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._claims),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups > 0 else 0.0,
+            "revoked": len(self._revoked),
+            "rejected": self.rejected
+        }
@@ -0,0 +1,121 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TTLCache:
+    """Bounded async TTL cache with single-flight recomputation.
+
+    Concurrent misses on the same key share one call to the factory instead of
+    stampeding the backend. Invalidating a key while it is being recomputed
+    discards that in-flight result so stale data is never stored. Optionally,
+    recently expired entries are served while they are refreshed in the background.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000, stale_seconds: float = 0):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._stale: Set[Hashable] = set()
+        self._refreshes: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, computing it once if missing or expired.
+
+        With stale_seconds set, an entry that expired less than stale_seconds ago
+        is returned as-is while a single background refresh replaces it.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry[0] + self.stale_seconds > now:
+                self.stale_hits += 1
+                if key not in self._in_flight:
+                    task = asyncio.ensure_future(self._refresh(key, factory))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refreshes.discard)
+                return entry[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(in_flight)
+
+        self.misses += 1
+        return await self._compute(key, factory)
+
+    async def _refresh(self, key: Hashable, factory: Callable[[], Awaitable[Any]]):
+        try:
+            await self._compute(key, factory)
+        except Exception as e:
+            logger.warning(f"Background refresh of {key!r} failed, keeping stale entry: {e}")
+
+    async def _compute(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited failure is not logged twice
+            raise
+        else:
+            if key not in self._stale:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+            self._stale.discard(key)
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value with a fresh TTL"""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """Drop a key, including any recomputation currently in flight"""
+        self._entries.pop(key, None)
+        if key in self._in_flight:
+            self._stale.add(key)
+        self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        served = self.hits + self.stale_hits + self.coalesced
+        lookups = served + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": round(served / lookups * 100, 1) if lookups > 0 else 0.0,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds
+        }
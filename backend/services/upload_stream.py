@@ -0,0 +1,166 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.requests import Request
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import hashlib
+import logging
+
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+logger = logging.getLogger(__name__)
+
+# Uploads stay in memory up to this size, then spill to a temp file
+SPOOL_MAX_BYTES = 1024 * 1024
+
+# Allowance for multipart boundaries, part headers and small form fields
+MULTIPART_OVERHEAD_BYTES = 16 * 1024
+
+class InvalidUpload(ValueError):
+    pass
+
+class UploadTooLarge(ValueError):
+    pass
+
+class StreamedUpload:
+    """A file received from a multipart body, spooled to disk past SPOOL_MAX_BYTES"""
+
+    def __init__(self, filename: str, content_type: Optional[str], spool_bytes: int = SPOOL_MAX_BYTES):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self.file = SpooledTemporaryFile(max_size=spool_bytes)
+        self._digest = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def write(self, pieces: Iterable[bytes]):
+        for piece in pieces:
+            self._digest.update(piece)
+            self.file.write(piece)
+
+    def close(self):
+        self.file.close()
+
+class _FileFieldParser:
+    """Feeds one multipart file field into a StreamedUpload, enforcing the size limit per chunk"""
+
+    def __init__(self, boundary: bytes, field_name: str, max_bytes: int,
+                 allowed_extensions: Optional[Iterable[str]] = None):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.allowed_extensions = tuple(allowed_extensions) if allowed_extensions else None
+        self.upload: Optional[StreamedUpload] = None
+        self.pending: List[bytes] = []
+
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+        self.complete = False
+        self.parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_end": self.on_end
+        })
+
+    def on_part_begin(self):
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        self._in_file = name == self.field_name and b"filename" in options and self.upload is None
+        if not self._in_file:
+            return
+
+        filename = options[b"filename"].decode("utf-8", errors="replace")
+        if self.allowed_extensions and not filename.lower().endswith(self.allowed_extensions):
+            raise InvalidUpload(f"Only {', '.join(self.allowed_extensions)} files are allowed")
+        content_type = self._headers.get(b"content-type", b"").decode("latin-1") or None
+        self.upload = StreamedUpload(filename, content_type)
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file:
+            return
+        self.upload.size += end - start
+        if self.upload.size > self.max_bytes:
+            raise UploadTooLarge(f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)}MB")
+        self.pending.append(data[start:end])
+
+    def on_part_end(self):
+        self._in_file = False
+
+    def on_end(self):
+        self.complete = True
+
+async def receive_upload(request: Request, field_name: str, max_bytes: int,
+                         allowed_extensions: Optional[Iterable[str]] = None) -> StreamedUpload:
+    """Stream one file field of a multipart/form-data request into a spooled temp file.
+
+    The size limit is checked as each network chunk arrives, so an oversized upload
+    is rejected without reading the rest of the body. The caller must close() the
+    returned upload.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise InvalidUpload("Expected a multipart/form-data upload")
+
+    declared_length = request.headers.get("content-length", "")
+    if declared_length.isdigit() and int(declared_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise UploadTooLarge(f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB")
+
+    field_parser = _FileFieldParser(params[b"boundary"], field_name, max_bytes, allowed_extensions)
+    loop = asyncio.get_running_loop()
+    try:
+        async for chunk in request.stream():
+            field_parser.parser.write(chunk)
+            if field_parser.pending:
+                pieces, field_parser.pending = field_parser.pending, []
+                upload = field_parser.upload
+                if getattr(upload.file, "_rolled", False):
+                    # Spilled to disk: keep file I/O off the event loop
+                    await loop.run_in_executor(None, upload.write, pieces)
+                else:
+                    upload.write(pieces)
+        field_parser.parser.finalize()
+        # finalize() does not check that the closing boundary arrived
+        if not field_parser.complete:
+            raise InvalidUpload("Incomplete multipart body")
+    except BaseException as e:
+        if field_parser.upload:
+            field_parser.upload.close()
+        if isinstance(e, MultipartParseError):
+            raise InvalidUpload(f"Malformed multipart body: {e}") from e
+        raise
+
+    if field_parser.upload is None:
+        raise InvalidUpload(f"No file uploaded in field '{field_name}'")
+    field_parser.upload.file.seek(0)
+    return field_parser.upload
@@ -3,22 +3,36 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from models.user import UserProfile, UserProfileCreate, UserProfileUpdate
-from typing import Optional, List
+from pymongo import IndexModel, ASCENDING
+from models.user import UserProfile, UserProfileCreate, UserProfileUpdate, UserProfileSummary
+from services.pagination import fetch_page
+from services.resume_store import ResumeStore
+from typing import Optional, List, Tuple, Any
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 class UserService:
+    INDEXES = {
+        "user_profiles": [
+            IndexModel([("id", ASCENDING)], name="id")
+        ]
+    }
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.user_profiles
+        self.resume_store = ResumeStore(db)
 
     async def create_user_profile(self, profile_data: UserProfileCreate) -> UserProfile:
         """Create a new user profile"""
         try:
-            profile = UserProfile(**profile_data.dict())
+            data = profile_data.dict()
+            resume_base64 = data.pop('resume_base64', None)
+            profile = UserProfile(**data)
+            if resume_base64:
+                profile.resume_id = await self.resume_store.save_base64(resume_base64)
             result = await self.collection.insert_one(profile.dict())
             profile.id = str(result.inserted_id) if result.inserted_id else profile.id
             logger.info(f"Created user profile: {profile.id}")
@@ -43,6 +57,9 @@ class UserService:
         """Update user profile"""
         try:
             update_dict = {k: v for k, v in update_data.dict(exclude_unset=True).items() if v is not None}
+            resume_base64 = update_dict.pop('resume_base64', None)
+            if resume_base64:
+                update_dict['resume_id'] = await self.resume_store.save_base64(resume_base64)
             update_dict['updated_at'] = datetime.utcnow()
             
             result = await self.collection.update_one(
@@ -57,6 +74,18 @@ class UserService:
             logger.error(f"Error updating user profile {user_id}: {e}")
             raise
 
+    async def set_resume(self, user_id: str, resume_id: str) -> bool:
+        """Point a user profile at a stored resume"""
+        try:
+            result = await self.collection.update_one(
+                {"id": user_id},
+                {"$set": {"resume_id": resume_id, "updated_at": datetime.utcnow()}}
+            )
+            return result.matched_count > 0
+        except Exception as e:
+            logger.error(f"Error setting resume for user {user_id}: {e}")
+            raise
+
     async def delete_user_profile(self, user_id: str) -> bool:
         """Delete user profile"""
         try:
@@ -76,4 +105,13 @@ class UserService:
             return profiles
         except Exception as e:
             logger.error(f"Error listing user profiles: {e}")
+            raise
+
+    async def list_user_profiles_page(self, limit: int, cursor: Optional[str] = None,
+                                      fields: Optional[List[str]] = None) -> Tuple[List[Any], Optional[str]]:
+        """Get one keyset-paginated page of user profiles, in insertion order"""
+        try:
+            return await fetch_page(self.collection, {}, [("_id", 1)], limit, cursor, fields, UserProfileSummary)
+        except Exception as e:
+            logger.error(f"Error listing user profiles page: {e}")
             raise
\ No newline at end of file
@@ -0,0 +1,222 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class UserExists(ValueError):
+    pass
+
+def _email_key(user: Dict[str, Any]) -> str:
+    return normalize_email(user["personal_info"]["email"])
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+class UserStore(ABC):
+    """Account storage for the demo server, looked up by id or by email.
+
+    Users are plain dicts; callers that change one in place must save() it.
+    """
+
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def create(self, user: Dict[str, Any]) -> None:
+        """Insert a new user; raises UserExists if the id or email is taken"""
+
+    def create_many(self, users: Iterable[Dict[str, Any]]) -> None:
+        """Insert many users at once; raises UserExists if any id or email is taken"""
+        for user in users:
+            self.create(user)
+
+    @abstractmethod
+    def save(self, user: Dict[str, Any]) -> None:
+        """Persist changes to an existing user"""
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        """Add a token to the shared denylist"""
+
+    @abstractmethod
+    def get_revoked_tokens_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        """Get (token_id, expires_at) pairs revoked after cursor, and the new cursor"""
+
+    @abstractmethod
+    def prune_revoked_tokens(self, now: float) -> None:
+        """Forget revocations of tokens that have expired anyway"""
+
+    def close(self) -> None:
+        pass
+
+class InMemoryUserStore(UserStore):
+    """Process-local store with a dict index on email; state is lost on restart"""
+
+    def __init__(self):
+        self._users: Dict[str, Dict[str, Any]] = {}
+        self._ids_by_email: Dict[str, str] = {}
+        self._revocations: List[Tuple[str, float]] = []
+        self._revocation_offset = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._users.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        user_id = self._ids_by_email.get(normalize_email(email))
+        return self._users.get(user_id) if user_id else None
+
+    def create(self, user: Dict[str, Any]) -> None:
+        email_key = _email_key(user)
+        if user["id"] in self._users or email_key in self._ids_by_email:
+            raise UserExists("Email already registered")
+        self._users[user["id"]] = user
+        self._ids_by_email[email_key] = user["id"]
+
+    def save(self, user: Dict[str, Any]) -> None:
+        owner = self._ids_by_email.get(_email_key(user))
+        if owner is not None and owner != user["id"]:
+            raise UserExists("Email already registered")
+        previous = self._users.get(user["id"])
+        if previous is not None:
+            self._ids_by_email.pop(_email_key(previous), None)
+        self._users[user["id"]] = user
+        self._ids_by_email[_email_key(user)] = user["id"]
+
+    def count(self) -> int:
+        return len(self._users)
+
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        self._revocations.append((token_id, expires_at))
+
+    def get_revoked_tokens_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        start = max(cursor - self._revocation_offset, 0)
+        return self._revocations[start:], self._revocation_offset + len(self._revocations)
+
+    def prune_revoked_tokens(self, now: float) -> None:
+        # Entries are only dropped from the front so cursors stay valid
+        while self._revocations and self._revocations[0][1] <= now:
+            self._revocations.pop(0)
+            self._revocation_offset += 1
+
+class SQLiteUserStore(UserStore):
+    """On-disk store: one row per user with a unique index on the normalized email.
+
+    Runs in WAL mode, so several uvicorn workers can open the same file: readers
+    never block, and writers wait up to busy_timeout for each other. Lookups are
+    B-tree index probes and stay sub-millisecond as the table grows.
+    """
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS users ("
+            " id TEXT PRIMARY KEY,"
+            " email TEXT NOT NULL UNIQUE,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " token_id TEXT NOT NULL UNIQUE,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS revoked_tokens_expires_at ON revoked_tokens (expires_at)")
+
+    def _load(self, row) -> Optional[Dict[str, Any]]:
+        return json.loads(row[0]) if row else None
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM users WHERE id = ?", (user_id,)).fetchone()
+        return self._load(row)
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM users WHERE email = ?", (normalize_email(email),)).fetchone()
+        return self._load(row)
+
+    def create(self, user: Dict[str, Any]) -> None:
+        self.create_many([user])
+
+    def create_many(self, users: Iterable[Dict[str, Any]]) -> None:
+        rows = ((user["id"], _email_key(user), json.dumps(user)) for user in users)
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany("INSERT INTO users (id, email, data) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.IntegrityError:
+                self._conn.execute("ROLLBACK")
+                raise UserExists("Email already registered")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def save(self, user: Dict[str, Any]) -> None:
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE users SET email = ?, data = ? WHERE id = ?",
+                    (_email_key(user), json.dumps(user), user["id"])
+                )
+            except sqlite3.IntegrityError:
+                raise UserExists("Email already registered")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO revoked_tokens (token_id, expires_at) VALUES (?, ?)",
+                (token_id, expires_at)
+            )
+
+    def get_revoked_tokens_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, token_id, expires_at FROM revoked_tokens WHERE seq > ? ORDER BY seq", (cursor,)
+            ).fetchall()
+        if not rows:
+            return [], cursor
+        return [(token_id, expires_at) for _, token_id, expires_at in rows], rows[-1][0]
+
+    def prune_revoked_tokens(self, now: float) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+def create_user_store(url: str) -> UserStore:
+    """Build a store from a URL: memory:// or sqlite:///path/to/users.db"""
+    if url.startswith("memory://"):
+        return InMemoryUserStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteUserStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported user store URL: {url}")
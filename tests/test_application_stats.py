@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import services.application_service
+from models.application import ApplicationCreate, ApplicationUpdate
+from services.application_service import ApplicationService
+
+@pytest.fixture
+def application_service(monkeypatch):
+    # mongomock has no GridFS, and these applications carry no custom resume
+    monkeypatch.setattr(services.application_service, "ResumeStore", lambda db: None)
+    return ApplicationService(AsyncMongoMockClient().jobbot)
+
+def test_a_failed_rollup_does_not_fail_the_stored_application(application_service):
+    async def run():
+        async def failing_record(*args, **kwargs):
+            raise RuntimeError("daily_stats unavailable")
+        application_service.daily_stats_service.record = failing_record
+
+        await application_service.create_application(
+            ApplicationCreate(job_id="job-1", campaign_id="campaign-1", user_id="user-1")
+        )
+
+        assert await application_service.get_application_by_job("job-1") is not None
+
+    asyncio.run(run())
+
+def test_the_interview_keeps_the_time_it_was_first_scheduled(application_service):
+    async def run():
+        await application_service.create_application(
+            ApplicationCreate(job_id="job-1", campaign_id="campaign-1", user_id="user-1")
+        )
+        application = await application_service.get_application_by_job("job-1")
+        await application_service.update_application(application.id, ApplicationUpdate(status="interview_scheduled"))
+        scheduled_at = (await application_service.get_application(application.id)).interview_scheduled_at
+
+        await application_service.update_application(application.id, ApplicationUpdate(notes="Bring portfolio"))
+        await application_service.update_application(application.id, ApplicationUpdate(status="interview_scheduled"))
+
+        stored = await application_service.get_application(application.id)
+        assert scheduled_at is not None
+        assert stored.interview_scheduled_at == scheduled_at
+        assert stored.updated_at > scheduled_at
+        rollup = await application_service.daily_stats_service.collection.find_one({"user_id": "user-1"})
+        assert rollup["interviews_scheduled"] == 1
+
+    asyncio.run(run())
@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+import services.application_service
+from services.analytics_service import AnalyticsService
+
+@pytest.fixture
+def analytics(monkeypatch):
+    # mongomock has no GridFS, and the dashboard bookkeeping never touches resumes
+    monkeypatch.setattr(services.application_service, "ResumeStore", lambda db: None)
+    return AnalyticsService(AsyncMongoMockClient().jobbot)
+
+def test_invalidating_a_dashboard_forgets_its_campaigns(analytics):
+    analytics._track_dashboard_campaigns("user-1", ["campaign-1", "campaign-2"])
+    analytics._track_dashboard_campaigns("user-2", ["campaign-3"])
+
+    analytics.handle_event("campaign:campaign-1", "job.created", {})
+
+    assert analytics._dashboard_campaign_owners == {"campaign-3": "user-2"}
+
+def test_campaign_owners_are_kept_for_as_many_users_as_the_cache_holds(analytics):
+    analytics.dashboard_cache.max_entries = 2
+    analytics.dashboard_cache.set("user-0", {})
+
+    for number in range(5):
+        analytics._track_dashboard_campaigns(f"user-{number}", [f"campaign-{number}"])
+
+    assert list(analytics._dashboard_campaigns) == ["user-3", "user-4"]
+    assert analytics._dashboard_campaign_owners == {"campaign-3": "user-3", "campaign-4": "user-4"}
+    assert analytics.dashboard_cache.get_stats()["entries"] == 0
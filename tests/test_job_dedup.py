@@ -0,0 +1,111 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from datetime import datetime
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from models.job import JobCreate
+from services.job_service import JobService
+
+DESCRIPTION = " ".join(f"word{i}" for i in range(120))
+
+def _posting(linkedin_job_id, title="Senior Product Manager"):
+    return {
+        "campaign_id": "campaign-1", "title": title, "company": "Acme", "location": "Remote",
+        "posted_at": datetime.utcnow(), "description": DESCRIPTION, "linkedin_job_id": linkedin_job_id
+    }
+
+def test_repost_seen_every_cycle_is_counted_once():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+
+        original = await job_service.create_job(JobCreate(**_posting("li-1")))
+        for _ in range(3):
+            known = await job_service.get_known_linkedin_job_ids("campaign-1", ["li-1", "li-2"])
+            if "li-2" not in known:
+                await job_service.create_job(JobCreate(**_posting("li-2", "Sr. Product Manager")))
+        await job_service.create_job(JobCreate(**_posting("li-2", "Sr. Product Manager")))
+        await job_service.create_jobs_bulk([_posting("li-2", "Sr. Product Manager")])
+
+        assert await db.jobs.count_documents({}) == 1
+        assert await job_service.get_known_linkedin_job_ids("campaign-1", ["li-1", "li-2", "li-3"]) == {"li-1", "li-2"}
+        stored = await db.jobs.find_one({})
+        assert stored["duplicate_count"] == 1
+        stats = await job_service.get_dedup_stats()
+        assert stats["dedup_ratio"] == 50.0
+        assert stats["ai_calls_saved"] == job_service.ai_calls_per_job
+        assert original.title == stored["title"]
+
+    asyncio.run(run())
+
+def test_concurrent_copies_create_one_job():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        score_documents = job_service._score_documents
+
+        async def slow_score_documents(documents):
+            await asyncio.sleep(0.05)
+            await score_documents(documents)
+
+        job_service._score_documents = slow_score_documents
+        await asyncio.gather(*[job_service.create_job(JobCreate(**_posting(None))) for _ in range(2)])
+
+        assert await db.jobs.count_documents({}) == 1
+        assert (await db.jobs.find_one({}))["duplicate_count"] == 1
+        assert job_service._pending_writes == {}
+
+    asyncio.run(run())
+
+def test_copy_of_later_bulk_batch_waits_for_its_write():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        insert_many = job_service.collection.insert_many
+
+        async def slow_insert_many(documents, **kwargs):
+            await asyncio.sleep(0.05)
+            return await insert_many(documents, **kwargs)
+
+        job_service.collection.insert_many = slow_insert_many
+        first = _posting(None, "Data Scientist")
+        first["description"] = " ".join(f"other{i}" for i in range(120))
+        second = _posting(None)
+
+        async def copy_during_first_batch():
+            await asyncio.sleep(0.02)
+            return await job_service.create_job(JobCreate(**second))
+
+        bulk, _ = await asyncio.gather(job_service.create_jobs_bulk([first, second], batch_size=1),
+                                       copy_during_first_batch())
+
+        assert bulk.created == 2
+        assert await db.jobs.count_documents({}) == 2
+        assert (await db.jobs.find_one({"title": second["title"]}))["duplicate_count"] == 1
+        assert job_service._pending_writes == {}
+
+    asyncio.run(run())
+
+def test_workers_storing_the_same_posting_keep_one_job():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        await db.jobs.create_indexes([model for model in JobService.INDEXES["jobs"]
+                                      if model.document["name"] == "campaign_linkedin_job_id_unique"])
+        # Two workers, each with its own in-process dedup index
+        first, second = JobService(db), JobService(db)
+
+        created = await first.create_jobs_bulk([_posting("li-1")])
+        result = await second.create_jobs_bulk([_posting("li-1"), _posting("li-2", "Data Engineer")])
+        job = await second.create_job(JobCreate(**_posting("li-1")))
+
+        assert await db.jobs.count_documents({"linkedin_job_id": "li-1"}) == 1
+        assert result.created == 1
+        assert result.results[0].status == "duplicate"
+        assert result.results[0].id == created.results[0].id
+        assert job.id == created.results[0].id
+
+    asyncio.run(run())
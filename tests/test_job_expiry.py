@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from datetime import datetime, timedelta
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from models.job import JobCreate
+from services.job_service import JobService
+from services.expiry_scheduler import JobExpiryScheduler
+
+def test_create_job_is_expired_by_its_timer():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        scheduler = JobExpiryScheduler(job_service)
+        job_service.expiry_scheduler = scheduler
+        await scheduler.start()
+        try:
+            # Deadline is posted_at + 3h, so this job expires a moment after creation
+            posted_at = datetime.utcnow() - timedelta(hours=3) + timedelta(milliseconds=200)
+            await job_service.create_job(JobCreate(
+                campaign_id="campaign-1", title="Product Manager", company="Acme",
+                location="Remote", posted_at=posted_at, description="Own the roadmap"
+            ))
+            await asyncio.sleep(0.5)
+        finally:
+            await scheduler.stop()
+
+        stored = await db.jobs.find_one({"campaign_id": "campaign-1"})
+        assert stored["status"] == "expired"
+        assert await job_service.get_active_jobs() == []
+
+    asyncio.run(run())
+
+def test_jobs_from_other_workers_are_hidden_and_swept_after_their_deadline():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        scheduler = JobExpiryScheduler(job_service)
+        scheduler.sweep_interval_seconds = 0.2
+        job_service.expiry_scheduler = scheduler
+        await scheduler.start()
+        try:
+            # Written by another worker after this one started, so no timer here covers it
+            now = datetime.utcnow()
+            await db.jobs.insert_one({
+                "id": "job-elsewhere", "campaign_id": "campaign-1", "title": "Designer", "company": "Acme",
+                "location": "Remote", "description": "Design things", "status": "monitoring",
+                "posted_at": now - timedelta(hours=3, minutes=1), "discovered_at": now,
+                "application_deadline": now - timedelta(minutes=1)
+            })
+            assert await job_service.get_active_jobs() == []
+
+            await asyncio.sleep(0.5)
+        finally:
+            await scheduler.stop()
+
+        stored = await db.jobs.find_one({"id": "job-elsewhere"})
+        assert stored["status"] == "expired"
+        assert scheduler.get_stats()["swept_expirations"] == 1
+
+    asyncio.run(run())
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from datetime import datetime, timedelta
+import asyncio
+
+from mongomock_motor import AsyncMongoMockClient
+
+from services.event_bus import EventBus
+from services.job_service import JobService
+
+def _job(number, deadline):
+    return {"id": f"job-{number}", "campaign_id": "campaign-1", "title": "Designer", "company": "Acme",
+            "status": "monitoring", "application_deadline": deadline}
+
+def test_marking_a_job_applied_twice_succeeds():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        await db.jobs.insert_one(_job(0, datetime.utcnow() + timedelta(hours=1)))
+
+        assert await job_service.mark_job_as_applied("job-0")
+        assert await job_service.mark_job_as_applied("job-0")
+        assert not await job_service.mark_job_as_applied("job-missing")
+
+    asyncio.run(run())
+
+def test_expiry_events_are_only_looked_up_for_listeners_and_capped():
+    async def run():
+        db = AsyncMongoMockClient()['jobbot_test']
+        job_service = JobService(db)
+        job_service.event_bus = EventBus()
+        job_service.expiry_event_limit = 2
+        past = datetime.utcnow() - timedelta(minutes=1)
+        await db.jobs.insert_many([_job(number, past) for number in range(5)])
+
+        lookups = []
+        find = job_service.collection.find
+        job_service.collection.find = lambda *args, **kwargs: lookups.append(args) or find(*args, **kwargs)
+
+        assert await job_service.expire_old_jobs() == 5
+        assert lookups == []
+
+        await db.jobs.update_many({}, {"$set": {"status": "monitoring"}})
+        subscription = job_service.event_bus.subscribe(["campaign:campaign-1"])
+        assert await job_service.expire_old_jobs() == 5
+        assert len(lookups) == 1
+        events = [await subscription.get(timeout=0.1) for _ in range(3)]
+        assert [event["type"] for event in events[:2]] == ["job.expired", "job.expired"]
+        assert events[2] is None
+
+    asyncio.run(run())
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import asyncio
+
+import httpx
+
+from services.linkedin_client import LinkedInClient
+from services.rate_limiter import RateLimiter, InMemoryRateLimitBackend
+
+def _client(statuses):
+    """A client whose calls get the given statuses in order, with no backoff"""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1])
+
+    client = LinkedInClient()
+    client.backoff_seconds = 0
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, calls
+
+def _limiter(daily_limit):
+    return RateLimiter(InMemoryRateLimitBackend(), name="linkedin", daily_limit=daily_limit,
+                       user_daily_limit=daily_limit, burst=daily_limit, refill_per_second=1)
+
+def test_every_retry_is_charged_to_the_rate_limiter():
+    async def run():
+        client, calls = _client([429, 503, 200])
+        limiter = _limiter(10)
+
+        assert await limiter.acquire("user-1")
+        response = await client.get("https://linkedin.test/jobs", before_retry=lambda: limiter.acquire("user-1"))
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert limiter.granted == 3
+        assert (await limiter.get_status("user-1"))["calls_made_today"] == 3
+        await client.close()
+
+    asyncio.run(run())
+
+def test_retries_stop_when_the_rate_limit_is_reached():
+    async def run():
+        client, calls = _client([429])
+        limiter = _limiter(2)
+
+        assert await limiter.acquire("user-1")
+        response = await client.get("https://linkedin.test/jobs", before_retry=lambda: limiter.acquire("user-1"))
+
+        assert response.status_code == 429
+        assert len(calls) == 2
+        assert client.retries == 1
+        await client.close()
+
+    asyncio.run(run())
@@ -0,0 +1,18 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import math
+
+from services.match_scoring import parse_salary
+
+def test_salary_ranges_and_rates_are_read_as_yearly_amounts():
+    assert parse_salary("$120k - $150k") == (120000, 150000)
+    assert parse_salary("120 to 140k") == (120000, 140000)
+    assert parse_salary("90,000 - 110,000") == (90000, 110000)
+    assert parse_salary("$60/hr") == (124800, 124800)
+    assert parse_salary("$130k + 401(k) match") == (130000, 130000)
+
+def test_numbers_that_are_not_pay_are_ignored():
+    for text in ("Competitive + 401k", "Great benefits, 403b matching", "Founded 1998"):
+        assert all(math.isnan(bound) for bound in parse_salary(text)), text
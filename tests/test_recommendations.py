@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from datetime import datetime, timedelta
+import asyncio
+
+import numpy as np
+from mongomock_motor import AsyncMongoMockClient
+
+from services.job_vectors import QUANTIZATION_SCALE, VECTOR_DIM, JobVectorIndex
+from services.recommendation_service import RecommendationService
+
+def _job(number, created_at):
+    return {
+        "id": f"job-{number}",
+        "title": f"Engineer {number}",
+        "company": "Acme",
+        "description": f"python backend services number{number}",
+        "requirements": ["python"],
+        "status": "monitoring",
+        "created_at": created_at,
+        "application_deadline": created_at + timedelta(hours=3)
+    }
+
+def _service(db, tmp_path):
+    service = RecommendationService(db)
+    service.index_path = str(tmp_path / "job_vectors.npz")
+    return service
+
+def test_unreadable_saved_index_is_rebuilt_from_the_jobs_collection(tmp_path):
+    async def run():
+        db = AsyncMongoMockClient().jobbot
+        now = datetime.utcnow()
+        await db.jobs.insert_many([_job(number, now) for number in range(3)])
+        (tmp_path / "job_vectors.npz").write_bytes(b"not an index")
+
+        service = _service(db, tmp_path)
+        await service.start()
+        assert len(service.index) == 3
+        await service.stop()
+
+        reloaded = _service(db, tmp_path)
+        await reloaded.start()
+        assert len(reloaded.index) == 3
+        await reloaded.stop()
+        assert [path.name for path in tmp_path.iterdir()] == ["job_vectors.npz"]
+
+    asyncio.run(run())
+
+def test_catch_up_picks_up_jobs_written_by_other_workers(tmp_path):
+    async def run():
+        db = AsyncMongoMockClient().jobbot
+        now = datetime.utcnow()
+        await db.jobs.insert_one(_job(0, now))
+        service = _service(db, tmp_path)
+        await service.start()
+
+        # A later job written here must not move the scan past one another worker wrote earlier
+        local = _job(2, now + timedelta(minutes=10))
+        await db.jobs.insert_one(dict(local))
+        service.add_job(local)
+        await db.jobs.insert_one(_job(1, now + timedelta(seconds=1)))
+        await service._catch_up()
+
+        assert "job-1" in service.index
+        await service.stop()
+
+    asyncio.run(run())
+
+def test_frozen_copy_is_not_changed_by_later_writes():
+    index = JobVectorIndex()
+    vectors = np.eye(3, VECTOR_DIM, dtype=np.float32)
+    for number, vector in enumerate(vectors):
+        index.add(f"job-{number}", vector)
+
+    frozen = index.frozen()
+    index.remove("job-0")
+    index.add("job-3", vectors[1])
+
+    ids, snapshot, _ = frozen.snapshot()
+    assert ids == ["job-0", "job-1", "job-2"]
+    assert np.array_equal(snapshot, np.round(vectors * QUANTIZATION_SCALE).astype(np.int8))
+
+def test_jobs_leave_the_index_at_their_deadline(tmp_path):
+    async def run():
+        db = AsyncMongoMockClient().jobbot
+        service = _service(db, tmp_path)
+        closing = _job(0, datetime.utcnow())
+        closing["application_deadline"] = datetime.utcnow() + timedelta(milliseconds=100)
+        service.add_job(closing)
+        service.add_job(_job(1, datetime.utcnow()))
+
+        await asyncio.sleep(0.2)
+        service._remove_expired()
+
+        assert "job-0" not in service.index
+        assert "job-1" in service.index
+        assert service.get_stats()["expired_removed"] == 1
+
+    asyncio.run(run())
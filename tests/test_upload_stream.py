@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import asyncio
+
+import pytest
+
+from services.upload_stream import InvalidUpload, receive_upload
+
+BODY = (b'--XYZ\r\nContent-Disposition: form-data; name="file"; filename="resume.pdf"\r\n'
+        b'Content-Type: application/pdf\r\n\r\n%PDF-1.4 resume\r\n--XYZ--\r\n')
+
+class _Request:
+    """The parts of a Starlette request receive_upload reads"""
+
+    def __init__(self, body: bytes):
+        self.headers = {"content-type": "multipart/form-data; boundary=XYZ"}
+        self.body = body
+
+    async def stream(self):
+        yield self.body
+
+def test_a_well_formed_upload_is_received():
+    upload = asyncio.run(receive_upload(_Request(BODY), "file", 1024 * 1024))
+    assert (upload.filename, upload.file.read()) == ("resume.pdf", b"%PDF-1.4 resume")
+    upload.close()
+
+@pytest.mark.parametrize("body", [
+    b"not a multipart body",
+    b'--XYZ\r\nbroken header\r\n\r\n',
+    BODY[:-12]
+])
+def test_malformed_or_truncated_bodies_are_invalid_uploads(body):
+    with pytest.raises(InvalidUpload):
+        asyncio.run(receive_upload(_Request(body), "file", 1024 * 1024))